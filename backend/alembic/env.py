@@ -11,6 +11,10 @@ from app.models.book import Book  # Modelo de Book
 from app.models.review import Review  # Modelo de Review
 from app.models.user import User  # Modelo de User
 from app.models.favorite import Favorito
+from app.models.book_stats import BookStats
+from app.models.book_summary import BookSummary
+from app.models.refresh_token import RefreshToken
+from app.models.catalog_cache import CatalogCache
 
 load_dotenv()
 
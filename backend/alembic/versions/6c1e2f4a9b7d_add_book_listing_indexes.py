@@ -0,0 +1,48 @@
+"""add book listing indexes
+
+Revision ID: 6c1e2f4a9b7d
+Revises: 42b048867965
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1e2f4a9b7d'
+down_revision: Union[str, None] = '42b048867965'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_books_created_at_id', 'books', ['created_at', 'id'], unique=False)
+    op.create_index('ix_books_title_id', 'books', ['title', 'id'], unique=False)
+    op.create_index('ix_books_published_year_sort', 'books', [sa.text('coalesce(published_year, 0)'), 'id'], unique=False)
+    op.create_index('ix_books_published_year', 'books', ['published_year'], unique=False)
+    op.create_index('ix_books_genre_created_at_id', 'books', ['genre', 'created_at', 'id'], unique=False)
+    op.create_index('ix_books_genre_title_id', 'books', ['genre', 'title', 'id'], unique=False)
+    op.create_index(
+        'ix_books_genre_published_year_sort', 'books', ['genre', sa.text('coalesce(published_year, 0)'), 'id'], unique=False
+    )
+    op.create_index('ix_books_author_created_at_id', 'books', ['author', 'created_at', 'id'], unique=False)
+    op.create_index('ix_books_author_title_id', 'books', ['author', 'title', 'id'], unique=False)
+    op.create_index(
+        'ix_books_author_published_year_sort', 'books', ['author', sa.text('coalesce(published_year, 0)'), 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_author_published_year_sort', table_name='books')
+    op.drop_index('ix_books_author_title_id', table_name='books')
+    op.drop_index('ix_books_author_created_at_id', table_name='books')
+    op.drop_index('ix_books_genre_published_year_sort', table_name='books')
+    op.drop_index('ix_books_genre_title_id', table_name='books')
+    op.drop_index('ix_books_genre_created_at_id', table_name='books')
+    op.drop_index('ix_books_published_year', table_name='books')
+    op.drop_index('ix_books_published_year_sort', table_name='books')
+    op.drop_index('ix_books_title_id', table_name='books')
+    op.drop_index('ix_books_created_at_id', table_name='books')
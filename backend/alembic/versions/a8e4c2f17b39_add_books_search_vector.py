@@ -0,0 +1,45 @@
+"""add books search_vector
+
+Revision ID: a8e4c2f17b39
+Revises: f3c8a1d9b274
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8e4c2f17b39'
+down_revision: Union[str, None] = 'f3c8a1d9b274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Português sem acentos: "romance histórico" encontra "Romance Historico" e vice-versa
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE TEXT SEARCH CONFIGURATION pt_unaccent (COPY = portuguese)")
+    op.execute(
+        "ALTER TEXT SEARCH CONFIGURATION pt_unaccent "
+        "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem"
+    )
+    # Pesos: título A, autor B, gênero C, descrição D
+    op.execute(
+        """
+        ALTER TABLE books ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('pt_unaccent', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('pt_unaccent', coalesce(author, '')), 'B') ||
+            setweight(to_tsvector('pt_unaccent', coalesce(genre, '')), 'C') ||
+            setweight(to_tsvector('pt_unaccent', coalesce(description, '')), 'D')
+        ) STORED
+        """
+    )
+    op.create_index('ix_books_search_vector', 'books', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_search_vector', table_name='books')
+    op.drop_column('books', 'search_vector')
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS pt_unaccent")
@@ -0,0 +1,27 @@
+"""add review listing indexes
+
+Revision ID: b2d7e0c35a41
+Revises: 6c1e2f4a9b7d
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d7e0c35a41'
+down_revision: Union[str, None] = '6c1e2f4a9b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_reviews_created_at_id', 'reviews', ['created_at', 'id'], unique=False)
+    op.create_index('ix_reviews_book_id_created_at_id', 'reviews', ['book_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reviews_book_id_created_at_id', table_name='reviews')
+    op.drop_index('ix_reviews_created_at_id', table_name='reviews')
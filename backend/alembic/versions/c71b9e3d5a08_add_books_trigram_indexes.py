@@ -0,0 +1,30 @@
+"""add books trigram indexes
+
+Revision ID: c71b9e3d5a08
+Revises: a8e4c2f17b39
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71b9e3d5a08'
+down_revision: Union[str, None] = 'a8e4c2f17b39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Índices trigram do autocompletar: atendem `word_similarity` (<%) e LIKE em qualquer posição
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_books_title_trgm', 'books', [sa.text('lower(title) gin_trgm_ops')], unique=False, postgresql_using='gin')
+    op.create_index('ix_books_author_trgm', 'books', [sa.text('lower(author) gin_trgm_ops')], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_author_trgm', table_name='books')
+    op.drop_index('ix_books_title_trgm', table_name='books')
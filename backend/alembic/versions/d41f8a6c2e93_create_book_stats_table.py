@@ -0,0 +1,47 @@
+"""create book_stats table
+
+Revision ID: d41f8a6c2e93
+Revises: b2d7e0c35a41
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f8a6c2e93'
+down_revision: Union[str, None] = 'b2d7e0c35a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('book_stats',
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.Column('overall_sum', sa.Float(), nullable=False),
+    sa.Column('story_sum', sa.Integer(), nullable=False),
+    sa.Column('style_sum', sa.Integer(), nullable=False),
+    sa.Column('character_sum', sa.Integer(), nullable=False),
+    sa.Column('recommend_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['book_id'], ['books.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('book_id')
+    )
+    # Preenche os agregados a partir dos reviews já existentes
+    op.execute(
+        """
+        INSERT INTO book_stats (book_id, review_count, overall_sum, story_sum, style_sum, character_sum, recommend_count)
+        SELECT book_id, count(*), sum(overall_rating), sum(story_rating), sum(style_rating), sum(character_rating),
+               sum(CASE WHEN recommendation THEN 1 ELSE 0 END)
+        FROM reviews
+        GROUP BY book_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('book_stats')
@@ -0,0 +1,95 @@
+"""add books google_id unique index
+
+Revision ID: e2b7c5a9d461
+Revises: d9f2a6b8c314
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7c5a9d461'
+down_revision: Union[str, None] = 'd9f2a6b8c314'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Para cada google_id repetido, o livro mais antigo (menor id) fica e os demais são duplicatas
+DUPLICATES = """
+    SELECT b.id AS duplicate_id, k.keep_id
+    FROM books b
+    JOIN (
+        SELECT google_id, min(id) AS keep_id
+        FROM books
+        WHERE google_id IS NOT NULL
+        GROUP BY google_id
+        HAVING count(*) > 1
+    ) k ON b.google_id = k.google_id AND b.id <> k.keep_id
+"""
+
+
+def upgrade() -> None:
+    # O fluxo antigo de "buscar e depois criar" do frontend gerava livros repetidos. Antes do
+    # índice único, as duplicatas são unidas ao livro mais antigo: reviews e favoritos passam
+    # para ele, os agregados são recalculados e o resumo fica pendente de regeneração.
+    op.execute(f"CREATE TEMPORARY TABLE book_duplicates AS {DUPLICATES}")
+    op.execute(
+        """
+        UPDATE book_summaries SET pending_changes = pending_changes + moved.total
+        FROM (
+            SELECT d.keep_id, count(*) AS total
+            FROM reviews r JOIN book_duplicates d ON r.book_id = d.duplicate_id
+            GROUP BY d.keep_id
+        ) moved
+        WHERE book_summaries.book_id = moved.keep_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE reviews SET book_id = d.keep_id
+        FROM book_duplicates d
+        WHERE reviews.book_id = d.duplicate_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE favoritos SET livro_id = d.keep_id
+        FROM book_duplicates d
+        WHERE favoritos.livro_id = d.duplicate_id
+        """
+    )
+    # Um usuário que favoritou mais de uma cópia fica com um único favorito
+    op.execute(
+        """
+        DELETE FROM favoritos
+        WHERE livro_id IN (SELECT keep_id FROM book_duplicates)
+          AND id NOT IN (
+              SELECT min(id) FROM favoritos
+              WHERE livro_id IN (SELECT keep_id FROM book_duplicates)
+              GROUP BY user_id, livro_id
+          )
+        """
+    )
+    op.execute("DELETE FROM book_stats WHERE book_id IN (SELECT keep_id FROM book_duplicates)")
+    op.execute(
+        """
+        INSERT INTO book_stats (book_id, review_count, overall_sum, story_sum, style_sum, character_sum, recommend_count)
+        SELECT book_id, count(*), sum(overall_rating), sum(story_rating), sum(style_rating), sum(character_rating),
+               sum(CASE WHEN recommendation THEN 1 ELSE 0 END)
+        FROM reviews
+        WHERE book_id IN (SELECT keep_id FROM book_duplicates)
+        GROUP BY book_id
+        """
+    )
+    op.execute("DELETE FROM books WHERE id IN (SELECT duplicate_id FROM book_duplicates)")
+    op.execute("DROP TABLE book_duplicates")
+
+    op.create_index('ix_books_google_id', 'books', ['google_id'], unique=True)
+
+
+def downgrade() -> None:
+    # Os livros unidos no upgrade não são recriados
+    op.drop_index('ix_books_google_id', table_name='books')
@@ -0,0 +1,43 @@
+"""create book_summaries table
+
+Revision ID: e5a93c7d1f20
+Revises: d41f8a6c2e93
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a93c7d1f20'
+down_revision: Union[str, None] = 'd41f8a6c2e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('book_summaries',
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.Column('pending_changes', sa.Integer(), nullable=False),
+    sa.Column('generated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['book_id'], ['books.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('book_id')
+    )
+    # Livros que já têm reviews entram como pendentes: o resumo é gerado na primeira leitura
+    op.execute(
+        """
+        INSERT INTO book_summaries (book_id, review_count, pending_changes)
+        SELECT book_id, 0, count(*)
+        FROM reviews
+        GROUP BY book_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('book_summaries')
@@ -1,3 +1,5 @@
+from typing import Optional
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -9,9 +11,67 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Claims de tokens já validados ficam em memória até o `exp` de cada token
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30  # renovado a cada uso (sessão deslizante)
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    # Com CACHE_BACKEND=memory, intervalo entre recargas das sessões encerradas em outros workers
+    REVOCATION_RELOAD_SECONDS: float = 5.0
+    # Limite de tentativas de login em janela deslizante, verificado antes de qualquer hash
+    LOGIN_RATE_LIMIT_BACKEND: str = "memory"  # memory | redis (usa CACHE_REDIS_URL)
+    LOGIN_IP_LIMIT: int = 20  # tentativas por IP na janela
+    LOGIN_ACCOUNT_LIMIT: int = 5  # senhas erradas por conta na janela
+    LOGIN_WINDOW_SECONDS: float = 300.0
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
     GOOGLE_REDIRECT_URI: str = "http://localhost:8000/api/v1/auth/google/callback"
+    # Chaves públicas que assinam os ID tokens do Google, guardadas pelo tempo do Cache-Control.
+    # Com GOOGLE_CERTS_FILE, são lidas de um JSON local ({kid: certificado}) em vez da rede.
+    GOOGLE_CERTS_URL: str = "https://www.googleapis.com/oauth2/v1/certs"
+    GOOGLE_CERTS_FILE: Optional[str] = None
+    GOOGLE_CERTS_MIN_REFRESH: float = 60.0  # intervalo mínimo entre buscas por um `kid` desconhecido
+    # Esquemas de hash de senha: o primeiro gera os novos hashes; os demais só são aceitos
+    # no login e são convertidos para o primeiro na próxima autenticação bem-sucedida.
+    PASSWORD_SCHEMES: str = "argon2,bcrypt"
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 64 * 1024  # KiB
+    ARGON2_PARALLELISM: int = 2
+    PASSWORD_HASH_WORKERS: int = 2  # threads dedicadas ao hashing de senhas
+    PASSWORD_HASH_MAX_QUEUE: int = 32  # pedidos aguardando além disso recebem 503
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 10.0  # segundos esperando uma conexão livre antes de falhar
+    DB_POOL_RECYCLE: int = 1800  # reabre conexões mais antigas que isso (segundos)
+    DB_POOL_PRE_PING: bool = True  # testa a conexão antes de usá-la (sobrevive a failovers)
+    SUMMARY_LANGUAGE: str = "portuguese"
+    SUMMARY_SENTENCES: int = 4
+    SUMMARY_ALGORITHM: str = "lsa"  # lsa | textrank | lexrank
+    SUMMARY_CHUNK_SIZE: int = Field(200, ge=2)  # reviews por bloco no map-reduce (com 1, a redução não termina)
+    SUMMARY_SAMPLE_SIZE: int = 1000  # máximo de reviews resumidas por livro (0 = todas)
+    SUMMARY_MAX_REVIEW_CHARS: int = 2000
+    SUMMARY_REFRESH_THRESHOLD: int = 5  # reviews alteradas antes de regenerar o resumo
+    SUMMARY_WORKERS: int = 2  # processos (e jobs simultâneos) para gerar resumos
+    SUMMARY_MAX_PENDING: int = 100  # jobs na fila além disso são recusados
+    SUMMARY_RETRY_AFTER: float = 60.0  # segundos antes de tentar de novo um resumo que falhou
+    SUGGEST_INDEX_MAX_BOOKS: int = 200000  # acervos maiores sugerem só pelo banco
+    # Proxy de busca no Google Books; a URL pode apontar para um servidor local nos testes
+    GOOGLE_BOOKS_URL: str = "https://www.googleapis.com/books/v1/volumes"
+    GOOGLE_BOOKS_API_KEY: Optional[str] = None
+    CATALOG_CACHE_TTL: int = 24 * 60 * 60  # segundos
+    CATALOG_TIMEOUT: float = 5.0
+    CATALOG_MAX_CONNECTIONS: int = 20
+    BOOK_IMPORT_BATCH_SIZE: int = 1000  # livros por INSERT multi-linha na importação em lote
+    BOOK_IMPORT_MAX_ERRORS: int = 1000  # linhas inválidas listadas no relatório (as demais só são contadas)
+    CACHE_BACKEND: str = "memory"  # memory | shared | redis
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    CACHE_SHARED_PATH: str = "/dev/shm/booklib-cache"
+    CACHE_SHARED_SLOTS: int = 2048
+    CACHE_SHARED_SLOT_BYTES: int = 16 * 1024
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_REDIS_TIMEOUT: float = 0.5
 
     class Config:
         env_file = ".env"
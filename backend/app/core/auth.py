@@ -0,0 +1,88 @@
+from typing import Any, Dict, Optional
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.google_keys import is_google_token
+from app.core.security import decode_access_token, oauth2_scheme
+from app.database.session import get_async_db
+from app.models.user import User
+from app.services.refresh_token import RefreshTokenService
+
+# Como `oauth2_scheme`, mas sem recusar requisições sem token (rotas públicas)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+
+
+class Principal:
+    """
+    Usuário autenticado de uma requisição, montado só a partir das claims do token.
+
+    `id`, `username`, `is_active` e `session_id` vêm do token, sem consulta ao banco. A
+    linha de `User` só é lida quando a rota chama `load_user()`, e uma única vez por
+    requisição. Tokens emitidos antes de as claims existirem trazem apenas o `sub`:
+    `username` fica None.
+    """
+
+    def __init__(self, claims: Dict[str, Any], db: AsyncSession):
+        self.claims = claims
+        self.id = int(claims["sub"])
+        self.username: Optional[str] = claims.get("username")
+        self.is_active: bool = claims.get("active", True)
+        self.session_id: Optional[str] = claims.get("sid")
+        self._db = db
+        self._user: Optional[User] = None
+
+    async def load_user(self) -> User:
+        """Carrega (na primeira chamada) e retorna o usuário do token."""
+        if self._user is None:
+            user = await self._db.get(User, self.id)
+            if user is None:
+                raise HTTPException(status_code=404, detail="Usuário não encontrado")
+            self._user = user
+        return self._user
+
+
+async def authenticate(token: str, db: AsyncSession) -> Principal:
+    """
+    Valida um access token e retorna o seu `Principal`, recusando sessões encerradas.
+
+    Usada por `get_principal` e pelas rotas que recebem o token por outro meio (ex.: query
+    string). Toda rota autenticada com tokens próprios deve passar por aqui, para que um
+    logout ou a detecção de reuso de refresh token invalide também os access tokens.
+    """
+    claims = decode_access_token(token)
+    try:
+        principal = Principal(claims, db)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
+    if not principal.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Usuário inativo")
+    if principal.session_id and await RefreshTokenService.is_session_revoked(db, principal.session_id):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Sessão encerrada")
+    return principal
+
+
+async def get_principal(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> Principal:
+    """
+    Dependência de autenticação: valida o token (com cache até o `exp`) sem carregar o usuário.
+
+    A sessão só abre uma conexão se a rota chamar `Principal.load_user()` ou se for preciso
+    confirmar no banco que a sessão do token foi encerrada.
+    """
+    return await authenticate(token, db)
+
+
+async def get_optional_principal(
+    token: Optional[str] = Depends(optional_oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> Optional[Principal]:
+    """
+    Dependência de autenticação opcional, para rotas públicas que personalizam a resposta.
+
+    Retorna None sem token, com um token do Google (que não traz o ID do nosso usuário) ou
+    com um token recusado por `authenticate`: a rota responde como para um visitante.
+    """
+    if token is None or is_google_token(token):
+        return None
+    try:
+        return await authenticate(token, db)
+    except HTTPException:
+        return None
@@ -0,0 +1,31 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Junta chamadas simultâneas com a mesma chave em uma única execução.
+
+    A primeira chamada cria a tarefa; as que chegam enquanto ela roda aguardam o mesmo
+    resultado (ou a mesma exceção). Terminada a tarefa, a chave é liberada e a próxima
+    chamada executa de novo. A tarefa é protegida com `shield`: se quem a criou desistir
+    (ex.: o cliente fechou a conexão), ela continua para os demais.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.get_running_loop().create_task(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
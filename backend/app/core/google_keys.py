@@ -0,0 +1,148 @@
+import asyncio
+import json
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from google.auth import exceptions
+from google.auth import jwt as google_jwt
+from google.auth.transport import requests
+from jose import JWTError, jwt
+from app.config import settings
+from app.core.coalesce import SingleFlight
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+# Validade usada quando a resposta do Google não traz `max-age` (segundos)
+DEFAULT_MAX_AGE = 3600
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+logger = logging.getLogger(__name__)
+
+
+def is_google_token(token: str) -> bool:
+    """
+    Indica, sem verificar a assinatura, se o token foi emitido pelo Google.
+
+    Só decodifica o payload em base64 para ler o `iss`; serve para mandar os nossos próprios
+    tokens (HS256, sem `iss`) direto para a validação local, sem passar pelo Google.
+    """
+    try:
+        return jwt.get_unverified_claims(token).get("iss") in GOOGLE_ISSUERS
+    except JWTError:
+        return False
+
+
+class GoogleKeySet:
+    """
+    Chaves públicas do Google, guardadas em memória pelo tempo indicado no Cache-Control.
+
+    `verify_oauth2_token` busca os certificados na rede a cada chamada. Aqui eles são
+    buscados uma vez e reaproveitados até expirar o `max-age` da resposta; um `kid`
+    desconhecido (rotação de chaves) força uma nova busca, no máximo a cada `min_refresh`
+    segundos. Se a busca falhar, as chaves anteriores continuam valendo até a próxima tentativa.
+
+    Com `path`, as chaves são lidas de um JSON local no formato do endpoint, o que permite
+    rodar os testes sem rede e com chaves próprias.
+
+    Nas rotas assíncronas, use `verify_async`: a busca roda em uma thread, fora do event loop,
+    e logins simultâneos que encontram as chaves vencidas esperam uma única busca.
+    """
+
+    def __init__(self, url: str, path: Optional[str] = None, min_refresh: float = 60.0):
+        self.url = url
+        self.path = path
+        self.min_refresh = min_refresh
+        self._keys: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._fetched_at = float("-inf")
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.fetches = 0
+
+    def set_keys(self, keys: Dict[str, str], max_age: float = DEFAULT_MAX_AGE) -> None:
+        """Substitui as chaves em memória (ex.: por chaves de teste)."""
+        with self._lock:
+            self._keys = dict(keys)
+            self._fetched_at = time.monotonic()
+            self._expires_at = self._fetched_at + max_age
+
+    def _load(self) -> Tuple[Dict[str, str], float]:
+        if self.path:
+            with open(self.path) as file:
+                return json.load(file), float("inf")
+
+        response = requests.Request()(self.url, method="GET")
+        if response.status != 200:
+            raise exceptions.TransportError(f"Could not fetch certificates at {self.url}")
+        match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+        max_age = int(match.group(1)) if match else DEFAULT_MAX_AGE
+        return json.loads(response.data.decode("utf-8")), max_age
+
+    def _is_current(self, kid: Optional[str]) -> bool:
+        return time.monotonic() < self._expires_at and (kid is None or kid in self._keys)
+
+    def get(self, kid: Optional[str] = None) -> Dict[str, str]:
+        """Retorna as chaves atuais, buscando-as de novo se expiraram ou se `kid` não está entre elas."""
+        keys = self._keys
+        if self._is_current(kid):
+            return keys
+
+        with self._lock:
+            now = time.monotonic()
+            expired = now >= self._expires_at
+            unknown = kid is not None and kid not in self._keys and now - self._fetched_at >= self.min_refresh
+            if expired or unknown:
+                try:
+                    keys, max_age = self._load()
+                except Exception as e:
+                    if not self._keys:
+                        raise
+                    logger.warning(f"Erro ao atualizar as chaves do Google, mantendo as anteriores: {e}")
+                    self._expires_at = now + self.min_refresh
+                else:
+                    self._keys = keys
+                    self._fetched_at = now
+                    self._expires_at = now + max_age
+                    self.fetches += 1
+            return self._keys
+
+    @staticmethod
+    def _kid(token: str) -> Optional[str]:
+        try:
+            return jwt.get_unverified_header(token).get("kid")
+        except JWTError as e:
+            raise ValueError(f"Malformed token: {e}")
+
+    @staticmethod
+    def _check(token: str, certs: Dict[str, str]) -> Dict[str, Any]:
+        id_info = google_jwt.decode(token, certs=certs)
+        if id_info.get("iss") not in GOOGLE_ISSUERS:
+            raise exceptions.GoogleAuthError(f"Wrong issuer: {id_info.get('iss')}")
+        return id_info
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verifica a assinatura, a validade e o emissor de um ID token do Google.
+
+        Levanta ValueError (ou `google.auth.exceptions.GoogleAuthError`) se o token for inválido.
+        """
+        kid = self._kid(token)
+        return self._check(token, self.get(kid))
+
+    async def verify_async(self, token: str) -> Dict[str, Any]:
+        """
+        Como `verify`, sem bloquear o event loop quando as chaves precisam ser buscadas.
+
+        Com as chaves em dia, só a verificação da assinatura roda no event loop. Caso
+        contrário, a busca roda em uma thread, e as requisições que chegam durante ela
+        aguardam a mesma busca em vez de abrir outras.
+        """
+        kid = self._kid(token)
+        if not self._is_current(kid):
+            await self._flight.run("keys", lambda: asyncio.to_thread(self.get, kid))
+        return self._check(token, self.get(kid))
+
+
+google_keys = GoogleKeySet(settings.GOOGLE_CERTS_URL, settings.GOOGLE_CERTS_FILE, settings.GOOGLE_CERTS_MIN_REFRESH)
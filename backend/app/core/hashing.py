@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+from fastapi import HTTPException
+from app.config import settings
+from app.core.security import get_password_hash, verify_and_update_password, verify_password
+
+
+class PasswordHasher:
+    """
+    Pool dedicado e limitado para gerar e verificar hashes de senha.
+
+    Bcrypt e argon2 custam centenas de milissegundos de CPU por chamada; feito no event loop,
+    o hashing trava todas as outras requisições do worker. Aqui ele roda em `workers` threads
+    próprias (ambos liberam o GIL), separadas do pool usado pelo FastAPI. Pedidos além de
+    `max_queue` na fila são recusados com 503, para que uma rajada de logins não acumule
+    uma fila que só seria atendida depois de o cliente já ter desistido.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 32):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    async def _run(self, func: Callable, *args):
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Servidor ocupado, tente novamente em instantes",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+
+        submitted = time.perf_counter()
+        started = None
+
+        def timed():
+            nonlocal started
+            started = time.perf_counter()
+            return func(*args)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                if started is not None:
+                    self.wait_seconds += started - submitted
+                    self.run_seconds += finished - started
+
+    async def hash(self, password: str) -> str:
+        """Gera o hash da senha fora do event loop."""
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: Optional[str]) -> bool:
+        """Verifica a senha fora do event loop. Usuários sem senha (login social) nunca conferem."""
+        if not hashed_password:
+            return False
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Verifica a senha fora do event loop e retorna o novo hash quando o atual está
+        desatualizado (esquema antigo ou custo diferente do configurado).
+        """
+        if not hashed_password:
+            return False, None
+        return await self._run(verify_and_update_password, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_seconds": self.wait_seconds,
+                "run_seconds": self.run_seconds,
+            }
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
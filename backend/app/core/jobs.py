@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _ready() -> int:
+    """Tarefa vazia: retorna o PID do processo, que já subiu e rodou o `initializer`."""
+    return os.getpid()
+
+
+@dataclass
+class Job:
+    """Estado de um job da fila: queued -> running -> done | failed."""
+    key: Hashable
+    status: str = "queued"
+    queued_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+class JobQueue:
+    """
+    Fila de jobs em segundo plano com deduplicação e concorrência limitada.
+
+    Cada job é uma coroutine identificada por uma chave (ex.: o ID do livro). Enquanto um
+    job está na fila ou rodando, novos pedidos com a mesma chave recebem o mesmo job em vez
+    de criar outro. No máximo `max_workers` jobs rodam ao mesmo tempo, e a parte CPU-bound
+    (`run_cpu`) vai para um pool de processos do mesmo tamanho, sem disputar o GIL nem as
+    threads que atendem a API. Pedidos além de `max_pending` são recusados, e um job que
+    falhou só é tentado de novo após `retry_after` segundos.
+
+    `initializer(*initargs)` roda uma vez em cada processo do pool, antes do primeiro job,
+    para carregar recursos caros (modelos, dicionários) que os jobs reaproveitam.
+
+    A deduplicação vale dentro de um processo: cada worker da API tem a sua fila.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int = 2,
+        max_pending: int = 100,
+        retry_after: float = 60.0,
+        history: int = 1024,
+        initializer: Optional[Callable] = None,
+        initargs: Tuple = (),
+    ):
+        self.name = name
+        self.initializer = initializer
+        self.initargs = initargs
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.history = history
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._active: Dict[Hashable, Job] = {}
+        self._finished: "OrderedDict[Hashable, Job]" = OrderedDict()
+        self._tasks = set()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # `spawn` evita herdar, via fork, as threads e conexões abertas do processo da API.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer,
+                initargs=self.initargs,
+            )
+        return self._executor
+
+    async def start(self) -> None:
+        """
+        Cria o pool de processos e roda o `initializer` em todos eles antes do primeiro job.
+
+        Chamado ao subir a API, para que o primeiro job não pague a criação do processo nem o
+        aquecimento. Um processo já aquecido pode pegar as tarefas dos que ainda estão subindo,
+        então as rodadas se repetem até todos terem respondido. Se o aquecimento falhar, o erro
+        é registrado e o pool é recriado no primeiro job, que então falha com o erro real.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        warmed = set()
+        try:
+            while True:
+                pids = await asyncio.gather(*(loop.run_in_executor(executor, _ready) for _ in range(self.max_workers)))
+                warmed.update(pids)
+                if len(warmed) >= self.max_workers:
+                    break
+                await asyncio.sleep(0.05)
+        except Exception as e:
+            logger.error(f"Erro ao aquecer o pool da fila {self.name}: {e}")
+            executor.shutdown(wait=False, cancel_futures=True)
+            if self._executor is executor:
+                self._executor = None
+
+    def submit(self, key: Hashable, job: Callable[[], Awaitable[object]]) -> Optional[Job]:
+        """
+        Enfileira `job()` sob a chave informada, ou retorna o job já existente para ela.
+
+        Enquanto durar o `retry_after` de uma falha, retorna o job que falhou. Retorna None
+        se a fila estiver cheia; quem chamou pode tentar de novo mais tarde.
+        """
+        current = self._active.get(key)
+        if current is not None:
+            return current
+        last = self._finished.get(key)
+        if last is not None and last.status == "failed" and time.time() - last.finished_at < self.retry_after:
+            return last
+        if len(self._active) >= self.max_pending:
+            self.rejected += 1
+            logger.warning(f"Fila {self.name} cheia: job {key} recusado")
+            return None
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        state = Job(key=key, queued_at=time.time())
+        self._active[key] = state
+        task = asyncio.get_running_loop().create_task(self._run(state, job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return state
+
+    async def _run(self, state: Job, job: Callable[[], Awaitable[object]]) -> None:
+        try:
+            async with self._semaphore:
+                state.status = "running"
+                state.started_at = time.time()
+                await job()
+            state.status = "done"
+            self.completed += 1
+        except Exception as e:
+            state.status = "failed"
+            state.error = str(e)
+            self.failed += 1
+            logger.error(f"Erro no job {state.key} da fila {self.name}: {e}")
+        finally:
+            state.finished_at = time.time()
+            self._active.pop(state.key, None)
+            self._finished[state.key] = state
+            self._finished.move_to_end(state.key)
+            while len(self._finished) > self.history:
+                self._finished.popitem(last=False)
+
+    async def run_cpu(self, func: Callable, *args):
+        """Executa `func(*args)` no pool de processos. `func` e os argumentos devem ser serializáveis (pickle)."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            # Um processo morreu (ex.: falta de memória): o próximo job recria o pool.
+            if self._executor is executor:
+                self._executor = None
+            raise
+
+    def status(self, key: Hashable) -> Optional[Job]:
+        """Retorna o job ativo da chave ou, se não houver, o último que terminou."""
+        return self._active.get(key) or self._finished.get(key)
+
+    def stats(self) -> Dict[str, int]:
+        running = sum(1 for job in self._active.values() if job.status == "running")
+        return {
+            "queued": len(self._active) - running,
+            "running": running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Encerra o pool de processos, cancelando os jobs que ainda não começaram."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,180 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy import exc
+
+# Limites (em segundos) dos buckets do histograma de espera por uma conexão do pool.
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    """
+    Contadores de espera por conexões de um pool do SQLAlchemy.
+
+    Ocupação e overflow são lidos do próprio pool na hora da coleta; aqui guardamos apenas
+    o que o pool não expõe: quanto tempo cada checkout esperou e quantos estouraram o timeout.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.buckets = [0] * len(CHECKOUT_BUCKETS)
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+
+    def observe(self, seconds: float) -> None:
+        """Registra a espera de um checkout concluído."""
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += seconds
+            for index, bound in enumerate(CHECKOUT_BUCKETS):
+                if seconds <= bound:
+                    self.buckets[index] += 1
+                    break
+
+    def timeout(self) -> None:
+        """Registra um checkout que desistiu após `pool_timeout` segundos."""
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "wait_seconds": self.wait_seconds,
+                "timeouts": self.timeouts,
+                "buckets": list(self.buckets),
+            }
+
+
+def instrumented_pool(base, metrics: PoolMetrics):
+    """
+    Cria uma subclasse do pool `base` que mede o tempo de cada checkout.
+
+    A subclasse é passada como `poolclass` para o `create_engine`; como as métricas ficam
+    na classe, continuam valendo quando o engine recria o pool (ex.: `dispose()`).
+    """
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except exc.TimeoutError:
+            metrics.timeout()
+            raise
+        metrics.observe(time.perf_counter() - start)
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get, "metrics": metrics})
+
+
+def _pool_state(pool) -> Tuple[int, int, int, int]:
+    """Retorna (tamanho, em uso, ociosas, overflow) de um pool, ou zeros se ele não os expõe."""
+    try:
+        return pool.size(), pool.checkedout(), pool.checkedin(), max(pool.overflow(), 0)
+    except AttributeError:
+        return 0, 0, 0, 0
+
+
+def render_pool_metrics(engines: Iterable[Tuple[str, object]]) -> List[str]:
+    """Linhas no formato de texto do Prometheus com o estado dos pools dos engines informados."""
+    lines = [
+        "# HELP db_pool_size Configured number of persistent connections.",
+        "# TYPE db_pool_size gauge",
+        "# HELP db_pool_checked_out Connections currently in use.",
+        "# TYPE db_pool_checked_out gauge",
+        "# HELP db_pool_checked_in Idle connections kept by the pool.",
+        "# TYPE db_pool_checked_in gauge",
+        "# HELP db_pool_overflow Connections opened beyond pool_size.",
+        "# TYPE db_pool_overflow gauge",
+        "# HELP db_pool_checkout_seconds Time spent waiting for a pooled connection.",
+        "# TYPE db_pool_checkout_seconds histogram",
+        "# HELP db_pool_checkout_timeouts_total Checkouts that gave up after pool_timeout.",
+        "# TYPE db_pool_checkout_timeouts_total counter",
+    ]
+    for name, engine in engines:
+        pool = engine.pool
+        label = f'pool="{name}"'
+        size, checked_out, checked_in, overflow = _pool_state(pool)
+        lines += [
+            f"db_pool_size{{{label}}} {size}",
+            f"db_pool_checked_out{{{label}}} {checked_out}",
+            f"db_pool_checked_in{{{label}}} {checked_in}",
+            f"db_pool_overflow{{{label}}} {overflow}",
+        ]
+
+        metrics = getattr(pool, "metrics", None)
+        if metrics is None:
+            continue
+        snapshot = metrics.snapshot()
+        cumulative = 0
+        for bound, count in zip(CHECKOUT_BUCKETS, snapshot["buckets"]):
+            cumulative += count
+            lines.append(f'db_pool_checkout_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines += [
+            f'db_pool_checkout_seconds_bucket{{{label},le="+Inf"}} {snapshot["checkouts"]}',
+            f"db_pool_checkout_seconds_sum{{{label}}} {snapshot['wait_seconds']:.6f}",
+            f"db_pool_checkout_seconds_count{{{label}}} {snapshot['checkouts']}",
+            f"db_pool_checkout_timeouts_total{{{label}}} {snapshot['timeouts']}",
+        ]
+    return lines
+
+
+def render_cache_metrics(stats: Dict[str, int]) -> List[str]:
+    """Linhas no formato de texto do Prometheus com os contadores do cache de respostas."""
+    lines = []
+    for name, value in sorted(stats.items()):
+        kind = "gauge" if name in ("entries", "bytes") else "counter"
+        metric = f"response_cache_{name}" if kind == "gauge" else f"response_cache_{name}_total"
+        lines += [f"# TYPE {metric} {kind}", f"{metric} {value}"]
+    return lines
+
+
+def render_job_metrics(queue: str, stats: Dict[str, int]) -> List[str]:
+    """Linhas no formato de texto do Prometheus com o estado de uma fila de jobs."""
+    label = f'queue="{queue}"'
+    lines = []
+    for name, value in sorted(stats.items()):
+        kind = "gauge" if name in ("queued", "running") else "counter"
+        metric = f"jobs_{name}" if kind == "gauge" else f"jobs_{name}_total"
+        lines += [f"# TYPE {metric} {kind}", f"{metric}{{{label}}} {value}"]
+    return lines
+
+
+def render_hashing_metrics(stats: Dict[str, float]) -> List[str]:
+    """Linhas no formato de texto do Prometheus com o uso do pool de hashing de senhas."""
+    return [
+        "# TYPE password_hash_in_flight gauge",
+        f"password_hash_in_flight {stats['in_flight']}",
+        "# TYPE password_hash_completed_total counter",
+        f"password_hash_completed_total {stats['completed']}",
+        "# TYPE password_hash_rejected_total counter",
+        f"password_hash_rejected_total {stats['rejected']}",
+        "# HELP password_hash_wait_seconds_total Time spent queued for a hashing thread.",
+        "# TYPE password_hash_wait_seconds_total counter",
+        f"password_hash_wait_seconds_total {stats['wait_seconds']:.6f}",
+        "# HELP password_hash_run_seconds_total Time spent hashing or verifying passwords.",
+        "# TYPE password_hash_run_seconds_total counter",
+        f"password_hash_run_seconds_total {stats['run_seconds']:.6f}",
+    ]
+
+
+def render_catalog_metrics(stats: Dict[str, int]) -> List[str]:
+    """Linhas no formato de texto do Prometheus com os contadores do proxy do Google Books."""
+    lines = []
+    for name, value in sorted(stats.items()):
+        metric = f"catalog_{name}_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+    return lines
+
+
+def render_login_throttle_metrics(stats: Dict[str, int]) -> List[str]:
+    """Linhas no formato de texto do Prometheus com os contadores do limite de tentativas de login."""
+    return [
+        "# HELP login_rejected_total Login attempts refused by the rate limiter before hashing.",
+        "# TYPE login_rejected_total counter",
+        f'login_rejected_total{{limit="ip"}} {stats["rejected_ip"]}',
+        f'login_rejected_total{{limit="account"}} {stats["rejected_account"]}',
+        "# TYPE login_failures_total counter",
+        f"login_failures_total {stats['failures']}",
+    ]
@@ -0,0 +1,72 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Sequence
+from fastapi import HTTPException
+from sqlalchemy import literal, tuple_
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Codifica os valores do último item de uma página em um cursor opaco.
+
+    Datas são convertidas para ISO 8601; cabe a quem decodifica convertê-las de volta.
+    """
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _cursor_value(value: Any, expected: Any) -> Any:
+    if isinstance(expected, tuple):
+        for option in expected:
+            try:
+                return _cursor_value(value, option)
+            except (TypeError, ValueError):
+                pass
+        raise ValueError(value)
+    if expected is datetime:
+        if not isinstance(value, str):
+            raise TypeError(value)
+        return datetime.fromisoformat(value)
+    if expected is type(None):
+        if value is not None:
+            raise TypeError(value)
+        return None
+    # bool é subclasse de int, mas `true` nunca é um ID válido
+    if isinstance(value, bool) or not isinstance(value, (int, float) if expected is float else expected):
+        raise TypeError(value)
+    return expected(value)
+
+
+def decode_cursor(cursor: str, *types: Any) -> List[Any]:
+    """
+    Decodifica um cursor gerado por `encode_cursor`, conferindo o tipo de cada valor.
+
+    `types` traz o tipo esperado de cada posição: `int`, `float`, `str`, `datetime`
+    (convertido de volta a partir do ISO 8601) ou `type(None)`. Uma tupla aceita qualquer
+    um dos tipos listados, ex.: `(int, type(None))`.
+
+    Raises:
+        HTTPException: Se o cursor estiver malformado ou algum valor não tiver o tipo esperado.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError(cursor)
+        return [_cursor_value(value, expected) for value, expected in zip(values, types)]
+    except (TypeError, ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(columns: Sequence[Any], values: Sequence[Any], descending: bool):
+    """
+    Condição para continuar a listagem logo após o último item retornado.
+
+    Usa comparação de tuplas (`(a, b) < (x, y)`), que o Postgres resolve com uma única
+    busca no índice composto correspondente, independente da profundidade da página.
+    Cada valor é enviado com o tipo da sua coluna, para ser gravado no mesmo formato dela.
+    """
+    row = tuple_(*columns)
+    bound = tuple_(*(literal(value, column.type) for column, value in zip(columns, values)))
+    return row < bound if descending else row > bound
@@ -0,0 +1,77 @@
+import bisect
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Tuple
+
+
+def normalize(text: str) -> str:
+    """Minúsculas e sem acentos, para que "Jose" encontre "José"."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).strip()
+
+
+class PrefixIndex:
+    """
+    Índice de prefixos em memória sobre um array ordenado.
+
+    Cada valor é guardado como `(forma normalizada, tipo, valor)`, em ordem, e uma busca
+    por prefixo é um `bisect` seguido de uma leitura sequencial dos vizinhos: O(log n) para
+    achar o início, sem percorrer o índice. Um contador por entrada permite remover um
+    valor só quando nenhum livro o usa mais (ex.: o mesmo autor em vários livros).
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[str, str, str]] = []
+        self._counts: Dict[Tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, values: Iterable[Tuple[str, str]]) -> None:
+        """Substitui o conteúdo do índice pelos pares `(tipo, valor)` informados."""
+        counts: Dict[Tuple[str, str, str], int] = {}
+        for kind, value in values:
+            if value and normalize(value):
+                entry = (normalize(value), kind, value)
+                counts[entry] = counts.get(entry, 0) + 1
+        with self._lock:
+            self._counts = counts
+            self._entries = sorted(counts)
+
+    def add(self, kind: str, value: str) -> None:
+        if not value or not normalize(value):
+            return
+        entry = (normalize(value), kind, value)
+        with self._lock:
+            count = self._counts.get(entry, 0)
+            self._counts[entry] = count + 1
+            if count == 0:
+                bisect.insort(self._entries, entry)
+
+    def discard(self, kind: str, value: str) -> None:
+        if not value:
+            return
+        entry = (normalize(value), kind, value)
+        with self._lock:
+            count = self._counts.get(entry, 0)
+            if count > 1:
+                self._counts[entry] = count - 1
+            elif count == 1:
+                del self._counts[entry]
+                index = bisect.bisect_left(self._entries, entry)
+                del self._entries[index]
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[str, str]]:
+        """Retorna até `limit` pares `(tipo, valor)` cujo valor começa com `prefix`."""
+        key = normalize(prefix)
+        results = []
+        with self._lock:
+            index = bisect.bisect_left(self._entries, (key,))
+            while index < len(self._entries) and len(results) < limit:
+                normalized, kind, value = self._entries[index]
+                if not normalized.startswith(key):
+                    break
+                results.append((kind, value))
+                index += 1
+        return results
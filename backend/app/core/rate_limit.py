@@ -0,0 +1,212 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+
+
+def _window(now: float, window: float) -> Tuple[int, float]:
+    """Retorna o índice da janela fixa atual e a fração dela que já passou."""
+    index = int(now // window)
+    return index, (now - index * window) / window
+
+
+def _estimate(previous: int, current: int, elapsed: float) -> float:
+    """Contagem da janela deslizante: a janela anterior pesa o quanto dela ainda está coberto."""
+    return previous * (1 - elapsed) + current
+
+
+class MemoryCounter:
+    """
+    Contadores de janela deslizante em memória, locais ao processo.
+
+    Cada chave guarda só a contagem da janela fixa atual e da anterior. A contagem
+    deslizante é estimada pela interpolação das duas, em O(1) de memória por chave.
+    As chaves ficam na ordem do último uso: as expiradas (e, no limite de `max_keys`, as
+    mais antigas) são sempre as primeiras, e descartá-las custa O(1) por chave, sem
+    percorrer o dicionário mesmo sob uma rajada de contas e IPs distintos.
+    """
+
+    blocking = False
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._counters: "OrderedDict[str, List[int]]" = OrderedDict()  # chave -> [janela, anterior, atual]
+        self._lock = threading.Lock()
+
+    def _roll(self, key: str, index: int) -> List[int]:
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = [index, 0, 0]
+        else:
+            self._counters.move_to_end(key)
+            if counter[0] != index:
+                previous = counter[2] if counter[0] == index - 1 else 0
+                counter[:] = [index, previous, 0]
+        return counter
+
+    def _prune(self, index: int) -> None:
+        # Chaves sem tentativas nas duas últimas janelas já não contam para nada
+        while self._counters and next(iter(self._counters.values()))[0] < index - 1:
+            self._counters.popitem(last=False)
+        # Abre espaço para a nova chave descartando as usadas há mais tempo
+        while len(self._counters) >= self.max_keys:
+            self._counters.popitem(last=False)
+
+    def hit(self, key: str, window: float) -> float:
+        """Conta uma tentativa e retorna a contagem deslizante, já incluindo ela."""
+        index, elapsed = _window(time.time(), window)
+        with self._lock:
+            if key not in self._counters:
+                self._prune(index)
+            counter = self._roll(key, index)
+            counter[2] += 1
+            return _estimate(counter[1], counter[2], elapsed)
+
+    def peek(self, key: str, window: float) -> float:
+        """Retorna a contagem deslizante sem contar uma tentativa."""
+        index, elapsed = _window(time.time(), window)
+        with self._lock:
+            if key not in self._counters:
+                return 0.0
+            counter = self._roll(key, index)
+            return _estimate(counter[1], counter[2], elapsed)
+
+    def reset(self, key: str, window: float) -> None:
+        """Zera a contagem da chave."""
+        with self._lock:
+            self._counters.pop(key, None)
+
+
+class RedisCounter:
+    """
+    Contadores de janela deslizante no Redis, compartilhados por todos os workers e hosts.
+
+    Usa um `INCR` por janela fixa, expirando após duas janelas. Se o cache de respostas
+    também está no Redis, reaproveita as conexões dele. Se o Redis estiver fora, o limite é liberado (fail open): o login
+    não pode depender dele para funcionar.
+    """
+
+    blocking = True
+
+    def __init__(self, cache, prefix: str = "rl:"):
+        self.cache = cache
+        self.prefix = prefix
+
+    def _keys(self, key: str, window: float) -> Tuple[str, str, float]:
+        index, elapsed = _window(time.time(), window)
+        return f"{self.prefix}{key}:{index}", f"{self.prefix}{key}:{index - 1}", elapsed
+
+    def hit(self, key: str, window: float) -> float:
+        current, previous, elapsed = self._keys(key, window)
+        replies = self.cache.execute(
+            ["INCR", current], ["PEXPIRE", current, int(window * 2000)], ["GET", previous]
+        )
+        if replies is None:
+            return 0.0
+        return _estimate(int(replies[2] or 0), replies[0], elapsed)
+
+    def peek(self, key: str, window: float) -> float:
+        current, previous, elapsed = self._keys(key, window)
+        replies = self.cache.execute(["GET", current], ["GET", previous])
+        if replies is None:
+            return 0.0
+        return _estimate(int(replies[1] or 0), int(replies[0] or 0), elapsed)
+
+    def reset(self, key: str, window: float) -> None:
+        current, previous, _ = self._keys(key, window)
+        self.cache.execute(["DEL", current, previous])
+
+
+def create_counter(backend: str):
+    """
+    Cria o armazenamento de contadores configurado em `Settings.LOGIN_RATE_LIMIT_BACKEND`.
+
+    - memory: contadores do processo (cada worker limita por conta própria).
+    - redis: contadores compartilhados no Redis de `CACHE_REDIS_URL`. Com `CACHE_BACKEND=redis`,
+      usa o mesmo cliente (e pool de conexões) do cache de respostas.
+    """
+    if backend == "memory":
+        return MemoryCounter()
+    if backend == "redis":
+        from app.decorators.cache import response_cache
+        from app.decorators.cache.redis import RedisCache
+        if isinstance(response_cache.store, RedisCache):
+            return RedisCounter(response_cache.store)
+        return RedisCounter(RedisCache(settings.CACHE_REDIS_URL, timeout=settings.CACHE_REDIS_TIMEOUT))
+    raise ValueError(f"LOGIN_RATE_LIMIT_BACKEND inválido: {backend}")
+
+
+class LoginThrottle:
+    """
+    Limite de tentativas de login por IP e por conta, em janela deslizante.
+
+    Cada tentativa conta para o IP de origem; senhas erradas contam também para a conta.
+    Acima de `ip_limit` tentativas ou `account_limit` erros na janela, o login é recusado
+    com 429 antes de consultar o usuário ou calcular qualquer hash, de modo que uma rajada
+    de credential stuffing custa apenas um incremento de contador por requisição.
+    """
+
+    def __init__(self, counter, ip_limit: int, account_limit: int, window: float):
+        self.counter = counter
+        self.ip_limit = ip_limit
+        self.account_limit = account_limit
+        self.window = window
+        self._lock = threading.Lock()
+        self.rejected_ip = 0
+        self.rejected_account = 0
+        self.failures = 0
+
+    async def _call(self, func, *args):
+        if self.counter.blocking:
+            return await run_in_threadpool(func, *args)
+        return func(*args)
+
+    def _reject(self, reason: str) -> None:
+        with self._lock:
+            if reason == "ip":
+                self.rejected_ip += 1
+            else:
+                self.rejected_account += 1
+        elapsed = _window(time.time(), self.window)[1]
+        raise HTTPException(
+            status_code=429,
+            detail="Muitas tentativas de login, tente novamente mais tarde",
+            headers={"Retry-After": str(max(1, math.ceil(self.window * (1 - elapsed))))},
+        )
+
+    async def check(self, ip: Optional[str], account: str) -> None:
+        """Conta a tentativa e levanta HTTPException 429 se o IP ou a conta passaram do limite."""
+        if ip and await self._call(self.counter.hit, f"ip:{ip}", self.window) > self.ip_limit:
+            self._reject("ip")
+        if await self._call(self.counter.peek, f"account:{account.lower()}", self.window) >= self.account_limit:
+            self._reject("account")
+
+    async def succeeded(self, account: str) -> None:
+        """Zera os erros da conta após um login bem-sucedido."""
+        await self._call(self.counter.reset, f"account:{account.lower()}", self.window)
+
+    async def failed(self, account: str) -> None:
+        """Registra uma senha errada para a conta."""
+        with self._lock:
+            self.failures += 1
+        await self._call(self.counter.hit, f"account:{account.lower()}", self.window)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "rejected_ip": self.rejected_ip,
+                "rejected_account": self.rejected_account,
+                "failures": self.failures,
+            }
+
+
+login_throttle = LoginThrottle(
+    create_counter(settings.LOGIN_RATE_LIMIT_BACKEND),
+    ip_limit=settings.LOGIN_IP_LIMIT,
+    account_limit=settings.LOGIN_ACCOUNT_LIMIT,
+    window=settings.LOGIN_WINDOW_SECONDS,
+)
@@ -1,38 +1,138 @@
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Dict, Optional, Tuple, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import settings
 from fastapi import HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from google.oauth2 import id_token
-from google.auth.transport import requests
+from google.auth import exceptions as google_exceptions
+from app.core.google_keys import google_keys
 import logging
 
-# Configuração do contexto de criptografia e esquema OAuth2
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Configuração do contexto de criptografia e esquema OAuth2.
+# Hashes de esquemas antigos (ou com custo diferente do configurado) são marcados como
+# desatualizados e refeitos no próximo login bem-sucedido.
+pwd_context = CryptContext(
+    schemes=[scheme.strip() for scheme in settings.PASSWORD_SCHEMES.split(",") if scheme.strip()],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    argon2__type="ID",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")  
 
 # Configuração de log para monitoramento de erros
 logger = logging.getLogger(__name__)
 
-def create_access_token(subject: Union[str, Any]) -> str:
+def create_access_token(subject: Union[str, Any], claims: Optional[Dict[str, Any]] = None) -> str:
     """
     Cria um token de acesso JWT com o sujeito especificado e uma expiração configurada.
 
     Args:
         subject (Union[str, Any]): O sujeito do token, geralmente o ID do usuário.
+        claims (Optional[Dict[str, Any]]): Claims extras (ex.: `user_claims(user)`), para que
+            as rotas não precisem consultar o usuário a cada requisição.
 
     Returns:
         str: O token JWT gerado.
     """
     expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     expire = datetime.utcnow() + expires_delta
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, settings.ALGORITHM)
     return encoded_jwt
 
 
+def user_claims(user, session_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Claims do usuário carregadas no token de acesso.
+
+    Args:
+        user (User): O usuário autenticado.
+        session_id (Optional[str]): A sessão (família de refresh tokens) que emitiu o token.
+
+    Returns:
+        Dict[str, Any]: Nome de usuário, se a conta está ativa e, se houver, a sessão.
+    """
+    claims = {"username": user.username, "active": user.is_active is not False}
+    if session_id:
+        claims["sid"] = session_id
+    return claims
+
+
+class ClaimsCache:
+    """
+    Cache LRU, limitado a `max_entries`, das claims de tokens JWT já validados.
+
+    Validar a assinatura a cada requisição custa mais que a própria leitura na maioria das
+    rotas. Como o token é imutável, as claims valem até o seu `exp`: depois disso a entrada
+    é descartada e o token volta a ser decodificado (e recusado por estar expirado).
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            claims = self._entries.get(token)
+            if claims is None:
+                return None
+            if claims["exp"] <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return claims
+
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[token] = claims
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+claims_cache = ClaimsCache(settings.TOKEN_CACHE_MAX_ENTRIES)
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Valida o token JWT e retorna as suas claims, usando o cache de tokens já validados.
+
+    Args:
+        token (str): O token JWT a ser decodificado.
+
+    Returns:
+        Dict[str, Any]: As claims do token (`sub`, `exp` e as de `user_claims`, se houver).
+
+    Raises:
+        HTTPException: Se o token for inválido, estiver expirado ou não tiver o campo 'sub'.
+    """
+    claims = claims_cache.get(token)
+    if claims is not None:
+        return claims
+    try:
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError as e:
+        logger.error(f"Erro ao verificar o token JWT: {e}")
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if claims.get("sub") is None or claims.get("exp") is None:
+        logger.error("Token inválido: campo 'sub' ou 'exp' ausente.")
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+    claims_cache.set(token, claims)
+    return claims
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifica se a senha fornecida corresponde à senha criptografada.
@@ -47,6 +147,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha e, se ela conferir e o hash estiver desatualizado, gera um novo hash.
+
+    Args:
+        plain_password (str): A senha fornecida pelo usuário.
+        hashed_password (str): A senha armazenada no banco de dados.
+
+    Returns:
+        Tuple[bool, Optional[str]]: Se a senha confere e o novo hash a ser gravado (ou None).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """
     Gera o hash da senha fornecida.
@@ -73,17 +187,7 @@ def decode_token_and_get_user_id(token: str) -> int:
     Raises:
         HTTPException: Se o token for inválido ou o ID do usuário não puder ser encontrado.
     """
-    try:
-        print(f"Token recebido: {token}")  # 🔍 Verifique o que está chegando
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            logger.error("Token não contém o campo 'sub' com o ID do usuário.")
-            raise HTTPException(status_code=401, detail="Invalid token payload")
-        return user_id
-    except JWTError:
-        logger.error("Erro ao decodificar o token JWT.")
-        raise HTTPException(status_code=401, detail="Invalid token")
+    return decode_access_token(token)["sub"]
 
 
 def verify_access_token(token: str):
@@ -99,23 +203,12 @@ def verify_access_token(token: str):
     Raises:
         HTTPException: Se o token for inválido.
     """
-    try:
-        print(f"Token recebido: {token}")  # 🔍 Verifica o que está chegando
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        
-        if payload.get("sub") is None:
-            logger.error("Token inválido: campo 'sub' ausente.")
-            raise HTTPException(status_code=401, detail="Invalid token payload")
-
-        return payload.get("sub")
-    except JWTError as e:
-        logger.error(f"Erro ao verificar o token JWT: {e}")
-        raise HTTPException(status_code=401, detail="Invalid token")
+    return decode_access_token(token)["sub"]
 
 
-def verify_google_token(token: str):
+async def verify_google_token(token: str):
     """
-    Verifica a validade de um token do Google OAuth2.
+    Verifica a validade de um token do Google OAuth2, sem bloquear o event loop.
 
     Args:
         token (str): O token do Google a ser verificado.
@@ -127,12 +220,13 @@ def verify_google_token(token: str):
         HTTPException: Se o token for inválido.
     """
     try:
-        id_info = id_token.verify_oauth2_token(token, requests.Request())
+        # Chaves do Google em cache: só há ida à rede quando expiram ou quando surge um `kid` novo
+        id_info = await google_keys.verify_async(token)
         if "sub" not in id_info:
             logger.error("Token do Google inválido: campo 'sub' ausente.")
             raise HTTPException(status_code=400, detail="Invalid Google token")
         return id_info
-    except ValueError as e:
+    except (ValueError, google_exceptions.GoogleAuthError) as e:
         logger.error(f"Erro ao verificar o token do Google: {e}")
         raise HTTPException(status_code=400, detail=f"Invalid Google token: {e}")
 
@@ -1,17 +1,59 @@
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import DateTime, create_engine
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 import os
 from dotenv import load_dotenv
+from app.config import settings
+from app.core.metrics import PoolMetrics, instrumented_pool
 
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+# Drivers assíncronos equivalentes aos drivers síncronos da DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
+
+def to_async_url(url: str) -> str:
+    """Converte a URL do banco para o driver assíncrono correspondente (ex.: psycopg2 -> asyncpg)."""
+    scheme, separator, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+
+# Configuração comum aos dois pools; ver `Settings.DB_POOL_*`
+POOL_OPTIONS = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+
+# Engine síncrona: usada apenas por scripts e ferramentas de linha de comando
+engine = create_engine(
+    DATABASE_URL, poolclass=instrumented_pool(QueuePool, PoolMetrics("sync")), **POOL_OPTIONS
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Engine assíncrona: usada pelas rotas, para não bloquear o event loop esperando o banco
+async_engine = create_async_engine(
+    to_async_url(DATABASE_URL), poolclass=instrumented_pool(AsyncAdaptedQueuePool, PoolMetrics("async")), **POOL_OPTIONS
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
+# Data preenchida pelo banco (`server_default=func.now()`). No SQLite, `now()` grava o texto
+# sem microssegundos e as comparações são de texto: as datas vindas do Python (ex.: o cursor
+# da paginação) são gravadas no mesmo formato, senão não empatam com a linha de onde saíram.
+ServerTimestamp = DateTime(timezone=True).with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite")
+
 
 def get_db():
     db = SessionLocal()
@@ -19,3 +61,17 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def dialect_insert(db):
+    """Retorna o `insert` específico do dialeto em uso, que suporta `ON CONFLICT`."""
+    if db.bind.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert
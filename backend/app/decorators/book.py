@@ -1,17 +1,72 @@
 import functools
+import inspect
+import json
+from typing import Any, Iterable, Optional
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from app.decorators.cache import response_cache, build_cache_key, run_cache
 
-cache = {}
 
-def cache_response(timeout: int = 60):
-    """Decorator para armazenar em cache as respostas da API"""
+def _serialize(adapter: Optional[TypeAdapter], result: Any) -> bytes:
+    """Converte o resultado da rota em JSON, usando o schema de resposta quando informado."""
+    if adapter is not None:
+        return adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+    return json.dumps(jsonable_encoder(result)).encode()
+
+
+def _json_response(payload: bytes, status: str) -> Response:
+    return Response(content=payload, media_type="application/json", headers={"X-Cache": status})
+
+
+def cache_response(timeout: int = 60, model: Any = None, tags: Iterable[str] = ()):
+    """
+    Decorator para armazenar em cache as respostas da API.
+
+    A chave é montada a partir do caminho e dos parâmetros de consulta da requisição,
+    e a resposta é guardada já serializada por `timeout` segundos. Quando `model` é
+    informado, o resultado é validado e serializado com ele (equivalente ao `response_model`).
+
+    `tags` aceita modelos formatados com os parâmetros da rota (ex.: `"book:{book_id}"`);
+    a entrada é descartada assim que uma escrita publicar qualquer uma delas.
+    """
     def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            key = (func.__name__, args, tuple(kwargs.items()))
-            if key in cache:
-                return cache[key]
-            result = func(*args, **kwargs)
-            cache[key] = result
-            return result
+        adapter = TypeAdapter(model) if model is not None else None
+        signature = inspect.signature(func)
+        wants_request = "request" in signature.parameters
+        parameters = list(signature.parameters.values())
+        if not wants_request:
+            parameters.append(inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+
+        def lookup(kwargs):
+            request = kwargs["request"] if wants_request else kwargs.pop("request")
+            key = build_cache_key(f"{func.__module__}.{func.__name__}", request)
+            versions = response_cache.tag_versions(tag.format(**kwargs) for tag in tags)
+            return key, versions, response_cache.get(key)
+
+        def store(key, versions, result):
+            if isinstance(result, Response):
+                return result
+            payload = _serialize(adapter, result)
+            response_cache.set(key, payload, timeout, versions)
+            return _json_response(payload, "MISS")
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                # Backends de rede (Redis) não podem bloquear o event loop.
+                key, versions, payload = await run_cache(lookup, kwargs)
+                if payload is not None:
+                    return _json_response(payload, "HIT")
+                return await run_cache(store, key, versions, await func(*args, **kwargs))
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key, versions, payload = lookup(kwargs)
+                if payload is not None:
+                    return _json_response(payload, "HIT")
+                return store(key, versions, func(*args, **kwargs))
+
+        wrapper.__signature__ = signature.replace(parameters=parameters)
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
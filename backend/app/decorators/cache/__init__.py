@@ -0,0 +1,60 @@
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from app.config import settings
+from app.decorators.cache.base import CacheBackend
+from app.decorators.cache.memory import MemoryCache
+from app.decorators.cache.tags import TaggedCache
+
+
+def create_backend(backend: str) -> CacheBackend:
+    """
+    Cria o backend de cache configurado em `Settings.CACHE_BACKEND`.
+
+    - memory: cache local do processo.
+    - shared: arquivo mapeado em memória, compartilhado pelos workers do mesmo host.
+    - redis: servidor Redis (ou compatível), compartilhado entre hosts.
+    """
+    if backend == "memory":
+        return MemoryCache(max_entries=settings.CACHE_MAX_ENTRIES, max_bytes=settings.CACHE_MAX_BYTES)
+    if backend == "shared":
+        from app.decorators.cache.shared import SharedMemoryCache
+        return SharedMemoryCache(
+            settings.CACHE_SHARED_PATH,
+            slots=settings.CACHE_SHARED_SLOTS,
+            slot_bytes=settings.CACHE_SHARED_SLOT_BYTES,
+        )
+    if backend == "redis":
+        from app.decorators.cache.redis import RedisCache
+        return RedisCache(settings.CACHE_REDIS_URL, timeout=settings.CACHE_REDIS_TIMEOUT)
+    raise ValueError(f"CACHE_BACKEND inválido: {backend}")
+
+
+response_cache = TaggedCache(create_backend(settings.CACHE_BACKEND))
+
+
+def build_cache_key(namespace: str, request: Request) -> str:
+    """
+    Monta a chave do cache a partir do caminho da requisição e dos parâmetros de consulta.
+
+    Os parâmetros são ordenados para que `?a=1&b=2` e `?b=2&a=1` compartilhem a mesma entrada.
+    """
+    query = "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+    return f"{namespace}:{request.url.path}?{query}"
+
+
+async def run_cache(func, *args):
+    """Executa uma operação do cache, tirando-a do event loop quando o backend faz I/O de rede."""
+    if response_cache.blocking:
+        return await run_in_threadpool(func, *args)
+    return func(*args)
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """Publica as tags sujas após um commit, invalidando as respostas em cache que dependem delas."""
+    await run_cache(response_cache.invalidate, *tags)
+
+
+__all__ = [
+    "CacheBackend", "MemoryCache", "TaggedCache", "create_backend", "response_cache",
+    "build_cache_key", "run_cache", "invalidate_tags",
+]
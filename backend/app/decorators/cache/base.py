@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional
+
+
+class CacheBackend(ABC):
+    """
+    Interface comum dos backends de cache.
+
+    Além do armazenamento chave/valor com TTL, o backend guarda os contadores de versão
+    das tags, para que a invalidação seja vista por todos os processos que compartilham
+    o mesmo armazenamento.
+    """
+
+    #: Indica se as operações fazem I/O bloqueante (rede) e devem sair do event loop.
+    blocking = False
+    #: Indica se o armazenamento (e as versões das tags) é visto por todos os workers.
+    shared = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Retorna o valor armazenado ou None se a chave não existir ou estiver expirada."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Armazena o valor por `ttl` segundos."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a chave do cache, se existir."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove todas as entradas do cache."""
+
+    @abstractmethod
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Retorna a versão atual de cada tag (0 para tags nunca publicadas)."""
+
+    @abstractmethod
+    def bump_tags(self, tags: Iterable[str]) -> None:
+        """Incrementa a versão de cada tag."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Retorna os contadores de uso do cache."""
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+from app.decorators.cache.base import CacheBackend
+
+
+class MemoryCache(CacheBackend):
+    """
+    Cache em memória com expiração por entrada (TTL) e despejo LRU.
+
+    As entradas são limitadas tanto pela quantidade (`max_entries`) quanto pelo
+    tamanho total em bytes (`max_bytes`). Quando algum dos limites é excedido,
+    as entradas menos usadas recentemente são removidas primeiro.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._size = 0
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Retorna o valor armazenado ou None se a chave não existir ou estiver expirada."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Armazena o valor por `ttl` segundos, despejando entradas antigas se necessário."""
+        size = len(value)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, value)
+            self._size += size
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                oldest_key, (_, oldest_value) = self._entries.popitem(last=False)
+                self._size -= len(oldest_value)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """Remove a chave do cache, se existir."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Retorna a versão atual de cada tag (0 para tags nunca publicadas)."""
+        with self._lock:
+            return {tag: self._versions.get(tag, 0) for tag in tags}
+
+    def bump_tags(self, tags: Iterable[str]) -> None:
+        """Incrementa a versão de cada tag."""
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna os contadores de uso do cache."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _remove(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._size -= len(value)
@@ -0,0 +1,208 @@
+import logging
+import queue
+import socket
+import threading
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+from app.decorators.cache.base import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+class RedisError(Exception):
+    """Erro retornado pelo servidor Redis."""
+
+
+class _Connection:
+    """Conexão com um servidor que fala o protocolo do Redis (RESP2)."""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+
+    def send(self, *commands) -> None:
+        buffer = bytearray()
+        for command in commands:
+            buffer += b"*%d\r\n" % len(command)
+            for arg in command:
+                if not isinstance(arg, bytes):
+                    arg = str(arg).encode()
+                buffer += b"$%d\r\n%s\r\n" % (len(arg), arg)
+        self.sock.sendall(buffer)
+
+    def read(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Conexão com o Redis encerrada")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body
+        if kind == b"-":
+            raise RedisError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length == -1:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            if length == -1:
+                return None
+            return [self.read() for _ in range(length)]
+        raise RedisError(f"Resposta inválida do Redis: {line!r}")
+
+    def close(self) -> None:
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache compartilhado em um servidor Redis (ou qualquer servidor compatível com o protocolo).
+
+    As entradas usam `SET ... PX` para o TTL e a política de memória do servidor para o despejo;
+    as versões das tags são contadores `INCR` sem expiração. Falhas de conexão nunca derrubam a
+    requisição: a leitura vira um miss e o erro é registrado no log.
+    """
+
+    blocking = True
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "booklib:", timeout: float = 0.5, pool_size: int = 8):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue[_Connection]" = queue.LifoQueue(maxsize=pool_size)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _connect(self) -> _Connection:
+        connection = _Connection(self.host, self.port, self.timeout)
+        if self.password:
+            connection.send(["AUTH", self.password])
+            connection.read()
+        if self.db:
+            connection.send(["SELECT", self.db])
+            connection.read()
+        return connection
+
+    def _execute(self, *commands) -> List:
+        """Envia os comandos em pipeline e retorna as respostas na mesma ordem."""
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            connection = self._connect()
+
+        replies = []
+        try:
+            connection.send(*commands)
+            for _ in commands:
+                try:
+                    replies.append(connection.read())
+                except RedisError as e:
+                    # Continua lendo para não deixar respostas pendentes na conexão.
+                    replies.append(e)
+        except (OSError, ConnectionError):
+            connection.close()
+            raise
+
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def _safe_execute(self, *commands) -> Optional[List]:
+        try:
+            return self._execute(*commands)
+        except (OSError, ConnectionError, RedisError) as e:
+            with self._lock:
+                self.errors += 1
+            logger.error(f"Erro ao acessar o cache Redis: {e}")
+            return None
+
+    def execute(self, *commands) -> Optional[List]:
+        """
+        Envia comandos arbitrários em pipeline pelas conexões do cache (ex.: contadores de
+        outros componentes). Retorna None, registrando o erro, se o Redis estiver inacessível.
+        """
+        return self._safe_execute(*commands)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}k:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}t:{tag}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        replies = self._safe_execute(["GET", self._key(key)])
+        value = replies[0] if replies else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self._safe_execute(["SET", self._key(key), value, "PX", int(ttl * 1000)])
+
+    def delete(self, key: str) -> None:
+        self._safe_execute(["DEL", self._key(key)])
+
+    def clear(self) -> None:
+        cursor = b"0"
+        while True:
+            replies = self._safe_execute(["SCAN", cursor, "MATCH", self._key("*"), "COUNT", 500])
+            if not replies:
+                return
+            cursor, keys = replies[0]
+            if keys:
+                self._safe_execute(["DEL", *keys])
+            if cursor == b"0":
+                return
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        tags = list(tags)
+        if not tags:
+            return {}
+        replies = self._safe_execute(["MGET", *(self._tag(tag) for tag in tags)])
+        if replies is None:
+            # Sem as versões não há como garantir que a entrada é atual: força um miss.
+            return {tag: -1 for tag in tags}
+        return {tag: int(value or 0) for tag, value in zip(tags, replies[0])}
+
+    def bump_tags(self, tags: Iterable[str]) -> None:
+        commands = [["INCR", self._tag(tag)] for tag in tags]
+        if commands:
+            self._safe_execute(*commands)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+        replies = self._safe_execute(["INFO", "stats"])
+        if replies:
+            for line in replies[0].decode().splitlines():
+                name, _, value = line.partition(":")
+                if name in ("evicted_keys", "expired_keys"):
+                    stats["evictions" if name == "evicted_keys" else "expirations"] = int(value)
+        return stats
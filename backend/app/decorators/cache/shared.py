@@ -0,0 +1,176 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+from app.decorators.cache.base import CacheBackend
+
+_MAGIC = b"BLCACHE1"
+_HEADER = struct.Struct("<8sIII")           # magic, contadores de tags, slots, tamanho do slot
+_STATS = struct.Struct("<5Q")               # hits, misses, evictions, expirations, oversize
+_COUNTER = struct.Struct("<Q")
+_SLOT = struct.Struct("<16sddI4x")          # hash da chave, expira em, último uso, tamanho
+_STATS_OFFSET = 64
+_COUNTERS_OFFSET = 128
+_WAYS = 4
+_EMPTY = bytes(16)
+
+
+def _digest(value: str) -> bytes:
+    return hashlib.blake2b(value.encode(), digest_size=16).digest()
+
+
+class SharedMemoryCache(CacheBackend):
+    """
+    Cache compartilhado entre os workers do mesmo host através de um arquivo mapeado em memória.
+
+    O arquivo (por padrão em /dev/shm) é dividido em slots de tamanho fixo organizados em
+    conjuntos de 4 posições: cada chave só pode ocupar os slots do seu conjunto e, quando o
+    conjunto está cheio, o slot menos usado recentemente é despejado. Entradas maiores que
+    um slot não são armazenadas. As versões das tags ficam em um vetor de contadores
+    indexado pelo hash da tag; colisões apenas causam invalidações extras, nunca dados velhos.
+
+    O acesso é serializado com `flock` entre processos e com um lock entre as threads do processo.
+    """
+
+    shared = True
+
+    def __init__(self, path: str, slots: int = 2048, slot_bytes: int = 16 * 1024, tag_counters: int = 4096):
+        self.path = path
+        self.tag_counters = tag_counters
+        self.slots = max(_WAYS, slots - slots % _WAYS)
+        self.slot_bytes = slot_bytes
+        self.capacity = slot_bytes - _SLOT.size
+        self._sets = self.slots // _WAYS
+        self._slots_offset = _COUNTERS_OFFSET + tag_counters * _COUNTER.size
+        self._total = self._slots_offset + self.slots * slot_bytes
+        self._thread_lock = threading.Lock()
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._locked():
+            if os.fstat(self._fd).st_size != self._total:
+                os.ftruncate(self._fd, self._total)
+            self._mm = mmap.mmap(self._fd, self._total)
+            if _HEADER.unpack_from(self._mm, 0) != (_MAGIC, tag_counters, self.slots, slot_bytes):
+                self._mm[:self._slots_offset] = bytes(self._slots_offset)
+                self._clear_slots()
+                _HEADER.pack_into(self._mm, 0, _MAGIC, tag_counters, self.slots, slot_bytes)
+
+    @contextmanager
+    def _locked(self):
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _slot_offsets(self, digest: bytes):
+        first = int.from_bytes(digest[:8], "little") % self._sets * _WAYS
+        return [self._slots_offset + (first + way) * self.slot_bytes for way in range(_WAYS)]
+
+    def _count(self, field: int) -> None:
+        offset = _STATS_OFFSET + field * 8
+        (value,) = _COUNTER.unpack_from(self._mm, offset)
+        _COUNTER.pack_into(self._mm, offset, value + 1)
+
+    def _clear_slots(self) -> None:
+        for index in range(self.slots):
+            _SLOT.pack_into(self._mm, self._slots_offset + index * self.slot_bytes, _EMPTY, 0.0, 0.0, 0)
+
+    def get(self, key: str) -> Optional[bytes]:
+        digest = _digest(key)
+        now = time.time()
+        with self._locked():
+            for offset in self._slot_offsets(digest):
+                slot_digest, expires_at, _, length = _SLOT.unpack_from(self._mm, offset)
+                if slot_digest != digest:
+                    continue
+                if expires_at <= now:
+                    _SLOT.pack_into(self._mm, offset, _EMPTY, 0.0, 0.0, 0)
+                    self._count(3)
+                    break
+                _SLOT.pack_into(self._mm, offset, digest, expires_at, now, length)
+                self._count(0)
+                start = offset + _SLOT.size
+                return self._mm[start:start + length]
+            self._count(1)
+            return None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        digest = _digest(key)
+        now = time.time()
+        with self._locked():
+            if len(value) > self.capacity:
+                self._count(4)
+                return
+
+            target = None
+            oldest = None
+            for offset in self._slot_offsets(digest):
+                slot_digest, expires_at, last_used, _ = _SLOT.unpack_from(self._mm, offset)
+                if slot_digest == digest or slot_digest == _EMPTY or expires_at <= now:
+                    target = offset
+                    break
+                if oldest is None or last_used < oldest[1]:
+                    oldest = (offset, last_used)
+            if target is None:
+                target = oldest[0]
+                self._count(2)
+
+            start = target + _SLOT.size
+            self._mm[start:start + len(value)] = value
+            _SLOT.pack_into(self._mm, target, digest, now + ttl, now, len(value))
+
+    def delete(self, key: str) -> None:
+        digest = _digest(key)
+        with self._locked():
+            for offset in self._slot_offsets(digest):
+                if _SLOT.unpack_from(self._mm, offset)[0] == digest:
+                    _SLOT.pack_into(self._mm, offset, _EMPTY, 0.0, 0.0, 0)
+
+    def clear(self) -> None:
+        with self._locked():
+            self._clear_slots()
+
+    def _counter_offset(self, tag: str) -> int:
+        index = int.from_bytes(_digest(tag)[:8], "little") % self.tag_counters
+        return _COUNTERS_OFFSET + index * _COUNTER.size
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        with self._locked():
+            return {tag: _COUNTER.unpack_from(self._mm, self._counter_offset(tag))[0] for tag in tags}
+
+    def bump_tags(self, tags: Iterable[str]) -> None:
+        with self._locked():
+            for tag in tags:
+                offset = self._counter_offset(tag)
+                (version,) = _COUNTER.unpack_from(self._mm, offset)
+                _COUNTER.pack_into(self._mm, offset, version + 1)
+
+    def stats(self) -> Dict[str, int]:
+        now = time.time()
+        with self._locked():
+            hits, misses, evictions, expirations, oversize = _STATS.unpack_from(self._mm, _STATS_OFFSET)
+            entries = 0
+            size = 0
+            for index in range(self.slots):
+                slot_digest, expires_at, _, length = _SLOT.unpack_from(self._mm, self._slots_offset + index * self.slot_bytes)
+                if slot_digest != _EMPTY and expires_at > now:
+                    entries += 1
+                    size += length
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "expirations": expirations,
+            "oversize": oversize,
+        }
@@ -0,0 +1,71 @@
+import json
+import threading
+from typing import Dict, Iterable, Optional
+from app.decorators.cache.base import CacheBackend
+
+
+class TaggedCache:
+    """
+    Camada de invalidação por tags sobre um cache chave/valor.
+
+    Cada tag (ex.: `book:1`, `book-list`) tem um número de versão, guardado no próprio
+    backend para ser compartilhado entre os workers. Ao gravar uma entrada guardamos as
+    versões das suas tags; publicar uma tag apenas incrementa a versão, tornando obsoletas
+    todas as entradas gravadas antes disso sem precisar percorrer o cache.
+    """
+
+    def __init__(self, store: CacheBackend):
+        self.store = store
+        self.blocking = store.blocking
+        self.shared = store.shared
+        self._lock = threading.Lock()
+        self.stale = 0
+        self.invalidations = 0
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Retorna a versão atual de cada tag (0 para tags nunca publicadas)."""
+        return self.store.tag_versions(tags)
+
+    def invalidate(self, *tags: str) -> None:
+        """Publica as tags alteradas, invalidando todas as entradas que as utilizam."""
+        self.store.bump_tags(tags)
+        with self._lock:
+            self.invalidations += len(tags)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Retorna o payload armazenado, descartando-o se alguma de suas tags tiver sido publicada."""
+        raw = self.store.get(key)
+        if raw is None:
+            return None
+
+        header, _, payload = raw.partition(b"\n")
+        versions = json.loads(header)
+        if versions and self.tag_versions(versions) != versions:
+            self.store.delete(key)
+            with self._lock:
+                self.stale += 1
+            return None
+        return payload
+
+    def set(self, key: str, payload: bytes, ttl: float, versions: Optional[Dict[str, int]] = None) -> None:
+        """
+        Armazena o payload junto das versões das tags.
+
+        As versões devem ser lidas antes de consultar o banco: se uma escrita publicar a
+        tag durante a consulta, a entrada já nasce obsoleta em vez de servir dados antigos.
+        """
+        header = json.dumps(versions or {}).encode()
+        self.store.set(key, header + b"\n" + payload, ttl)
+
+    def delete(self, key: str) -> None:
+        self.store.delete(key)
+
+    def clear(self) -> None:
+        self.store.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna os contadores do cache, incluindo as entradas descartadas por invalidação."""
+        stats = self.store.stats()
+        with self._lock:
+            stats.update(stale=self.stale, invalidations=self.invalidations)
+        return stats
@@ -1,11 +1,12 @@
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.auth import Principal
 from app.models.review import Review
 from functools import wraps
 
 def moderate_review(func):
     """Decorator para filtrar palavras ofensivas em um review"""
-    def wrapper( db: Session, review_data, *args, **kwargs):
+    def wrapper( db: AsyncSession, review_data, *args, **kwargs):
         review_text = review_data.review  
         banned_words = ["porra", "merda", "caralho"]
         for word in banned_words:
@@ -16,14 +17,14 @@ def moderate_review(func):
 
 
 def check_review_owner(func):
-    """Decorator para garantir que o usuário só pode modificar seus próprios reviews"""
+    """Decorator para garantir que o usuário só pode modificar seus próprios reviews (o dono vem do token)"""
     @wraps(func)
-    def wrapper(review_id: int, user_id: int, db: Session, *args, **kwargs):
-        review = db.query(Review).filter(Review.id == review_id).first()
+    async def wrapper(review_id: int, principal: Principal, db: AsyncSession, *args, **kwargs):
+        review = await db.get(Review, review_id)
         if not review:
             raise HTTPException(status_code=404, detail="Review não encontrado")
-        if review.user_id != user_id:
+        if review.user_id != principal.id:
             raise HTTPException(status_code=403, detail="Ação não permitida. Você não é o dono desse review.")
-        return func(review_id, user_id, db, *args, **kwargs)
+        return await func(review_id, principal, db, *args, **kwargs)
 
-    return wrapper
\ No newline at end of file
+    return wrapper
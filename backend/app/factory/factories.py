@@ -1,22 +1,100 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.session import dialect_insert
 from app.models.book import Book
 from app.models.review import Review
 from app.models.user import User
-from app.schemas.book import BookCreate
-from app.schemas.review import ReviewCreate
+from app.schemas.book import BookCreate, BookUpdate, BookUpsert
+from app.schemas.review import ReviewCreate, ReviewUpdate
 from fastapi import HTTPException
 from app.decorators.review import moderate_review
+from app.decorators.cache import invalidate_tags
+from app.services.book_stats import BookStatsService
+from app.services.book_suggest import BookSuggestService
+from app.services.summary import SummaryService
 
 class BookFactory:
     @staticmethod
-    def create_book(db: Session, book_data: BookCreate) -> Book:
+    async def create_book(db: AsyncSession, book_data: BookCreate) -> Book:
         """Cria um novo livro e salva no banco de dados."""
         book = Book(**book_data.model_dump())  # Converte Pydantic para dict
         db.add(book)
-        db.commit()
-        db.refresh(book)
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="Book with this google_id already exists")
+        await db.refresh(book)
+        await invalidate_tags("book-list", f"book:google:{book.google_id}")
+        BookSuggestService.book_changed(None, (book.title, book.author))
         return book
 
+    @staticmethod
+    async def upsert_book(db: AsyncSession, google_id: str, book_data: BookUpsert) -> Book:
+        """
+        Cria o livro com este google_id ou atualiza o existente com um único `INSERT ... ON CONFLICT`.
+
+        Livros iguais aos dados enviados não são regravados: nesse caso o livro é lido pelo
+        índice único de google_id. Com o índice de sugestões carregado, o título e o autor
+        atuais são lidos antes, para trocar as sugestões antigas pelas novas na atualização.
+        """
+        values = book_data.model_dump()
+        old_suggestions = None
+        if BookSuggestService.ready:
+            old_suggestions = (
+                await db.execute(select(Book.title, Book.author).where(Book.google_id == google_id))
+            ).first()
+            old_suggestions = tuple(old_suggestions) if old_suggestions is not None else None
+        insert = dialect_insert(db)
+        statement = insert(Book).values(google_id=google_id, **values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Book.google_id],
+            set_={**{key: statement.excluded[key] for key in values}, "updated_at": func.now()},
+            where=or_(*(getattr(Book, key).is_distinct_from(statement.excluded[key]) for key in values)),
+        ).returning(Book)
+        book = (await db.scalars(statement, execution_options={"populate_existing": True})).one_or_none()
+        if book is None:
+            return await db.scalar(select(Book).where(Book.google_id == google_id))
+
+        await db.commit()
+        await invalidate_tags("book-list", f"book:{book.id}", f"book:google:{google_id}")
+        BookSuggestService.book_changed(old_suggestions, (book.title, book.author))
+        return book
+
+    @staticmethod
+    async def update_book(db: AsyncSession, book_id: int, book_update: BookUpdate) -> Book:
+        """Atualiza apenas os campos informados de um livro existente."""
+        book = await db.get(Book, book_id)
+        if not book:
+            raise HTTPException(status_code=404, detail="Book not found")
+
+        old_google_id = book.google_id
+        old_suggestions = (book.title, book.author)
+        for key, value in book_update.model_dump(exclude_unset=True).items():
+            setattr(book, key, value)
+        await db.commit()
+        await db.refresh(book)
+        await invalidate_tags(
+            "book-list", f"book:{book.id}", f"book:google:{old_google_id}", f"book:google:{book.google_id}"
+        )
+        BookSuggestService.book_changed(old_suggestions, (book.title, book.author))
+        return book
+
+    @staticmethod
+    async def delete_book(db: AsyncSession, book_id: int) -> None:
+        """Remove um livro do banco de dados."""
+        book = await db.get(Book, book_id)
+        if not book:
+            raise HTTPException(status_code=404, detail="Book not found")
+
+        google_id = book.google_id
+        old_suggestions = (book.title, book.author)
+        await db.delete(book)
+        await db.commit()
+        await invalidate_tags("book-list", f"book:{book_id}", f"book:google:{google_id}", f"reviews:book:{book_id}")
+        BookSuggestService.book_changed(old_suggestions, None)
+
 class ReviewFactory:
     @staticmethod
     
@@ -26,13 +104,13 @@ class ReviewFactory:
 
     @staticmethod
     @moderate_review
-    def create_review(db: Session, review_data: ReviewCreate) -> Review:
+    async def create_review(db: AsyncSession, review_data: ReviewCreate) -> Review:
         """Cria um novo review, verificando se o livro e o usuário existem."""
-        book = db.query(Book).filter(Book.id == review_data.book_id).first()
+        book = await db.get(Book, review_data.book_id)
         if not book:
             raise HTTPException(status_code=404, detail="Book not found")
 
-        user = db.query(User).filter(User.id == review_data.user_id).first()
+        user = await db.get(User, review_data.user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
@@ -42,6 +120,60 @@ class ReviewFactory:
 
         review = Review(**review_data.model_dump(exclude={"overall_rating"}), overall_rating=overall_rating)
         db.add(review)
-        db.commit()
-        db.refresh(review)
+        await BookStatsService.apply(db, review.book_id, BookStatsService.contribution(review))
+        stale_summary = await SummaryService.record_change(db, review.book_id)
+        await db.commit()
+        await db.refresh(review)
+        await invalidate_tags("reviews", f"reviews:book:{review.book_id}")
+        if stale_summary:
+            SummaryService.schedule(review.book_id)
         return review
+
+    @staticmethod
+    async def update_review(db: AsyncSession, review_id: int, review_update: ReviewUpdate) -> Review:
+        """Atualiza um review, recalculando a nota geral se alguma das notas mudar."""
+        review = await db.get(Review, review_id)
+        if not review:
+            raise HTTPException(status_code=404, detail="Review not found")
+
+        old_book_id = review.book_id
+        old_text = review.review
+        old_contribution = BookStatsService.contribution(review)
+        changes = review_update.model_dump(exclude_unset=True)
+        for key, value in changes.items():
+            setattr(review, key, value)
+
+        if changes.keys() & {"story_rating", "style_rating", "character_rating"}:
+            review.overall_rating = ReviewFactory.calculate_overall_rating(
+                review.story_rating, review.style_rating, review.character_rating
+            )
+
+        await BookStatsService.apply(db, old_book_id, old_contribution, sign=-1)
+        await BookStatsService.apply(db, review.book_id, BookStatsService.contribution(review))
+        # Só o texto entra no resumo: mudanças apenas nas notas não o tornam desatualizado.
+        summary_books = set()
+        if (review.review, review.book_id) != (old_text, old_book_id):
+            summary_books = {old_book_id, review.book_id}
+        stale_summaries = [book_id for book_id in summary_books if await SummaryService.record_change(db, book_id)]
+        await db.commit()
+        await db.refresh(review)
+        await invalidate_tags("reviews", f"review:{review.id}", f"reviews:book:{old_book_id}", f"reviews:book:{review.book_id}")
+        for book_id in stale_summaries:
+            SummaryService.schedule(book_id)
+        return review
+
+    @staticmethod
+    async def delete_review(db: AsyncSession, review_id: int) -> None:
+        """Remove um review do banco de dados."""
+        review = await db.get(Review, review_id)
+        if not review:
+            raise HTTPException(status_code=404, detail="Review not found")
+
+        book_id = review.book_id
+        await BookStatsService.apply(db, book_id, BookStatsService.contribution(review), sign=-1)
+        stale_summary = await SummaryService.record_change(db, book_id)
+        await db.delete(review)
+        await db.commit()
+        await invalidate_tags("reviews", f"review:{review_id}", f"reviews:book:{book_id}")
+        if stale_summary:
+            SummaryService.schedule(book_id)
@@ -1,8 +1,14 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-from app.routes import auth, api, book, review, ia, favorites
+from app.routes import auth, api, book, review, ia, favorites, catalog, metrics
 from app.config import settings
+from app.database.session import async_engine
+from app.services.book_suggest import BookSuggestService
+from app.services.catalog import google_books
+from app.services.refresh_token import RefreshTokenService
+from app.services.summary import summary_jobs
 from dotenv import load_dotenv
 import os
 from starlette.requests import Request
@@ -33,7 +39,25 @@ SESSION_COOKIE_NAME = "session"
 SESSION_MAX_AGE = 60 * 60 * 24
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ao subir, carrega as sessões encerradas recentemente no filtro de revogação e os títulos
+    e autores no índice de sugestões, e sobe o pool de processos dos resumos com o motor já
+    aquecido; ao desligar, encerra esse pool, as conexões com o Google Books e as do pool
+    assíncrono.
+    """
+    await RefreshTokenService.load_revoked_sessions()
+    await BookSuggestService.warm()
+    await summary_jobs.start()
+    yield
+    summary_jobs.shutdown()
+    await google_books.aclose()
+    await async_engine.dispose()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json"
@@ -88,3 +112,5 @@ app.include_router(book.router, prefix=settings.API_V1_PREFIX)
 app.include_router(review.router, prefix=settings.API_V1_PREFIX)
 app.include_router(ia.router, prefix=settings.API_V1_PREFIX)
 app.include_router(favorites.router, prefix=settings.API_V1_PREFIX)
+app.include_router(catalog.router, prefix=settings.API_V1_PREFIX)
+app.include_router(metrics.router)
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.sql import func
-from app.database.session import Base
+from app.database.session import Base, ServerTimestamp
 from sqlalchemy.orm import relationship
 
 class Book(Base):
@@ -13,7 +13,27 @@ class Book(Base):
     google_id = Column(String, nullable=True)
     genre = Column(String, nullable=True)
     published_year = Column(Integer, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(ServerTimestamp, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     thumbnail = Column(String, nullable=True)
     favorites = relationship("Favorito", back_populates="livro")
+
+    # Índices da listagem paginada por cursor: cada ordenação/filtro termina em `id`.
+    # `ix_books_google_id` é único e serve de alvo para o upsert por google_id.
+    __table_args__ = (
+        Index("ix_books_google_id", google_id, unique=True),
+        Index("ix_books_created_at_id", created_at, id),
+        Index("ix_books_title_id", title, id),
+        Index("ix_books_published_year_sort", func.coalesce(published_year, 0), id),
+        Index("ix_books_published_year", published_year),
+        # Filtros por gênero/autor, um índice por ordenação aceita em `list_books`
+        Index("ix_books_genre_created_at_id", genre, created_at, id),
+        Index("ix_books_genre_title_id", genre, title, id),
+        Index("ix_books_genre_published_year_sort", genre, func.coalesce(published_year, 0), id),
+        Index("ix_books_author_created_at_id", author, created_at, id),
+        Index("ix_books_author_title_id", author, title, id),
+        Index("ix_books_author_published_year_sort", author, func.coalesce(published_year, 0), id),
+    )
+    # No Postgres, a tabela também tem a coluna gerada `search_vector` (tsvector com índice GIN),
+    # criada na migração a8e4c2f17b39 e usada apenas pelo BookSearchService. Ela fica fora do
+    # modelo para não ser carregada junto com os livros nem exigida em outros bancos.
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime
+from sqlalchemy.sql import func
+from app.database.session import Base
+
+
+class BookStats(Base):
+    """Agregados das avaliações de um livro, mantidos incrementalmente a cada review."""
+    __tablename__ = "book_stats"
+
+    book_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    overall_sum = Column(Float, nullable=False, default=0)
+    story_sum = Column(Integer, nullable=False, default=0)
+    style_sum = Column(Integer, nullable=False, default=0)
+    character_sum = Column(Integer, nullable=False, default=0)
+    recommend_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
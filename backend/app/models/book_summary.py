@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime
+from app.database.session import Base
+
+
+class BookSummary(Base):
+    """Resumo das reviews de um livro, regenerado apenas quando as reviews mudam o suficiente."""
+    __tablename__ = "book_summaries"
+
+    book_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True)
+    summary = Column(Text, nullable=True)
+    review_count = Column(Integer, nullable=False, default=0)  # reviews usadas no último resumo
+    pending_changes = Column(Integer, nullable=False, default=0)  # reviews alteradas desde então
+    generated_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Text, DateTime
+from app.database.session import Base
+
+
+class CatalogCache(Base):
+    """Resposta normalizada de uma busca no Google Books, reaproveitada até `expires_at`."""
+    __tablename__ = "catalog_cache"
+
+    key = Column(String(64), primary_key=True)  # SHA-256 da consulta normalizada
+    query = Column(Text, nullable=False)
+    response = Column(Text, nullable=False)  # JSON com a lista de livros normalizada
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+from sqlalchemy.sql import func
+from app.database.session import Base
+
+
+class RefreshToken(Base):
+    """
+    Refresh token de uma sessão. Guardamos apenas o SHA-256 do token, nunca o valor.
+
+    Cada uso gera um novo token na mesma família (`family_id`, que identifica a sessão) e
+    revoga o anterior, apontando para o substituto em `replaced_by_id`. Um token revogado
+    sem substituto encerra a sessão (logout ou reuso de um token já trocado).
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False, unique=True)
+    family_id = Column(String(32), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    replaced_by_id = Column(Integer, ForeignKey("refresh_tokens.id", ondelete="SET NULL"), nullable=True)
+
+    __table_args__ = (
+        # Sessões encerradas recentemente, carregadas no filtro de revogação ao subir a API
+        Index("ix_refresh_tokens_revoked_at", "revoked_at"),
+    )
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Boolean, Index
 from sqlalchemy.sql import func
-from app.database.session import Base
+from app.database.session import Base, ServerTimestamp
 
 class Review(Base):
     __tablename__ = "reviews"
@@ -15,5 +15,11 @@ class Review(Base):
     character_rating = Column(Integer, nullable=False) 
     overall_rating = Column(Float, nullable=False) 
     recommendation = Column(Boolean, default=False)  
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(ServerTimestamp, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Índices da listagem paginada por cursor (mais recentes primeiro)
+    __table_args__ = (
+        Index("ix_reviews_created_at_id", created_at, id),
+        Index("ix_reviews_book_id_created_at_id", book_id, created_at, id),
+    )
@@ -1,25 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database.session import get_db
+from typing import Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.session import get_async_db
 from app.models.user import User
-from app.config import settings
-from app.schemas.user import UserResponse, UserLogin
-from app.core.security import create_access_token, verify_password, oauth2_scheme, verify_access_token
-from jose import JWTError, jwt
+from app.schemas.user import UserResponse, UserLogin, UserSummary, UserPage, Token, RefreshRequest
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.auth import Principal, authenticate, get_principal
+from app.core.security import create_access_token, user_claims
+from app.services.auth import AuthService
+from app.services.refresh_token import RefreshTokenService
 import logging
 
 #router = APIRouter(prefix="/api")
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+MAX_BATCH_USER_IDS = 100
+
+
+def _parse_user_ids(ids: str) -> list[int]:
+    try:
+        user_ids = sorted({int(user_id) for user_id in ids.split(",") if user_id.strip()})
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ids must be a comma-separated list of integers")
+    if len(user_ids) > MAX_BATCH_USER_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {MAX_BATCH_USER_IDS} ids can be requested at once"
+        )
+    return user_ids
+
+
+# Declarada antes de /users/{user_id}, senão "batch" seria lido como um ID
+@router.get("/users/batch", response_model=Dict[int, UserSummary])
+async def get_users_batch(ids: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Resolve several users in a single query.
+
+    - ids: Comma-separated user IDs (e.g. `1,2,3`), at most 100.
+
+    Returns an `id -> {username}` map; unknown IDs are omitted.
+    """
+    user_ids = _parse_user_ids(ids)
+    query = select(User.id, User.username).where(User.id.in_(user_ids))
+    rows = (await db.execute(query)).all() if user_ids else []
+    logger.info(f"Resolved {len(rows)} of {len(user_ids)} requested users.")
+    return {row.id: UserSummary(username=row.username) for row in rows}
+
+
 @router.get("/users/{user_id}", response_model=UserResponse)
-async def get_user(user_id: int, db: Session = Depends(get_db)):
+async def get_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Retrieve a user by their ID.
     
     - user_id: ID of the user to retrieve.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         logger.error(f"User with id {user_id} not found.")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -27,132 +63,140 @@ async def get_user(user_id: int, db: Session = Depends(get_db)):
     return user
 
 
-@router.get("/users", response_model=list[UserResponse])
-async def get_all_users(db: Session = Depends(get_db)):
+@router.get("/users", response_model=UserPage)
+async def get_all_users(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    Retrieve a list of all users.
+    Retrieve users one page at a time, ordered by ID.
+    Pass the returned `next_cursor` to fetch the next page.
     """
-    users = db.query(User).all()
+    query = select(User)
+    if cursor:
+        (last_id,) = decode_cursor(cursor, int)
+        query = query.where(User.id > last_id)
+    users = (await db.scalars(query.order_by(User.id).limit(limit + 1))).all()
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor(users[-1].id)
     logger.info(f"Retrieved {len(users)} users.")
-    return users
+    return UserPage(items=users, next_cursor=next_cursor)
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(user_id: int, db: Session = Depends(get_db)):
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Delete a user by their ID.
     
     - user_id: ID of the user to delete.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         logger.error(f"User with id {user_id} not found for deletion.")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
     logger.info(f"User with id {user_id} deleted successfully.")
     return
 
 
 @router.post("/token")
-async def login(user_login: UserLogin, db: Session = Depends(get_db)):
+async def login(user_login: UserLogin, request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Login with email and password.
     
     - user_login: The login credentials (email and password).
+
+    Attempts are rate limited per client IP and per account; over the limit, 429 is returned
+    before any password hashing.
     """
-    user = db.query(User).filter(User.email == user_login.email).first()
-    if not user or not verify_password(user_login.password, user.password):
+    client_ip = request.client.host if request.client else None
+    user = await AuthService.authenticate_user(db, user_login.email, user_login.password, client_ip)
+    if not user:
         logger.error(f"Incorrect email or password for {user_login.email}.")
         raise HTTPException(status_code=400, detail="Incorrect email or password")
-    access_token = create_access_token(subject=user.id)
+    refresh_token, session_id = await RefreshTokenService.issue(db, user)
+    access_token = create_access_token(subject=user.id, claims=user_claims(user, session_id))
     logger.info(f"User {user.email} logged in successfully.")
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+
+@router.post("/token/refresh", response_model=Token)
+async def refresh_access_token(request: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+
+    No password is checked: this is how clients keep a session alive past the access
+    token's short lifetime. The presented refresh token is spent; reusing it ends the session.
+    """
+    rotated = await RefreshTokenService.rotate(db, request.refresh_token)
+    if rotated is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired refresh token")
+    user, refresh_token, session_id = rotated
+    access_token = create_access_token(subject=user.id, claims=user_claims(user, session_id))
+    return Token(access_token=access_token, refresh_token=refresh_token)
+
+
+@router.post("/token/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_refresh_token(request: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    End the session of a refresh token (logout).
+
+    Access tokens already issued for the session are rejected from then on by every
+    authenticated route, in every worker.
+    """
+    await RefreshTokenService.revoke(db, request.refresh_token)
+    return
 
 
-async def get_user_from_token(token: str, db: Session):
+async def get_user_from_token(token: str, db: AsyncSession):
     """
     Retrieve user from the token.
     
     - token: The JWT token used to retrieve user data.
     """
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
-            logger.error("Invalid token, missing user ID.")
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
-    except JWTError as e:
-        logger.error(f"JWT decode error: {str(e)}")
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
-
-    user = db.query(User).filter(User.id == user_id).first()
+    user_id = (await authenticate(token, db)).id
+    user = await db.get(User, user_id)
     if user is None:
         logger.error(f"User with id {user_id} not found.")
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    try:
-        # Verifica o token e extrai o id do usuário
-        user_id = verify_access_token(token)
-        user = db.query(User).filter(User.id == user_id).first()
-
-        if user is None:
-            raise HTTPException(status_code=404, detail="Usuário não encontrado")
-        return user
+async def get_current_user(principal: Principal = Depends(get_principal)) -> User:
+    """
+    Load the authenticated user's row.
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Token inválido ou expirado")
+    Routes that only need the user's ID, username or active flag should depend on
+    `get_principal` instead, which answers from the token claims without a query.
+    """
+    return await principal.load_user()
 
 
 # Rota para obter informações do usuário autenticado
 @router.get("/user/actual")
-async def get_user_info(token: str, db: Session = Depends(get_db)):
+async def get_user_info(token: str, db: AsyncSession = Depends(get_async_db)):
     """
     Retrieve information about the currently authenticated user.
     
     - token: The JWT token used to authenticate the user.
     """
-    try:
-        logger.debug(f"Received token: {token[:10]}...")  # Mostra os primeiros 10 caracteres para debug (não exponha o token completo)
-        
-        # Verifica o token e extrai o id do usuário
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        
-        if payload.get("sub") is None:
-            logger.error("Token inválido: campo 'sub' ausente.")
-            raise HTTPException(status_code=401, detail="Invalid token payload")
-        
-        user_id = payload.get("sub")
-        user = db.query(User).filter(User.id == user_id).first()
-
-        if user is None:
-            logger.error(f"Usuário com ID {user_id} não encontrado.")
-            raise HTTPException(status_code=404, detail="Usuário não encontrado")
-        
-        return user
-
-    except JWTError as e:
-        logger.error(f"JWT Error: {str(e)}")
-        raise HTTPException(status_code=401, detail="Token inválido ou expirado")
-
-    except Exception as e:
-        logger.error(f"Erro ao recuperar informações do usuário: {str(e)}")
-        raise HTTPException(status_code=422, detail=f"Erro ao processar a requisição: {str(e)}")
+    return await get_user_from_token(token, db)
 
 
 
 @router.post("/google-auth")
-async def google_auth(user_data: dict, db: Session = Depends(get_db)):
+async def google_auth(user_data: dict, db: AsyncSession = Depends(get_async_db)):
     """
     Create or update user from Google OAuth data.
     
     - user_data: The user information retrieved from Google OAuth.
     """
     try:
-        user = db.query(User).filter(User.email == user_data["email"]).first()
+        user = await db.scalar(select(User).where(User.email == user_data["email"]))
         if not user:
             user = User(
                 email=user_data["email"],
@@ -160,8 +204,8 @@ async def google_auth(user_data: dict, db: Session = Depends(get_db)):
                 name=user_data.get("name", ""),
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
             logger.info(f"User {user.email} created via Google OAuth.")
         else:
             logger.info(f"User {user.email} already exists, logged in via Google OAuth.")
@@ -175,7 +219,7 @@ async def google_auth(user_data: dict, db: Session = Depends(get_db)):
 
     except Exception as e:
         logger.error(f"Error in google_auth: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error processing Google authentication"
@@ -1,13 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from authlib.integrations.starlette_client import OAuth
 from starlette.requests import Request
 from app.models.user import User
-from app.database.session import get_db
+from app.database.session import get_async_db
 from app.services.auth import AuthService
-from app.core.security import create_access_token, verify_access_token, verify_google_token
+from app.services.refresh_token import RefreshTokenService
+from app.core.google_keys import is_google_token
+from app.core.auth import authenticate
+from app.core.security import create_access_token, user_claims, verify_google_token
 from app.schemas.user import UserCreate, UserResponse, Token
 import os
 import logging
@@ -31,15 +35,15 @@ oauth.register(
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)) -> UserResponse:
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)) -> UserResponse:
     """
     Register a new user.
     Checks if the user already exists using the email or username.
     If a user already exists, raises a 400 error.
     """
-    existing_user = db.query(User).filter(
-        (User.email == user_data.email) | (User.username == user_data.username)
-    ).first()
+    existing_user = await db.scalar(
+        select(User).where((User.email == user_data.email) | (User.username == user_data.username))
+    )
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email or username already registered"
@@ -51,16 +55,17 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)) -> User
 
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Token:
     """
     Login with username and password.
     Authenticates the user and returns a token. If credentials are incorrect, raises a 401 error.
     """
     user = await AuthService.authenticate_user(
-        db, form_data.username, form_data.password
+        db, form_data.username, form_data.password, request.client.host if request.client else None
     )
 
     if not user:
@@ -70,7 +75,8 @@ async def login(
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token(user.id)
+    refresh_token, session_id = await RefreshTokenService.issue(db, user)
+    access_token = create_access_token(user.id, claims=user_claims(user, session_id))
 
     logger.info(f"User {form_data.username} authenticated successfully.")
     response.set_cookie(
@@ -82,7 +88,7 @@ async def login(
         max_age=3600
     )
 
-    return Token(access_token=access_token)
+    return Token(access_token=access_token, refresh_token=refresh_token)
 
 
 @router.get("/auth/google/login")
@@ -104,7 +110,7 @@ async def google_login(request: Request):
 
 
 @router.get('/auth/google/callback')
-async def google_callback(request: Request, db: Session = Depends(get_db)):
+async def google_callback(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Handle the callback after Google OAuth authentication.
     Verifies the nonce to prevent CSRF attacks, retrieves user data, and creates or logs in the user.
@@ -129,16 +135,16 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
         if not google_user_id or not email:
             raise HTTPException(status_code=400, detail="Invalid user information received from Google")
 
-        existing_user = db.query(User).filter(User.google_id == google_user_id).first()
+        existing_user = await db.scalar(select(User).where(User.google_id == google_user_id))
 
         if not existing_user:
             new_user = User(email=email, username=email.split('@')[0], google_id=google_user_id)
             db.add(new_user)
-            db.commit()
-            db.refresh(new_user)
+            await db.commit()
+            await db.refresh(new_user)
             existing_user = new_user
 
-        access_token = create_access_token(existing_user.id)
+        access_token = create_access_token(existing_user.id, claims=user_claims(existing_user))
 
         response = RedirectResponse(url="http://localhost:5173/home")
         response.set_cookie(
@@ -162,25 +168,20 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
 @router.get("/user/me")
-def get_user_data(authorization: str = Depends(oauth2_scheme)):
+async def get_user_data(authorization: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     """
     Retrieve the currently authenticated user's data using either a Google or regular access token.
+    The issuer is read from the unverified payload first, so our own tokens never go through
+    Google verification and Google tokens are checked against the locally cached signing keys.
+    Our own tokens are rejected once their session has been ended (logout or refresh token reuse).
     If token is invalid or expired, raises a 401 error.
     """
-    try:
-        user = verify_google_token(authorization)
-        if user:
-            return user
-    except Exception as e:
-        logger.error(f"Google token verification failed: {e}")
-        pass 
-
-    try:
-        user = verify_access_token(authorization)
-        if user:
-            return user
-    except Exception as e:
-        logger.error(f"Access token verification failed: {e}")
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token.")
-
-    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token.")
+    if is_google_token(authorization):
+        try:
+            return await verify_google_token(authorization)
+        except Exception as e:
+            logger.error(f"Google token verification failed: {e}")
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token.")
+
+    principal = await authenticate(authorization, db)
+    return principal.claims["sub"]
@@ -1,78 +1,216 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.book import Book
-from app.schemas.book import BookCreate, BookUpdate, BookOut
-from app.database.session import get_db
+from app.models.book_stats import BookStats
+from app.schemas.book import (
+    BookCreate, BookUpdate, BookUpsert, BookOut, BookPage, BookSearchPage, BookSuggestion, BookStatsOut, BookDetailsOut,
+    BookImportReport,
+)
+from app.database.session import get_async_db
 from app.factory.factories import BookFactory
+from app.services.book_stats import BookStatsService
+from app.services.book_import import MAX_BATCH_SIZE, BookImportService, read_ndjson
+from app.services.book_page import BookPageService
+from app.services.book_search import BookSearchService
+from app.services.book_suggest import BookSuggestService
 from app.decorators.book import cache_response
+from app.core.auth import Principal, get_optional_principal, get_principal
+from app.core.pagination import encode_cursor, decode_cursor, keyset_filter
 
 router = APIRouter(prefix="/books", tags=["Books"])
 
+# Ordenações aceitas na listagem: expressão SQL (coberta por um índice terminado em `id`)
+# e como ler o mesmo valor do último livro da página para montar o cursor.
+SORT_KEYS = {
+    "created_at": (Book.created_at, lambda book: book.created_at),
+    "title": (Book.title, lambda book: book.title),
+    "published_year": (func.coalesce(Book.published_year, 0), lambda book: book.published_year or 0),
+}
+# Tipo do valor de ordenação guardado no cursor, conferido ao decodificá-lo
+SORT_VALUE_TYPES = {"created_at": datetime, "title": str, "published_year": int}
+
 @router.post("/", response_model=BookOut)
-def create_book(book: BookCreate, db: Session = Depends(get_db)):
+async def create_book(book: BookCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new book.
     This endpoint creates a new book in the database.
     """
-    new_book = BookFactory.create_book(db, book)
+    new_book = await BookFactory.create_book(db, book)
     return new_book
 
-@router.get("/", response_model=list[BookOut])
-@cache_response(timeout=120) #cache de 2 minutos
-def list_books(db: Session = Depends(get_db)):
+@router.post("/bulk", response_model=BookImportReport, dependencies=[Depends(get_principal)])
+async def import_books(
+    request: Request,
+    batch_size: Optional[int] = Query(None, ge=1, le=MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Import books from an NDJSON body, one BookCreate object per line. Requires authentication.
+    The body is read as a stream and the books are inserted in batches with multi-row
+    INSERT ... ON CONFLICT DO NOTHING, so books whose google_id already exists are skipped.
+    The report counts inserted, duplicate and invalid lines and lists the invalid ones.
+    """
+    return await BookImportService.run(db, read_ndjson(request.stream()), batch_size)
+
+@router.get("/", response_model=BookPage)
+@cache_response(timeout=600, model=BookPage, tags=["book-list"])  # cache de 10 minutos, invalidado nas escritas
+async def list_books(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    genre: Optional[str] = None,
+    author: Optional[str] = None,
+    published_year_min: Optional[int] = None,
+    published_year_max: Optional[int] = None,
+    sort: Literal["created_at", "title", "published_year"] = "created_at",
+    order: Literal["asc", "desc"] = "desc",
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    List books one page at a time.
+    Results can be filtered by genre, author and publication year range and sorted by
+    creation date, title or publication year. Pass the returned `next_cursor` to fetch
+    the next page; every page costs the same index lookup regardless of depth.
+    """
+    query = select(Book)
+    if genre is not None:
+        query = query.where(Book.genre == genre)
+    if author is not None:
+        query = query.where(Book.author == author)
+    if published_year_min is not None:
+        query = query.where(Book.published_year >= published_year_min)
+    if published_year_max is not None:
+        query = query.where(Book.published_year <= published_year_max)
+
+    sort_column, sort_value = SORT_KEYS[sort]
+    descending = order == "desc"
+    if cursor:
+        cursor_sort, cursor_order, value, last_id = decode_cursor(cursor, str, str, SORT_VALUE_TYPES[sort], int)
+        if (cursor_sort, cursor_order) != (sort, order):
+            raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+        query = query.where(keyset_filter((sort_column, Book.id), (value, last_id), descending))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), Book.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Book.id.asc())
+
+    books = (await db.scalars(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(books) > limit:
+        books = books[:limit]
+        next_cursor = encode_cursor(sort, order, sort_value(books[-1]), books[-1].id)
+    return BookPage(items=books, next_cursor=next_cursor)
+
+# Declaradas antes de /{book_id}, senão "search" e "suggest" seriam lidos como um ID
+@router.get("/suggest", response_model=List[BookSuggestion])
+async def suggest_books(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    List all books.
-    This endpoint retrieves all books from the database.
+    Autocomplete titles and authors for the search box.
+    Prefix matches come from an in-memory index and need no database round trip; when
+    there are not enough of them, fuzzy matches (typo tolerant) are added from the database.
     """
-    return db.query(Book).all()
+    return await BookSuggestService.suggest(db, prefix, limit)
+
+@router.get("/search", response_model=BookSearchPage)
+@cache_response(timeout=300, model=BookSearchPage, tags=["book-list"])
+async def search_books(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Full-text search over the books in our catalog.
+    Matches title, author, genre and description (Portuguese stemming, accents ignored)
+    and returns the most relevant books first, each with a highlighted excerpt. Supports
+    web-search syntax: quoted phrases, `or` and `-excluded` terms. Pass the returned
+    `next_cursor` to fetch the next page.
+    """
+    return await BookSearchService.search(db, q, limit, cursor)
 
 @router.get("/{book_id}", response_model=BookOut)
-def get_book(book_id: int, db: Session = Depends(get_db)):
+@cache_response(timeout=600, model=BookOut, tags=["book:{book_id}"])
+async def get_book(book_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get a book by its ID.
     This endpoint retrieves a book from the database by its ID.
     """
-    book = db.query(Book).filter(Book.id == book_id).first()
+    book = await db.get(Book, book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
     return book
 
+@router.get("/{book_id}/stats", response_model=BookStatsOut)
+@cache_response(timeout=600, model=BookStatsOut, tags=["reviews:book:{book_id}"])
+async def get_book_stats(book_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get the rating aggregates of a book.
+    Averages, review count and recommendation ratio are read from the precomputed
+    `book_stats` row, so the cost does not depend on how many reviews the book has.
+    """
+    stats = await db.get(BookStats, book_id)
+    if stats is None and await db.get(Book, book_id) is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return BookStatsService.summarize(book_id, stats)
+
 @router.get("/google/{google_id}", response_model=BookOut)
-def get_book_by_google_id(google_id: str, db: Session = Depends(get_db)):
+@cache_response(timeout=600, model=BookOut, tags=["book:google:{google_id}"])
+async def get_book_by_google_id(google_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get a book by its Google ID.
     This endpoint retrieves a book from the database by its Google ID.
     """
-    book = db.query(Book).filter(Book.google_id == google_id).first()
+    book = await db.scalar(select(Book).where(Book.google_id == google_id))
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
     return book  # Simplified: directly return the Book object as response
 
+@router.put("/google/{google_id}", response_model=BookOut)
+async def upsert_book_by_google_id(google_id: str, book: BookUpsert, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create or update a book by its Google ID.
+    This endpoint saves the book in a single INSERT ... ON CONFLICT, so calling it again
+    with the same data is safe and concurrent calls never create duplicates.
+    """
+    return await BookFactory.upsert_book(db, google_id, book)
+
+@router.get("/google/{google_id}/page", response_model=BookDetailsOut)
+async def get_book_page(
+    google_id: str,
+    reviews_limit: int = Query(20, ge=1, le=100),
+    principal: Optional[Principal] = Depends(get_optional_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get everything the book page needs in a single request.
+    Returns the book, the first page of reviews with each reviewer's username, the AI
+    summary, the rating stats and whether the logged-in user favorited the book. The
+    token is optional: anonymous visitors get `is_favorite` false. The review page is
+    fetched concurrently with the other lookups.
+    """
+    return await BookPageService.load(db, google_id, principal.id if principal else None, reviews_limit)
+
 @router.put("/{book_id}", response_model=BookOut)
-def update_book(book_id: int, book_update: BookUpdate, db: Session = Depends(get_db)):
+async def update_book(book_id: int, book_update: BookUpdate, db: AsyncSession = Depends(get_async_db)):
     """
     Update an existing book by its ID.
     This endpoint updates the fields of an existing book based on the provided input.
     Only the fields specified in the request are updated.
     """
-    book = db.query(Book).filter(Book.id == book_id).first()
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-    for key, value in book_update.dict(exclude_unset=True).items():
-        setattr(book, key, value)
-    db.commit()
-    db.refresh(book)
-    return book
+    return await BookFactory.update_book(db, book_id, book_update)
 
 @router.delete("/{book_id}")
-def delete_book(book_id: int, db: Session = Depends(get_db)):
+async def delete_book(book_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Delete a book by its ID.
     This endpoint deletes a book from the database.
     """
-    book = db.query(Book).filter(Book.id == book_id).first()
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-    db.delete(book)
-    db.commit()
+    await BookFactory.delete_book(db, book_id)
     return {"message": "Book deleted successfully"}
@@ -0,0 +1,23 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.session import get_async_db
+from app.schemas.book import CatalogBook
+from app.services.catalog import CatalogService
+
+router = APIRouter(prefix="/catalog", tags=["Catalog"])
+
+
+@router.get("/search", response_model=List[CatalogBook])
+async def search_catalog(
+    q: str = Query(..., min_length=1, max_length=200, pattern=r"\S"),
+    max_results: int = Query(10, ge=1, le=40),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Search the Google Books catalog through the backend.
+    Responses are normalized to the shape the frontend uses and cached in the database,
+    so repeated searches do not reach Google Books (nor spend its quota). Identical
+    searches in flight at the same time share a single upstream call.
+    """
+    return await CatalogService.search(db, q, max_results)
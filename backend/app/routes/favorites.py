@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.book import Book
 from app.models.favorite import Favorito
-from app.database.session import get_db
+from app.database.session import get_async_db
 from app.factory.factories import BookFactory
 from app.decorators.book import cache_response
+from app.decorators.cache import invalidate_tags
+from app.schemas.book import BookOut
 from app.models.user import User
 from app.routes.api import get_current_user
 
@@ -12,55 +15,62 @@ router = APIRouter()
 
 # Função para favoritar livro
 @router.post("/favoritar/{livro_id}")
-def favoritar(livro_id: int, user_id: int, db: Session = Depends(get_db)):
+async def favoritar(livro_id: int, user_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Adiciona um livro aos favoritos de um usuário.
     
     - livro_id: ID do livro a ser favoritado.
     - user_id: ID do usuário que está favoritando o livro.
     """
-    favorito = db.query(Favorito).filter(Favorito.user_id == user_id, Favorito.livro_id == livro_id).first()
+    favorito = await db.scalar(
+        select(Favorito).where(Favorito.user_id == user_id, Favorito.livro_id == livro_id)
+    )
     if favorito:
         raise HTTPException(status_code=400, detail="Você já favoritou este livro")
     
     # Adiciona o livro aos favoritos
     novo_favorito = Favorito(user_id=user_id, livro_id=livro_id)
     db.add(novo_favorito)
-    db.commit()
-    db.refresh(novo_favorito)
+    await db.commit()
+    await db.refresh(novo_favorito)
+    await invalidate_tags(f"favorites:user:{user_id}")
     
     return {"message": "Livro favoritado com sucesso!"}
 
 
 # Função para desfavoritar livro
 @router.delete("/desfavoritar/{livro_id}")
-def desfavoritar(livro_id: int, user_id: int, db: Session = Depends(get_db)):
+async def desfavoritar(livro_id: int, user_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Remove um livro dos favoritos de um usuário.
     
     - livro_id: ID do livro a ser desfavoritado.
     - user_id: ID do usuário que está desfavoritando o livro.
     """
-    favorito = db.query(Favorito).filter(Favorito.user_id == user_id, Favorito.livro_id == livro_id).first()
+    favorito = await db.scalar(
+        select(Favorito).where(Favorito.user_id == user_id, Favorito.livro_id == livro_id)
+    )
     
     if not favorito:
         raise HTTPException(status_code=404, detail="Favorito não encontrado")
     
-    db.delete(favorito)
-    db.commit()
+    await db.delete(favorito)
+    await db.commit()
+    await invalidate_tags(f"favorites:user:{user_id}")
     
     return {"message": "Livro desfavoritado com sucesso!"}
 
 
 # Função para listar os favoritos do usuário
 @router.get("/favoritos")
-def get_favoritos(user_id: int, db: Session = Depends(get_db)):
+@cache_response(timeout=600, model=list[BookOut], tags=["favorites:user:{user_id}", "book-list"])
+async def get_favoritos(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Lista os livros favoritos de um usuário.
     
     - user_id: ID do usuário cujos favoritos serão listados.
     """
-    favoritos = db.query(Book).join(Favorito).filter(Favorito.user_id == user_id).all()
+    favoritos = (await db.scalars(select(Book).join(Favorito).where(Favorito.user_id == user_id))).all()
     
     if not favoritos:
         raise HTTPException(status_code=404, detail="Nenhum livro favorito encontrado")
@@ -69,13 +79,16 @@ def get_favoritos(user_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/favoritos/{livro_id}")
-def check_favorito(livro_id: int, user_id: int, db: Session = Depends(get_db)):
+@cache_response(timeout=600, tags=["favorites:user:{user_id}"])
+async def check_favorito(livro_id: int, user_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Verifica se o livro já foi favoritado pelo usuário.
     
     - livro_id: ID do livro a ser verificado.
     """
-    favorito = db.query(Favorito).filter(Favorito.user_id == user_id, Favorito.livro_id == livro_id).first()
+    favorito = await db.scalar(
+        select(Favorito).where(Favorito.user_id == user_id, Favorito.livro_id == livro_id)
+    )
     
     if favorito:
         return {"isFavorito": True}
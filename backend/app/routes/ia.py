@@ -1,24 +1,46 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer
-from app.database.session import get_db
-from app.models.review import Review
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.session import get_async_db
+from app.schemas.book import SummaryStatusOut
+from app.services.summary import SummaryService
 
 router = APIRouter()
 
+
 @router.get("/books/{book_id}/ai-summary")
-async def generate_local_summary(book_id: int, db: Session = Depends(get_db)):
-    reviews = db.query(Review).filter(Review.book_id == book_id).all()
+async def generate_local_summary(book_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get the stored AI summary of a book's reviews.
+    Summaries are regenerated in the background once enough reviews change, so this
+    endpoint only reads the stored row.
+    """
+    row = await SummaryService.get(db, book_id)
 
-    if not reviews:
+    if row is None or (row.summary is None and row.pending_changes == 0):
         return {"message": "Nenhuma review encontrada para este livro."}
 
-    reviews_text = " ".join([r.review for r in reviews])
+    if row.summary is None:
+        return {"message": "O resumo deste livro está sendo gerado."}
+
+    return {"ai_review": row.summary}
 
-    parser = PlaintextParser.from_string(reviews_text, Tokenizer("portuguese"))
-    summarizer = LsaSummarizer()
-    summary = summarizer(parser.document, 4)
 
-    return {"ai_review": " ".join(str(sentence) for sentence in summary)}
+@router.get("/books/{book_id}/ai-summary/status", response_model=SummaryStatusOut)
+async def get_summary_status(book_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get the state of a book's AI summary.
+    Returns the last good summary together with the status of its background refresh
+    (`queued`, `running`, `done`, `failed`, or `idle` if none ran in this worker), so
+    clients can poll while a refresh runs.
+    """
+    row = await SummaryService.get(db, book_id)
+    job = SummaryService.job_status(book_id)
+    return SummaryStatusOut(
+        book_id=book_id,
+        status=job.status if job else "idle",
+        summary=row.summary if row else None,
+        review_count=row.review_count if row else 0,
+        pending_changes=row.pending_changes if row else 0,
+        generated_at=row.generated_at if row else None,
+        error=job.error if job else None,
+    )
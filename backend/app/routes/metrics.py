@@ -0,0 +1,31 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.hashing import password_hasher
+from app.core.metrics import (
+    render_cache_metrics, render_catalog_metrics, render_hashing_metrics, render_job_metrics,
+    render_login_throttle_metrics, render_pool_metrics,
+)
+from app.core.rate_limit import login_throttle
+from app.database.session import async_engine, engine
+from app.decorators.cache import response_cache, run_cache
+from app.services.catalog import CatalogService
+from app.services.summary import summary_jobs
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Expose connection pool, response cache, job queue, password hashing, login rate
+    limiting and Google Books proxy metrics in the Prometheus text format.
+    Pool gauges (size, in use, idle, overflow) are read at scrape time; checkout wait
+    time is a histogram accumulated since the process started.
+    """
+    lines = render_pool_metrics([("async", async_engine), ("sync", engine)])
+    lines += render_cache_metrics(await run_cache(response_cache.stats))
+    lines += render_job_metrics(summary_jobs.name, summary_jobs.stats())
+    lines += render_hashing_metrics(password_hasher.stats())
+    lines += render_login_throttle_metrics(login_throttle.stats())
+    lines += render_catalog_metrics(CatalogService.stats())
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
@@ -1,93 +1,138 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.review import Review
-from app.models.book import Book
-from app.models.user import User
-from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewOut
-from app.database.session import get_db
+from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewOut, ReviewPage
+from app.database.session import get_async_db, AsyncSessionLocal
 from app.factory.factories import ReviewFactory
 from app.decorators.review import check_review_owner
-from fastapi.responses import JSONResponse
+from app.decorators.book import cache_response
+from app.core.auth import Principal, get_principal
+from app.core.pagination import encode_cursor, decode_cursor, keyset_filter
+from fastapi.responses import JSONResponse, StreamingResponse
 
 router = APIRouter(prefix="/reviews", tags=["Reviews"])
 
-def calculate_overall_rating(story_rating: int, style_rating: int, character_rating: int) -> float:
+STREAM_CHUNK_SIZE = 500
+
+
+def _after_cursor(cursor: Optional[str]) -> list:
+    """Filtros que continuam a listagem (mais recentes primeiro) após o cursor informado."""
+    if not cursor:
+        return []
+    created_at, last_id = decode_cursor(cursor, datetime, int)
+    return [keyset_filter((Review.created_at, Review.id), (created_at, last_id), descending=True)]
+
+
+async def _paginate_reviews(db: AsyncSession, filters: list, limit: int, cursor: Optional[str]) -> ReviewPage:
+    """Retorna uma página de reviews, do mais recente para o mais antigo."""
+    query = (
+        select(Review)
+        .where(*filters, *_after_cursor(cursor))
+        .order_by(Review.created_at.desc(), Review.id.desc())
+        .limit(limit + 1)
+    )
+    reviews = (await db.scalars(query)).all()
+    next_cursor = None
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        next_cursor = encode_cursor(reviews[-1].created_at, reviews[-1].id)
+    return ReviewPage(items=reviews, next_cursor=next_cursor)
+
+
+def _stream_reviews(filters: list, cursor: Optional[str]) -> StreamingResponse:
     """
-    Calculate the overall rating for a review based on story, style, and character ratings.
+    Envia os reviews como NDJSON, um objeto por linha, à medida que são lidos.
+
+    As linhas são buscadas em lotes (`yield_per`) com uma sessão própria, já que a sessão
+    da dependência é fechada antes do corpo da resposta ser enviado.
     """
-    return (story_rating + style_rating + character_rating) / 3.0
+    async def rows():
+        async with AsyncSessionLocal() as db:
+            query = (
+                select(Review)
+                .where(*filters, *_after_cursor(cursor))
+                .order_by(Review.created_at.desc(), Review.id.desc())
+                .execution_options(yield_per=STREAM_CHUNK_SIZE)
+            )
+            async for review in await db.stream_scalars(query):
+                yield ReviewOut.model_validate(review).model_dump_json() + "\n"
+
+    _after_cursor(cursor)  # valida o cursor antes de começar a resposta
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
 
 @router.post("/", response_model=ReviewOut)
-def create_review(review: ReviewCreate, db: Session = Depends(get_db)):
+async def create_review(review: ReviewCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new review for a book. This route checks if the book and user exist,
     calculates the overall rating, and saves the new review to the database.
     """
-    new_review = ReviewFactory.create_review(db, review)
+    new_review = await ReviewFactory.create_review(db, review)
     return new_review
 
-@router.get("/", response_model=list[ReviewOut])
-def list_reviews(db: Session = Depends(get_db)):
+@router.get("/", response_model=ReviewPage)
+@cache_response(timeout=600, model=ReviewPage, tags=["reviews"])
+async def list_reviews(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    List all reviews from the database.
+    List reviews from the database, newest first, one page at a time.
+    Pass the returned `next_cursor` to fetch the next page, or `stream=true` to receive
+    every review (from `cursor` onwards) as NDJSON.
     """
-    return db.query(Review).all()
+    if stream:
+        return _stream_reviews([], cursor)
+    return await _paginate_reviews(db, [], limit, cursor)
 
 @router.get("/{review_id}", response_model=ReviewOut)
-def get_review(review_id: int, db: Session = Depends(get_db)):
+@cache_response(timeout=600, model=ReviewOut, tags=["review:{review_id}"])
+async def get_review(review_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get a specific review by its ID.
     """
-    review = db.query(Review).filter(Review.id == review_id).first()
+    review = await db.get(Review, review_id)
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     return review
 
 @router.put("/{review_id}", response_model=ReviewOut)
-def update_review(review_id: int, review_update: ReviewUpdate, db: Session = Depends(get_db)):
+async def update_review(review_id: int, review_update: ReviewUpdate, db: AsyncSession = Depends(get_async_db)):
     """
     Update an existing review. The overall rating is recalculated if any of the rating fields change.
     """
-    review = db.query(Review).filter(Review.id == review_id).first()
-    if not review:
-        raise HTTPException(status_code=404, detail="Review not found")
-
-    for key, value in review_update.dict(exclude_unset=True).items():
-        setattr(review, key, value)
-
-    if any(
-        key in {"story_rating", "style_rating", "character_rating"}
-        for key in review_update.dict(exclude_unset=True)
-    ):
-        review.overall_rating = calculate_overall_rating(
-            review.story_rating, review.style_rating, review.character_rating
-        )
-
-    db.commit()
-    db.refresh(review)
-    return review
+    return await ReviewFactory.update_review(db, review_id, review_update)
 
 @router.delete("/{review_id}", response_model=None)
 @check_review_owner
-def delete_review(review_id: int, db: Session = Depends(get_db)):
+async def delete_review(
+    review_id: int, principal: Principal = Depends(get_principal), db: AsyncSession = Depends(get_async_db)
+):
     """
-    Delete a review by its ID.
+    Delete a review by its ID. Requires authentication: only the review's author may delete it.
     """
-    review = db.query(Review).filter(Review.id == review_id).first()
-    if not review:
-        raise HTTPException(status_code=404, detail="Review not found")
-    db.delete(review)
-    db.commit()
+    await ReviewFactory.delete_review(db, review_id)
     return JSONResponse(status_code=204, content={"message": "Review deleted successfully"})
 
-@router.get("/books/{book_id}", response_model=list[ReviewOut])
-async def get_reviews_by_book_id(book_id: int, db: Session = Depends(get_db)):
+@router.get("/books/{book_id}", response_model=ReviewPage)
+@cache_response(timeout=600, model=ReviewPage, tags=["reviews:book:{book_id}"])
+async def get_reviews_by_book_id(
+    book_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    Get all reviews for a specific book by its ID.
-    This route returns a list of reviews using the ReviewOut model.
+    Get the reviews for a specific book by its ID, newest first, one page at a time.
+    Pass the returned `next_cursor` to fetch the next page, or `stream=true` to receive
+    every review of the book as NDJSON.
     """
-    reviews = db.query(Review).filter(Review.book_id == book_id).all()
-    if not reviews:
-        return []
-
-    return reviews
+    filters = [Review.book_id == book_id]
+    if stream:
+        return _stream_reviews(filters, cursor)
+    return await _paginate_reviews(db, filters, limit, cursor)
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field, conint
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
+from app.schemas.review import ReviewWithAuthorOut
 
 class BookCreate(BaseModel):
     """
@@ -17,6 +18,20 @@ class BookCreate(BaseModel):
                                            description="Ano de publicação do livro (não pode ser negativo ou maior que o ano atual).")
     thumbnail: Optional[str] = Field(None, description="URL da imagem da capa do livro.")                                       
 
+class BookUpsert(BaseModel):
+    """
+    Classe para criar ou atualizar um livro pelo google_id, que vem na URL.
+    """
+    title: str = Field(..., description="Título do livro.")
+    author: str = Field(..., description="Autor do livro.")
+    description: Optional[str] = Field(None, description="Descrição do livro.")
+    genre: Optional[str] = Field(None, description="Gênero do livro.")
+    published_year: Optional[int] = Field(None, 
+                                           ge=0, 
+                                           le=datetime.now().year, 
+                                           description="Ano de publicação do livro (não pode ser negativo ou maior que o ano atual).")
+    thumbnail: Optional[str] = Field(None, description="URL da imagem da capa do livro.")
+
 class BookUpdate(BaseModel):
     """
     Classe para atualizar um livro existente. Todos os campos são opcionais.
@@ -53,3 +68,105 @@ class BookOut(BaseModel):
     class Config:
         orm_mode = True
         from_attributes = True
+
+
+class BookPage(BaseModel):
+    """
+    Classe de saída para uma página da listagem de livros.
+    """
+    items: List[BookOut] = Field(..., description="Livros da página.")
+    next_cursor: Optional[str] = Field(None, description="Cursor da próxima página (nulo na última página).")
+
+
+class BookSearchHit(BookOut):
+    """
+    Classe de saída para um livro encontrado na busca textual.
+    """
+    rank: float = Field(0.0, description="Relevância do livro para a busca (maior primeiro).")
+    highlight: Optional[str] = Field(None, description="Trecho da descrição com os termos buscados entre <b> e </b>.")
+
+
+class BookSearchPage(BaseModel):
+    """
+    Classe de saída para uma página de resultados da busca textual.
+    """
+    items: List[BookSearchHit] = Field(..., description="Livros da página, do mais relevante ao menos relevante.")
+    next_cursor: Optional[str] = Field(None, description="Cursor da próxima página (nulo na última página).")
+
+
+class BookSuggestion(BaseModel):
+    """
+    Classe de saída para uma sugestão do autocompletar.
+    """
+    kind: str = Field(..., description="O que foi sugerido: title ou author.")
+    value: str = Field(..., description="Título ou nome do autor.")
+
+
+class CatalogBook(BaseModel):
+    """
+    Classe de saída para um livro do catálogo do Google Books, já normalizado.
+    """
+    id: str = Field(..., description="ID do livro no Google Books.")
+    title: str = Field(..., description="Título do livro.")
+    author: str = Field(..., description="Autores do livro, separados por vírgula.")
+    description: str = Field(..., description="Descrição do livro.")
+    thumbnail: str = Field("", description="URL da imagem da capa do livro.")
+    published_year: Optional[int] = Field(None, description="Ano de publicação do livro.")
+    genre: str = Field("", description="Primeira categoria do livro.")
+
+
+class BookStatsOut(BaseModel):
+    """
+    Classe de saída com os agregados das avaliações de um livro.
+    """
+    book_id: int = Field(..., description="ID do livro.")
+    review_count: int = Field(..., description="Quantidade de reviews.")
+    average_overall: Optional[float] = Field(None, description="Média da nota geral.")
+    average_story: Optional[float] = Field(None, description="Média da nota de história.")
+    average_style: Optional[float] = Field(None, description="Média da nota de escrita.")
+    average_character: Optional[float] = Field(None, description="Média da nota de personagens.")
+    recommendation_ratio: Optional[float] = Field(None, description="Fração dos reviews que recomendam o livro.")
+
+
+class BookDetailsOut(BaseModel):
+    """
+    Classe de saída com tudo o que a página de um livro precisa em uma única resposta.
+    """
+    book: BookOut = Field(..., description="Dados do livro.")
+    reviews: List[ReviewWithAuthorOut] = Field(..., description="Primeira página de reviews, com o nome de cada autor.")
+    reviews_next_cursor: Optional[str] = Field(None, description="Cursor para continuar em /reviews/books/{book_id}.")
+    ai_summary: Optional[str] = Field(None, description="Resumo das reviews gerado por IA.")
+    stats: BookStatsOut = Field(..., description="Agregados das avaliações.")
+    is_favorite: bool = Field(False, description="Se o usuário informado favoritou o livro.")
+
+
+class SummaryStatusOut(BaseModel):
+    """
+    Classe de saída com o resumo armazenado de um livro e o estado da sua regeneração.
+    """
+    book_id: int = Field(..., description="ID do livro.")
+    status: str = Field(..., description="Estado do job: idle, queued, running, done ou failed.")
+    summary: Optional[str] = Field(None, description="Último resumo gerado com sucesso.")
+    review_count: int = Field(0, description="Quantidade de reviews cobertas pelo resumo.")
+    pending_changes: int = Field(0, description="Reviews alteradas desde que o resumo foi gerado.")
+    generated_at: Optional[datetime] = Field(None, description="Data em que o resumo foi gerado.")
+    error: Optional[str] = Field(None, description="Erro do último job, se ele falhou.")
+
+
+class BookImportError(BaseModel):
+    """
+    Classe de saída para uma linha recusada na importação em lote.
+    """
+    line: int = Field(..., description="Número da linha no arquivo enviado.")
+    error: str = Field(..., description="Motivo da recusa.")
+
+
+class BookImportReport(BaseModel):
+    """
+    Classe de saída com o resultado de uma importação em lote.
+    """
+    received: int = Field(0, description="Linhas lidas.")
+    inserted: int = Field(0, description="Livros inseridos.")
+    duplicates: int = Field(0, description="Livros ignorados por já existirem (mesmo google_id).")
+    invalid: int = Field(0, description="Linhas recusadas na validação.")
+    errors: List[BookImportError] = Field(default_factory=list, description="Linhas recusadas (até BOOK_IMPORT_MAX_ERRORS).")
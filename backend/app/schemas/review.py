@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class ReviewCreate(BaseModel):
@@ -50,3 +50,18 @@ class ReviewOut(BaseModel):
     class Config:
         orm_mode = True
         from_attributes = True
+
+
+class ReviewPage(BaseModel):
+    """
+    Schema for one page of a review listing.
+    """
+    items: List[ReviewOut] = Field(..., description="Reviews in this page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (null on the last page)")
+
+
+class ReviewWithAuthorOut(ReviewOut):
+    """
+    Schema for a review together with its author's username.
+    """
+    username: Optional[str] = Field(None, description="Username of the user who created the review")
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, EmailStr
 
 # Base de modelos para usuários
@@ -59,13 +59,47 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class UserSummary(BaseModel):
+    """
+    Modelo compacto de usuário usado na busca em lote, só com dados públicos.
+
+    Atributos:
+        username (str): Nome de usuário.
+    """
+    username: str
+
+
+class UserPage(BaseModel):
+    """
+    Modelo para uma página da listagem de usuários.
+
+    Atributos:
+        items (List[UserResponse]): Usuários da página.
+        next_cursor (Optional[str]): Cursor da próxima página (nulo na última página).
+    """
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
+
+
 class Token(BaseModel):
     """
     Modelo para tokens de autenticação.
 
     Atributos:
         access_token (str): Token de acesso gerado para o usuário.
+        refresh_token (Optional[str]): Token para obter novos tokens de acesso sem senha.
         token_type (str): Tipo do token, padrão é 'bearer'.
     """
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
+
+
+class RefreshRequest(BaseModel):
+    """
+    Modelo para renovar ou revogar uma sessão.
+
+    Atributos:
+        refresh_token (str): Refresh token recebido no login ou na última renovação.
+    """
+    refresh_token: str
@@ -1,7 +1,9 @@
 from typing import Optional, Dict
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
-from app.core.security import verify_password, get_password_hash
+from app.core.hashing import password_hasher
+from app.core.rate_limit import login_throttle
 from app.schemas.user import UserCreate
 
 class AuthService:
@@ -15,40 +17,61 @@ class AuthService:
     """
 
     @staticmethod
-    async def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+    async def authenticate_user(
+        db: AsyncSession, email: str, password: str, client_ip: Optional[str] = None
+    ) -> Optional[User]:
         """
         Autentica um usuário verificando email e senha.
 
+        Antes de consultar o usuário, a tentativa passa pelo limite de tentativas por IP e por
+        conta; acima dele, levanta HTTPException 429 sem calcular nenhum hash. Senhas erradas
+        (e emails desconhecidos) contam para o limite da conta, que é zerado quando o login dá certo.
+
+        Se a senha conferir mas o hash estiver desatualizado (ex.: bcrypt com a configuração
+        atual em argon2id), o hash é refeito e gravado.
+
         Parâmetros:
-        - db (Session): Sessão do banco de dados.
+        - db (AsyncSession): Sessão do banco de dados.
         - email (str): Email do usuário.
         - password (str): Senha do usuário.
+        - client_ip (Optional[str]): IP de origem da requisição.
 
         Retorno:
         - Optional[User]: Usuário autenticado ou None se as credenciais forem inválidas.
         """
-        user = db.query(User).filter(User.email == email).first()
+        await login_throttle.check(client_ip, email)
+
+        user = await db.scalar(select(User).where(User.email == email))
         if user is None:
+            await login_throttle.failed(email)
             return None
 
-        if not verify_password(password, user.hashed_password):
+        verified, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+        if not verified:
+            await login_throttle.failed(email)
             return None
 
+        await login_throttle.succeeded(email)
+        if new_hash:
+            # Hash em esquema antigo ou com custo desatualizado: regrava com a configuração atual
+            user.hashed_password = new_hash
+            await db.commit()
+
         return user
 
     @staticmethod
-    async def create_user(db: Session, user_data: UserCreate) -> User:
+    async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
         """
         Cria um novo usuário no banco de dados.
 
         Parâmetros:
-        - db (Session): Sessão do banco de dados.
+        - db (AsyncSession): Sessão do banco de dados.
         - user_data (UserCreate): Dados para criação do usuário.
 
         Retorno:
         - User: Usuário criado.
         """
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
 
         db_user = User(
             email=user_data.email,
@@ -57,24 +80,24 @@ class AuthService:
         )
 
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
 
         return db_user
 
     @staticmethod
-    async def get_or_create_google_user(db: Session, google_data: Dict[str, str]) -> User:
+    async def get_or_create_google_user(db: AsyncSession, google_data: Dict[str, str]) -> User:
         """
         Busca ou cria um usuário com base nos dados do Google.
 
         Parâmetros:
-        - db (Session): Sessão do banco de dados.
+        - db (AsyncSession): Sessão do banco de dados.
         - google_data (Dict[str, str]): Dados recebidos do Google.
 
         Retorno:
         - User: Usuário correspondente aos dados fornecidos.
         """
-        user = db.query(User).filter(User.google_id == google_data["sub"]).first()
+        user = await db.scalar(select(User).where(User.google_id == google_data["sub"]))
         
         if user is None:
             user = User(
@@ -85,7 +108,7 @@ class AuthService:
             )
 
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
 
         return user
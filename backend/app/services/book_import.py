@@ -0,0 +1,165 @@
+import csv
+import logging
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database.session import dialect_insert
+from app.decorators.cache import invalidate_tags
+from app.models.book import Book
+from app.schemas.book import BookCreate, BookImportError, BookImportReport
+from app.services.book_suggest import BookSuggestService
+
+logger = logging.getLogger(__name__)
+
+# Linha de entrada numerada: JSON em texto (NDJSON/JSONL) ou um dict (linha de CSV)
+Row = Tuple[int, Union[str, bytes, Dict[str, Any]]]
+
+# Acima disso, recarregar o índice de sugestões é mais barato que inserir livro a livro
+SUGGEST_REBUILD_THRESHOLD = 1000
+
+# Cada livro de um INSERT multi-linha usa um parâmetro por coluna, e um comando aceita no
+# máximo 32767 parâmetros no Postgres/asyncpg (32766 no SQLite): o lote é limitado a isso.
+MAX_BIND_PARAMETERS = 32766
+MAX_BATCH_SIZE = MAX_BIND_PARAMETERS // len(BookCreate.model_fields)
+
+
+def read_jsonl(lines: Iterable[str]) -> Iterator[Row]:
+    """Numera as linhas de um arquivo JSONL, pulando as vazias."""
+    for number, line in enumerate(lines, start=1):
+        if line.strip():
+            yield number, line
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[Row]:
+    """Lê um CSV com cabeçalho nos nomes dos campos de `BookCreate`. Células vazias viram None."""
+    reader = csv.DictReader(lines)
+    for record in reader:
+        yield reader.line_num, {key: value or None for key, value in record.items() if key is not None}
+
+
+async def read_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[Row]:
+    """Separa em linhas um corpo NDJSON recebido em pedaços, sem carregá-lo inteiro na memória."""
+    buffer = b""
+    number = 0
+    async for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            number += 1
+            if line.strip():
+                yield number, line
+    if buffer.strip():
+        yield number + 1, buffer
+
+
+async def _iterate(rows: Union[Iterable[Row], AsyncIterable[Row]]) -> AsyncIterator[Row]:
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" if item["loc"] else item["msg"]
+        for item in error.errors()
+    )
+
+
+class BookImportService:
+    """
+    Importação de livros em lote, usada por `POST /books/bulk` e por `app.tools.import_books`.
+
+    Métodos disponíveis:
+    - run: Valida e grava os livros em lotes.
+    """
+
+    @staticmethod
+    async def _insert(db: AsyncSession, batch: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        insert = dialect_insert(db)
+        statement = (
+            insert(Book)
+            .values(batch)
+            .on_conflict_do_nothing(index_elements=[Book.google_id])
+            .returning(Book.title, Book.author)
+        )
+        inserted = [tuple(row) for row in await db.execute(statement)]
+        await db.commit()
+        return inserted
+
+    @staticmethod
+    async def run(
+        db: AsyncSession,
+        rows: Union[Iterable[Row], AsyncIterable[Row]],
+        batch_size: Optional[int] = None,
+        progress: Optional[Callable[[BookImportReport], None]] = None,
+    ) -> BookImportReport:
+        """
+        Valida cada linha com `BookCreate` e grava os livros válidos em lotes.
+
+        Cada lote é um único `INSERT` multi-linha com `ON CONFLICT (google_id) DO NOTHING`,
+        com commit próprio: uma importação interrompida mantém os lotes já gravados e pode ser
+        repetida sem duplicar livros. google_ids repetidos dentro do arquivo também são
+        ignorados (vale a primeira ocorrência).
+
+        Parâmetros:
+        - db (AsyncSession): Sessão do banco de dados.
+        - rows (Iterable[Row] | AsyncIterable[Row]): Linhas numeradas, de `read_csv`, `read_jsonl` ou `read_ndjson`.
+        - batch_size (Optional[int]): Livros por lote (padrão: `BOOK_IMPORT_BATCH_SIZE`, até `MAX_BATCH_SIZE`).
+        - progress (Optional[Callable]): Chamado com o relatório parcial após cada lote.
+
+        Retorno:
+        - BookImportReport: Contadores da importação e as linhas recusadas.
+        """
+        batch_size = min(batch_size or settings.BOOK_IMPORT_BATCH_SIZE, MAX_BATCH_SIZE)
+        report = BookImportReport()
+        seen = set()
+        batch: List[Dict[str, Any]] = []
+        suggestions: List[Tuple[str, str]] = []
+
+        async def flush() -> None:
+            inserted = await BookImportService._insert(db, batch)
+            report.inserted += len(inserted)
+            report.duplicates += len(batch) - len(inserted)
+            if len(suggestions) <= SUGGEST_REBUILD_THRESHOLD:
+                suggestions.extend(inserted)
+            batch.clear()
+            logger.info(f"Importação de livros: {report.received} linhas lidas, {report.inserted} inseridas.")
+            if progress is not None:
+                progress(report)
+
+        async for number, data in _iterate(rows):
+            report.received += 1
+            try:
+                if isinstance(data, (str, bytes)):
+                    book = BookCreate.model_validate_json(data)
+                else:
+                    book = BookCreate.model_validate(data)
+            except ValidationError as e:
+                report.invalid += 1
+                if len(report.errors) < settings.BOOK_IMPORT_MAX_ERRORS:
+                    report.errors.append(BookImportError(line=number, error=_describe(e)))
+                continue
+
+            if book.google_id in seen:
+                report.duplicates += 1
+                continue
+            seen.add(book.google_id)
+            batch.append(book.model_dump())
+            if len(batch) >= batch_size:
+                await flush()
+
+        if batch:
+            await flush()
+
+        if report.inserted:
+            await invalidate_tags("book-list")
+            if report.inserted > SUGGEST_REBUILD_THRESHOLD:
+                if BookSuggestService.ready:
+                    await BookSuggestService.warm()
+            else:
+                for suggestion in suggestions:
+                    BookSuggestService.book_changed(None, suggestion)
+        return report
@@ -0,0 +1,112 @@
+import asyncio
+from typing import Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import encode_cursor
+from app.database.session import AsyncSessionLocal
+from app.models.book import Book
+from app.models.book_stats import BookStats
+from app.models.favorite import Favorito
+from app.models.review import Review
+from app.models.user import User
+from app.schemas.book import BookDetailsOut, BookOut, BookStatsOut
+from app.schemas.review import ReviewWithAuthorOut
+from app.services.book_stats import BookStatsService
+from app.services.summary import SummaryService
+
+
+async def _in_session(func, *args):
+    """Executa `func` com uma sessão própria, em paralelo com as consultas da sessão da requisição."""
+    async with AsyncSessionLocal() as db:
+        return await func(db, *args)
+
+
+async def _load_book(db: AsyncSession, google_id: str) -> BookOut:
+    book = await db.scalar(select(Book).where(Book.google_id == google_id))
+    if not book:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return BookOut.model_validate(book)
+
+
+async def _load_reviews(db: AsyncSession, book_id: int, limit: int) -> Tuple[list, Optional[str]]:
+    query = (
+        select(Review, User.username)
+        .join(User, User.id == Review.user_id)
+        .where(Review.book_id == book_id)
+        .order_by(Review.created_at.desc(), Review.id.desc())
+        .limit(limit + 1)
+    )
+    rows = (await db.execute(query)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    reviews = [
+        ReviewWithAuthorOut.model_validate(review).model_copy(update={"username": username})
+        for review, username in rows
+    ]
+    return reviews, next_cursor
+
+
+async def _load_summary(db: AsyncSession, book_id: int) -> Optional[str]:
+    row = await SummaryService.get(db, book_id)
+    return row.summary if row else None
+
+
+async def _load_stats(db: AsyncSession, book_id: int) -> BookStatsOut:
+    return BookStatsService.summarize(book_id, await db.get(BookStats, book_id))
+
+
+async def _load_is_favorite(db: AsyncSession, book_id: int, user_id: Optional[int]) -> bool:
+    if user_id is None:
+        return False
+    query = select(Favorito.id).where(Favorito.user_id == user_id, Favorito.livro_id == book_id)
+    return await db.scalar(query) is not None
+
+
+class BookPageService:
+    """
+    Monta a página de um livro em uma única chamada.
+
+    Métodos disponíveis:
+    - load: Busca o livro, a primeira página de reviews com autores, resumo, agregados e favorito.
+    """
+
+    @staticmethod
+    async def load(db: AsyncSession, google_id: str, user_id: Optional[int], reviews_limit: int = 20) -> BookDetailsOut:
+        """
+        Busca o livro pelo Google ID e as partes da página.
+
+        A página de reviews (a consulta mais cara, com join nos autores) roda em uma sessão
+        própria enquanto as consultas por chave primária (agregados, favorito, resumo) usam,
+        em sequência, a sessão da requisição: cada visita ocupa no máximo duas conexões do pool.
+
+        Parâmetros:
+        - db (AsyncSession): Sessão do banco de dados da requisição.
+        - google_id (str): ID do livro no Google Books.
+        - user_id (Optional[int]): Usuário autenticado, para verificar o favorito (opcional).
+        - reviews_limit (int): Tamanho da primeira página de reviews.
+
+        Retorno:
+        - BookDetailsOut: Dados completos da página.
+        """
+        book = await _load_book(db, google_id)
+        reviews_task = asyncio.ensure_future(_in_session(_load_reviews, book.id, reviews_limit))
+        try:
+            stats = await _load_stats(db, book.id)
+            is_favorite = await _load_is_favorite(db, book.id, user_id)
+            summary = await _load_summary(db, book.id)
+        except BaseException:
+            reviews_task.cancel()
+            raise
+        reviews, next_cursor = await reviews_task
+        return BookDetailsOut(
+            book=book,
+            reviews=reviews,
+            reviews_next_cursor=next_cursor,
+            ai_summary=summary,
+            stats=stats,
+            is_favorite=is_favorite,
+        )
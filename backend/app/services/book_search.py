@@ -0,0 +1,91 @@
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import func, literal, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import decode_cursor, encode_cursor, keyset_filter
+from app.models.book import Book
+from app.schemas.book import BookSearchHit, BookSearchPage
+
+# Configuração de busca criada na migração a8e4c2f17b39 (português + unaccent)
+SEARCH_CONFIG = literal_column("'pt_unaccent'::regconfig")
+# Coluna gerada, só existe no Postgres (ver `Book`)
+SEARCH_VECTOR = literal_column("books.search_vector", type_=TSVECTOR)
+HEADLINE_OPTIONS = "StartSel=<b>, StopSel=</b>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+class BookSearchService:
+    """
+    Busca textual nos livros do acervo.
+
+    Métodos disponíveis:
+    - search: Retorna uma página de livros ordenados por relevância.
+    """
+
+    @staticmethod
+    async def search(db: AsyncSession, q: str, limit: int = 20, cursor: Optional[str] = None) -> BookSearchPage:
+        """
+        Busca livros por título, autor, gênero e descrição.
+
+        No Postgres, a consulta (sintaxe de busca web: aspas, `or`, `-termo`) é comparada ao
+        `search_vector` pelo índice GIN e os livros são ordenados por `ts_rank_cd`. Os
+        destaques (`ts_headline`) são calculados só para os livros da página. Em outros
+        bancos (ex.: SQLite nos testes), cai para um `LIKE` sem ranking nem destaques.
+
+        Parâmetros:
+        - db (AsyncSession): Sessão do banco de dados.
+        - q (str): Texto buscado.
+        - limit (int): Tamanho da página.
+        - cursor (Optional[str]): `next_cursor` da página anterior.
+
+        Retorno:
+        - BookSearchPage: Livros da página e o cursor da próxima.
+        """
+        last = None
+        if cursor:
+            cursor_q, last_rank, last_id = decode_cursor(cursor, str, float, int)
+            if cursor_q != q:
+                raise HTTPException(status_code=400, detail="Cursor does not match the requested query")
+            last = (last_rank, last_id)
+
+        if db.bind.dialect.name == "postgresql":
+            ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+            rank = func.ts_rank_cd(SEARCH_VECTOR, ts_query)
+            matches = select(Book.id, rank.label("rank")).where(SEARCH_VECTOR.op("@@")(ts_query))
+            highlight = func.ts_headline(SEARCH_CONFIG, func.coalesce(Book.description, Book.title), ts_query, HEADLINE_OPTIONS)
+        else:
+            term = q.lower()
+            rank = literal(0.0)
+            matches = select(Book.id, rank.label("rank")).where(
+                or_(
+                    *(
+                        func.lower(column).contains(term, autoescape=True)
+                        for column in (Book.title, Book.author, Book.genre, Book.description)
+                    )
+                )
+            )
+            highlight = literal(None)
+
+        if last is not None:
+            matches = matches.where(keyset_filter((rank, Book.id), last, descending=True))
+        page = matches.order_by(rank.desc(), Book.id.desc()).limit(limit + 1).subquery()
+
+        # Junta os livros só depois do LIMIT, para que o ts_headline rode apenas na página
+        rows = (
+            await db.execute(
+                select(Book, page.c.rank, highlight)
+                .join(page, page.c.id == Book.id)
+                .order_by(page.c.rank.desc(), Book.id.desc())
+            )
+        ).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            book, book_rank, _ = rows[-1]
+            next_cursor = encode_cursor(q, book_rank, book.id)
+        items = [
+            BookSearchHit.model_validate(book).model_copy(update={"rank": book_rank, "highlight": book_highlight})
+            for book, book_rank, book_highlight in rows
+        ]
+        return BookSearchPage(items=items, next_cursor=next_cursor)
@@ -0,0 +1,86 @@
+from typing import Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.session import dialect_insert
+from app.models.book_stats import BookStats
+from app.models.review import Review
+from app.schemas.book import BookStatsOut
+
+
+class BookStatsService:
+    """
+    Manutenção incremental dos agregados de avaliação de cada livro (`book_stats`).
+
+    Métodos disponíveis:
+    - contribution: Extrai de um review os valores que ele soma aos agregados.
+    - apply: Soma (ou subtrai) a contribuição de um review, na transação corrente.
+    - summarize: Converte as somas armazenadas em médias.
+    """
+
+    @staticmethod
+    def contribution(review: Review) -> Dict[str, float]:
+        """
+        Extrai de um review os valores que ele soma aos agregados do livro.
+
+        Parâmetros:
+        - review (Review): Review já com as notas preenchidas.
+
+        Retorno:
+        - Dict[str, float]: Valores por coluna de `book_stats`.
+        """
+        return {
+            "review_count": 1,
+            "overall_sum": review.overall_rating,
+            "story_sum": review.story_rating,
+            "style_sum": review.style_rating,
+            "character_sum": review.character_rating,
+            "recommend_count": 1 if review.recommendation else 0,
+        }
+
+    @staticmethod
+    async def apply(db: AsyncSession, book_id: int, contribution: Dict[str, float], sign: int = 1) -> None:
+        """
+        Soma (sign=1) ou subtrai (sign=-1) a contribuição de um review aos agregados do livro.
+
+        Executa um único `INSERT ... ON CONFLICT DO UPDATE` com incrementos relativos, de modo
+        que escritas concorrentes no mesmo livro não se sobrescrevem. Não faz commit: deve ser
+        chamado na mesma transação que grava o review.
+
+        Parâmetros:
+        - db (AsyncSession): Sessão do banco de dados.
+        - book_id (int): ID do livro.
+        - contribution (Dict[str, float]): Valores retornados por `contribution`.
+        - sign (int): 1 para adicionar o review, -1 para removê-lo.
+        """
+        deltas = {column: value * sign for column, value in contribution.items()}
+        insert = dialect_insert(db)
+        statement = insert(BookStats).values(book_id=book_id, **deltas)
+        statement = statement.on_conflict_do_update(
+            index_elements=[BookStats.book_id],
+            set_={column: getattr(BookStats, column) + statement.excluded[column] for column in deltas},
+        )
+        await db.execute(statement)
+
+    @staticmethod
+    def summarize(book_id: int, stats: Optional[BookStats]) -> BookStatsOut:
+        """
+        Converte as somas armazenadas em médias, sem tocar na tabela de reviews.
+
+        Parâmetros:
+        - book_id (int): ID do livro.
+        - stats (Optional[BookStats]): Linha de `book_stats`, ou None se o livro nunca teve reviews.
+
+        Retorno:
+        - BookStatsOut: Agregados do livro (médias nulas quando não há reviews).
+        """
+        count = stats.review_count if stats else 0
+        if not count:
+            return BookStatsOut(book_id=book_id, review_count=0)
+        return BookStatsOut(
+            book_id=book_id,
+            review_count=count,
+            average_overall=stats.overall_sum / count,
+            average_story=stats.story_sum / count,
+            average_style=stats.style_sum / count,
+            average_character=stats.character_sum / count,
+            recommendation_ratio=stats.recommend_count / count,
+        )
@@ -0,0 +1,128 @@
+import logging
+from typing import List, Optional, Tuple
+from sqlalchemy import func, literal, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.prefix_index import PrefixIndex
+from app.database.session import AsyncSessionLocal
+from app.models.book import Book
+from app.schemas.book import BookSuggestion
+
+# Títulos e autores do acervo, por prefixo. Cada worker mantém o seu: livros gravados por
+# outro worker só aparecem aqui pelo fallback no banco (ou após reiniciar).
+suggest_index = PrefixIndex()
+
+# Trigramas precisam de pelo menos 3 caracteres para a busca aproximada fazer sentido
+MIN_FUZZY_LENGTH = 3
+
+logger = logging.getLogger(__name__)
+
+
+class BookSuggestService:
+    """
+    Autocompletar títulos e autores da caixa de busca.
+
+    Métodos disponíveis:
+    - warm: Carrega o índice de prefixos em memória.
+    - book_changed: Mantém o índice de prefixos em dia após gravar um livro.
+    - suggest: Sugestões para o texto digitado.
+    """
+
+    ready = False
+
+    @staticmethod
+    async def warm() -> int:
+        """
+        Carrega todos os títulos e autores no índice de prefixos.
+
+        Acervos maiores que `SUGGEST_INDEX_MAX_BOOKS` não são carregados: as sugestões
+        passam a vir só do banco, para não ocupar memória demais em cada worker.
+
+        Retorno:
+        - int: Quantidade de entradas no índice.
+        """
+        values = []
+        async with AsyncSessionLocal() as db:
+            rows = await db.stream(select(Book.title, Book.author).execution_options(yield_per=1000))
+            async for title, author in rows:
+                if len(values) >= 2 * settings.SUGGEST_INDEX_MAX_BOOKS:
+                    logger.warning("Acervo grande demais para o índice de sugestões em memória; usando só o banco.")
+                    BookSuggestService.ready = False
+                    return 0
+                values += [("title", title), ("author", author)]
+        suggest_index.load(values)
+        BookSuggestService.ready = True
+        return len(suggest_index)
+
+    @staticmethod
+    def book_changed(before: Optional[Tuple[str, str]], after: Optional[Tuple[str, str]]) -> None:
+        """
+        Atualiza o índice de prefixos após criar, editar ou remover um livro.
+
+        Parâmetros:
+        - before (Optional[Tuple[str, str]]): (título, autor) antes da mudança, ou None se o livro é novo.
+        - after (Optional[Tuple[str, str]]): (título, autor) depois da mudança, ou None se foi removido.
+        """
+        if not BookSuggestService.ready or before == after:
+            return
+        if before is not None:
+            suggest_index.discard("title", before[0])
+            suggest_index.discard("author", before[1])
+        if after is not None:
+            suggest_index.add("title", after[0])
+            suggest_index.add("author", after[1])
+
+    @staticmethod
+    async def suggest(db: AsyncSession, prefix: str, limit: int = 10) -> List[BookSuggestion]:
+        """
+        Sugere títulos e autores para o texto digitado.
+
+        Primeiro busca os que começam com o texto no índice em memória (sem ir ao banco).
+        Se faltarem sugestões, completa com uma busca aproximada no banco: no Postgres,
+        `word_similarity` do pg_trgm, que tolera erros de digitação e usa os índices GIN
+        trigram; em outros bancos (ex.: SQLite nos testes), um `LIKE '%texto%'`.
+
+        Parâmetros:
+        - db (AsyncSession): Sessão do banco de dados.
+        - prefix (str): Texto digitado.
+        - limit (int): Máximo de sugestões.
+
+        Retorno:
+        - List[BookSuggestion]: Sugestões, as de prefixo primeiro.
+        """
+        found: List[Tuple[str, str]] = []
+        if BookSuggestService.ready:
+            found = suggest_index.search(prefix, limit)
+        if len(found) >= limit or (BookSuggestService.ready and len(prefix) < MIN_FUZZY_LENGTH):
+            return [BookSuggestion(kind=kind, value=value) for kind, value in found]
+
+        term = prefix.lower()
+        queries = []
+        for kind, column in (("title", Book.title), ("author", Book.author)):
+            value = func.lower(column)
+            if db.bind.dialect.name == "postgresql":
+                score = func.word_similarity(term, value)
+                condition = or_(literal(term).op("<%")(value), value.startswith(term, autoescape=True))
+            else:
+                score = literal(0.0)
+                condition = value.contains(term, autoescape=True)
+            queries.append(
+                select(column.label("value"), literal(kind).label("kind"), score.label("score"))
+                .where(condition)
+                .distinct()
+            )
+        combined = union_all(*queries).subquery()
+        rows = await db.execute(
+            select(combined.c.kind, combined.c.value)
+            .order_by(combined.c.score.desc(), combined.c.value)
+            .limit(limit + len(found))
+        )
+
+        seen = set(found)
+        for kind, value in rows:
+            if len(found) >= limit:
+                break
+            if (kind, value) not in seen:
+                seen.add((kind, value))
+                found.append((kind, value))
+        return [BookSuggestion(kind=kind, value=value) for kind, value in found]
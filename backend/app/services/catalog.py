@@ -0,0 +1,184 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+import httpx
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.coalesce import SingleFlight
+from app.database.session import AsyncSessionLocal, dialect_insert
+from app.models.catalog_cache import CatalogCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Minúsculas e espaços simples: "Dom  Casmurro" e "dom casmurro" usam a mesma entrada do cache."""
+    return " ".join(query.casefold().split())
+
+
+def normalize_volume(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Converte um volume do Google Books no formato de livro usado pelo frontend."""
+    info = item.get("volumeInfo", {})
+    published_year = None
+    try:
+        published_year = int(info.get("publishedDate", "").split("-")[0])
+    except ValueError:
+        pass
+    return {
+        "id": item["id"],
+        "title": info.get("title") or "Título Desconhecido",
+        "author": ", ".join(info["authors"]) if info.get("authors") else "Autor Desconhecido",
+        "description": info.get("description") or "Sem descrição.",
+        "thumbnail": info.get("imageLinks", {}).get("thumbnail", ""),
+        "published_year": published_year,
+        "genre": info["categories"][0] if info.get("categories") else "",
+    }
+
+
+class GoogleBooksClient:
+    """
+    Cliente da busca de volumes do Google Books, com um pool de conexões reaproveitado.
+
+    O `httpx.AsyncClient` é criado na primeira busca e mantém as conexões (TLS incluso)
+    abertas entre as requisições. A URL vem de `GOOGLE_BOOKS_URL`, o que permite apontar
+    os testes para um servidor local.
+    """
+
+    def __init__(self, url: str, api_key: Optional[str] = None, timeout: float = 5.0, max_connections: int = 20):
+        self.url = url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            )
+        return self._client
+
+    async def search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Busca os volumes e retorna a lista já normalizada. Levanta `httpx.HTTPError` em falhas."""
+        params = {"q": query, "maxResults": max_results}
+        if self.api_key:
+            params["key"] = self.api_key
+        response = await self._get_client().get(self.url, params=params)
+        response.raise_for_status()
+        books = []
+        for item in response.json().get("items", []):
+            # Volumes sem id (ou fora do formato esperado) são descartados, sem derrubar a busca
+            try:
+                if item.get("id"):
+                    books.append(normalize_volume(item))
+            except (AttributeError, KeyError, TypeError, IndexError):
+                logger.warning(f"Volume inválido do Google Books ignorado: {item!r:.200}")
+        return books
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+google_books = GoogleBooksClient(
+    settings.GOOGLE_BOOKS_URL,
+    api_key=settings.GOOGLE_BOOKS_API_KEY,
+    timeout=settings.CATALOG_TIMEOUT,
+    max_connections=settings.CATALOG_MAX_CONNECTIONS,
+)
+catalog_flight = SingleFlight()
+
+
+class CatalogService:
+    """
+    Busca no catálogo do Google Books com cache persistente em `catalog_cache`.
+
+    Métodos disponíveis:
+    - search: Livros do Google Books para uma consulta.
+    - stats: Contadores do cache e das chamadas ao Google Books.
+    """
+
+    hits = 0
+    misses = 0
+    stale = 0
+    errors = 0
+
+    @staticmethod
+    async def _refresh(key: str, query: str, max_results: int) -> List[Dict[str, Any]]:
+        items = await google_books.search(query, max_results)
+        now = datetime.now(timezone.utc)
+        values = {
+            "query": query,
+            "response": json.dumps(items),
+            "fetched_at": now,
+            "expires_at": now + timedelta(seconds=settings.CATALOG_CACHE_TTL),
+        }
+        async with AsyncSessionLocal() as db:
+            insert = dialect_insert(db)
+            await db.execute(
+                insert(CatalogCache).values(key=key, **values).on_conflict_do_update(
+                    index_elements=[CatalogCache.key], set_=values
+                )
+            )
+            await db.commit()
+        return items
+
+    @staticmethod
+    async def search(db: AsyncSession, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """
+        Busca livros no Google Books, servindo do cache enquanto a resposta não expira.
+
+        Buscas iguais (após normalizar a consulta) feitas ao mesmo tempo geram uma única
+        chamada ao Google Books, e a resposta é gravada uma só vez. Se o Google Books falhar,
+        uma resposta já expirada ainda é servida, se houver.
+
+        Parâmetros:
+        - db (AsyncSession): Sessão do banco de dados.
+        - query (str): Texto buscado.
+        - max_results (int): Quantidade máxima de livros.
+
+        Retorno:
+        - List[Dict[str, Any]]: Livros no formato de `CatalogBook`.
+        """
+        query = normalize_query(query)
+        if not query:
+            raise HTTPException(status_code=422, detail="Consulta vazia")
+        key = hashlib.sha256(f"{max_results}:{query}".encode()).hexdigest()
+        cached = (
+            await db.execute(
+                select(CatalogCache.response, CatalogCache.expires_at > datetime.now(timezone.utc)).where(
+                    CatalogCache.key == key
+                )
+            )
+        ).first()
+        if cached is not None and cached[1]:
+            CatalogService.hits += 1
+            return json.loads(cached[0])
+
+        CatalogService.misses += 1
+        try:
+            return await catalog_flight.run(key, lambda: CatalogService._refresh(key, query, max_results))
+        except (httpx.HTTPError, ValueError) as e:
+            CatalogService.errors += 1
+            logger.error(f"Erro ao buscar no Google Books: {e}")
+            if cached is not None:
+                CatalogService.stale += 1
+                return json.loads(cached[0])
+            raise HTTPException(status_code=502, detail="Google Books indisponível")
+
+    @staticmethod
+    def stats() -> Dict[str, int]:
+        return {
+            "hits": CatalogService.hits,
+            "misses": CatalogService.misses,
+            "stale": CatalogService.stale,
+            "errors": CatalogService.errors,
+            "upstream_calls": catalog_flight.calls,
+            "coalesced": catalog_flight.coalesced,
+        }
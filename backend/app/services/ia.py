@@ -0,0 +1,142 @@
+import logging
+import random
+import threading
+from typing import Dict, Iterator, List, Optional
+from sumy.parsers.plaintext import PlaintextParser
+from sumy.nlp.tokenizers import Tokenizer
+from sumy.nlp.stemmers import Stemmer
+from sumy.summarizers.lex_rank import LexRankSummarizer
+from sumy.summarizers.lsa import LsaSummarizer
+from sumy.summarizers.text_rank import TextRankSummarizer
+from sumy.utils import get_stop_words
+
+# Algoritmos aceitos em `Settings.SUMMARY_ALGORITHM`
+ALGORITHMS = {
+    "lsa": LsaSummarizer,
+    "textrank": TextRankSummarizer,
+    "lexrank": LexRankSummarizer,
+}
+
+logger = logging.getLogger(__name__)
+
+
+class SummarizationEngine:
+    """
+    Tokenizador, stemmer e sumarizador montados uma única vez e reaproveitados.
+
+    Montá-los carrega o modelo de sentenças do idioma e a lista de stop words, o que custa
+    mais que resumir um livro com poucas reviews. Depois de construídos, os objetos do sumy
+    só são lidos, então a mesma instância pode ser usada por várias threads ao mesmo tempo.
+    """
+
+    def __init__(self, language: str = "portuguese", sentences: int = 4, algorithm: str = "lsa"):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"SUMMARY_ALGORITHM inválido: {algorithm}")
+        self.language = language
+        self.sentences = sentences
+        self.algorithm = algorithm
+        self.tokenizer = Tokenizer(language)
+        self.summarizer = ALGORITHMS[algorithm](Stemmer(language))
+        self.summarizer.stop_words = get_stop_words(language)
+
+    def summarize(self, texts: List[str]) -> Optional[str]:
+        """Gera o resumo das reviews, ou None se não houver reviews."""
+        if not texts:
+            return None
+
+        parser = PlaintextParser.from_string(" ".join(texts), self.tokenizer)
+        summary = self.summarizer(parser.document, self.sentences)
+        return " ".join(str(sentence) for sentence in summary)
+
+
+class RatingSampler:
+    """
+    Amostra estratificada por nota, com memória limitada, de um fluxo de reviews.
+
+    Mantém um reservatório (reservoir sampling) de até `size` textos para cada nota
+    arredondada. No fim, cada nota contribui proporcionalmente à quantidade de reviews que
+    recebeu, de modo que a amostra preserva a distribuição de notas do livro qualquer que
+    seja o volume lido.
+    """
+
+    def __init__(self, size: int, rng: Optional[random.Random] = None):
+        self.size = size
+        self.rng = rng or random.Random()
+        self.seen = 0
+        self._reservoirs: Dict[int, List[str]] = {}
+        self._counts: Dict[int, int] = {}
+
+    def add(self, text: str, rating: Optional[float]) -> None:
+        """Considera uma review para a amostra."""
+        stratum = round(rating or 0)
+        self.seen += 1
+        count = self._counts.get(stratum, 0) + 1
+        self._counts[stratum] = count
+        reservoir = self._reservoirs.setdefault(stratum, [])
+        if len(reservoir) < self.size:
+            reservoir.append(text)
+            return
+        index = self.rng.randrange(count)
+        if index < self.size:
+            reservoir[index] = text
+
+    def sample(self) -> List[str]:
+        """Retorna até `size` textos (todos, se foram lidos menos que isso)."""
+        if self.seen <= self.size:
+            return [text for _, reservoir in sorted(self._reservoirs.items()) for text in reservoir]
+        sample = []
+        for stratum, reservoir in sorted(self._reservoirs.items()):
+            quota = max(1, round(self.size * self._counts[stratum] / self.seen))
+            sample.extend(self.rng.sample(reservoir, min(quota, len(reservoir))))
+        # O arredondamento (e o mínimo de 1 por nota) pode passar de `size` por alguns textos
+        if len(sample) > self.size:
+            sample = self.rng.sample(sample, self.size)
+        return sample
+
+
+def chunked(texts: List[str], size: int) -> Iterator[List[str]]:
+    """Divide a lista em blocos de até `size` itens."""
+    for start in range(0, len(texts), size):
+        yield texts[start:start + size]
+
+
+_engine: Optional[SummarizationEngine] = None
+_engine_lock = threading.Lock()
+_engine_config = {"language": "portuguese", "sentences": 4, "algorithm": "lsa"}
+
+
+def get_engine() -> SummarizationEngine:
+    """Retorna o motor de resumos do processo, montando-o na primeira chamada."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = SummarizationEngine(**_engine_config)
+    return _engine
+
+
+def warm_engine(language: str = "portuguese", sentences: int = 4, algorithm: str = "lsa") -> None:
+    """
+    Configura e monta o motor de resumos do processo.
+
+    Usado como `initializer` dos processos da fila, para que o custo de montagem seja pago
+    na inicialização e não no primeiro resumo. Uma falha aqui derrubaria o pool inteiro,
+    então é apenas registrada: o erro reaparece no primeiro job, que é marcado como falho.
+    """
+    _engine_config.update(language=language, sentences=sentences, algorithm=algorithm)
+    try:
+        get_engine()
+    except Exception as e:
+        logger.error(f"Erro ao montar o motor de resumos: {e}")
+
+
+def summarize_reviews(texts: List[str]) -> Optional[str]:
+    """
+    Gera o resumo das reviews com o motor do processo, ou None se não houver reviews.
+
+    É CPU-bound (LSA faz uma SVD; TextRank e LexRank, um grafo entre as sentenças): não
+    deve ser chamada no event loop.
+    """
+    if not texts:
+        return None
+    return get_engine().summarize(texts)
@@ -0,0 +1,262 @@
+import hashlib
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Set, Tuple
+from sqlalchemy import exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.bloom import BloomFilter
+from app.core.coalesce import SingleFlight
+from app.database.session import AsyncSessionLocal
+from app.decorators.cache import invalidate_tags, response_cache, run_cache
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+# Sessões encerradas (famílias de refresh tokens revogadas). Um "não" do filtro dispensa a
+# consulta ao banco; um "talvez" é confirmado nele. Cada worker tem o seu filtro, recriado a
+# cada carga só com as sessões que ainda podem ter access tokens válidos: toda revogação
+# publica a tag abaixo no cache compartilhado e, ao ver a versão da tag mudar, os demais
+# workers recarregam o filtro do banco antes de responder. Com o cache `memory`, a carga é
+# refeita a cada `REVOCATION_RELOAD_SECONDS`.
+revoked_sessions = BloomFilter(settings.REVOCATION_BLOOM_CAPACITY, settings.REVOCATION_BLOOM_ERROR_RATE)
+REVOCATION_TAG = "sessions-revoked"
+# Requisições que encontram o filtro desatualizado ao mesmo tempo esperam uma única carga
+revocation_flight = SingleFlight()
+
+
+def _hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class RefreshTokenService:
+    """
+    Refresh tokens com rotação e revogação.
+
+    Métodos disponíveis:
+    - issue: Abre uma sessão e retorna o seu primeiro refresh token.
+    - rotate: Troca um refresh token válido por um novo, na mesma sessão.
+    - revoke: Encerra a sessão de um refresh token.
+    - revoke_session: Encerra uma sessão pelo seu ID.
+    - is_session_revoked: Indica se a sessão de um access token foi encerrada.
+    - load_revoked_sessions: Carrega no filtro as sessões encerradas recentemente.
+    """
+
+    # Versão de REVOCATION_TAG já refletida em `revoked_sessions` (None: ainda não carregado)
+    revocation_version: Optional[int] = None
+    # Instante (time.monotonic) da última carga do filtro
+    revocations_loaded_at = float("-inf")
+    # Sessões revogadas neste worker durante uma carga, que a consulta pode não ter visto
+    _loading: Optional[Set[str]] = None
+
+    @staticmethod
+    async def _create(db: AsyncSession, user_id: int, family_id: str) -> Tuple[str, RefreshToken]:
+        token = secrets.token_urlsafe(32)
+        row = RefreshToken(
+            user_id=user_id,
+            token_hash=_hash(token),
+            family_id=family_id,
+            expires_at=_now() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+        db.add(row)
+        await db.flush()
+        return token, row
+
+    @staticmethod
+    async def issue(db: AsyncSession, user: User) -> Tuple[str, str]:
+        """
+        Abre uma sessão para o usuário e retorna o seu primeiro refresh token.
+
+        Parâmetros:
+        - db (AsyncSession): Sessão do banco de dados.
+        - user (User): Usuário autenticado.
+
+        Retorno:
+        - Tuple[str, str]: O refresh token e o ID da sessão (claim `sid` do access token).
+        """
+        token, row = await RefreshTokenService._create(db, user.id, secrets.token_hex(16))
+        await db.commit()
+        return token, row.family_id
+
+    @staticmethod
+    async def rotate(db: AsyncSession, token: str) -> Optional[Tuple[User, str, str]]:
+        """
+        Troca um refresh token pelo próximo da sessão, sem verificar senha.
+
+        O token usado é revogado e o novo vale `REFRESH_TOKEN_EXPIRE_DAYS` a partir de agora,
+        de modo que sessões em uso não expiram. Apresentar um token que já foi trocado indica
+        que ele vazou: a sessão inteira é encerrada.
+
+        Parâmetros:
+        - db (AsyncSession): Sessão do banco de dados.
+        - token (str): Refresh token apresentado pelo cliente.
+
+        Retorno:
+        - Optional[Tuple[User, str, str]]: Usuário, novo refresh token e ID da sessão, ou None
+          se o token for desconhecido, expirado, revogado ou o usuário estiver inativo.
+        """
+        current = await db.scalar(select(RefreshToken).where(RefreshToken.token_hash == _hash(token)))
+        if current is None:
+            return None
+        if current.revoked_at is not None:
+            if current.replaced_by_id is not None:
+                await RefreshTokenService.revoke_session(db, current.family_id)
+            return None
+
+        new_token, new_row = await RefreshTokenService._create(db, current.user_id, current.family_id)
+        # Condicional: de duas trocas simultâneas do mesmo token, só uma vence
+        result = await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.id == current.id,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > _now(),
+            )
+            .values(revoked_at=_now(), replaced_by_id=new_row.id)
+            .execution_options(synchronize_session=False)
+        )
+        user = await db.get(User, current.user_id) if result.rowcount == 1 else None
+        if user is None or user.is_active is False:
+            await db.rollback()
+            return None
+        await db.commit()
+        return user, new_token, current.family_id
+
+    @staticmethod
+    async def revoke(db: AsyncSession, token: str) -> bool:
+        """
+        Encerra a sessão do refresh token informado (logout).
+
+        Parâmetros:
+        - db (AsyncSession): Sessão do banco de dados.
+        - token (str): Refresh token da sessão.
+
+        Retorno:
+        - bool: True se o token existia.
+        """
+        family_id = await db.scalar(select(RefreshToken.family_id).where(RefreshToken.token_hash == _hash(token)))
+        if family_id is None:
+            return False
+        await RefreshTokenService.revoke_session(db, family_id)
+        return True
+
+    @staticmethod
+    async def revoke_session(db: AsyncSession, family_id: str) -> None:
+        """
+        Revoga os tokens ainda ativos de uma sessão, o que também invalida os access tokens dela.
+
+        Parâmetros:
+        - db (AsyncSession): Sessão do banco de dados.
+        - family_id (str): ID da sessão.
+        """
+        await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=_now())
+        )
+        await db.commit()
+        revoked_sessions.add(family_id)
+        if RefreshTokenService._loading is not None:
+            RefreshTokenService._loading.add(family_id)
+        await invalidate_tags(REVOCATION_TAG)
+
+    @staticmethod
+    async def _revoked_in_db(db: AsyncSession, family_id: str) -> bool:
+        return await db.scalar(
+            select(
+                exists().where(
+                    RefreshToken.family_id == family_id,
+                    RefreshToken.revoked_at.is_not(None),
+                    RefreshToken.replaced_by_id.is_(None),
+                )
+            )
+        )
+
+    @staticmethod
+    async def _revocation_tag_version() -> Optional[int]:
+        """Versão atual de REVOCATION_TAG, ou None se ela não é compartilhada entre os workers."""
+        if not response_cache.shared:
+            return None
+        version = (await run_cache(response_cache.tag_versions, [REVOCATION_TAG]))[REVOCATION_TAG]
+        # -1: o Redis não respondeu e a versão é desconhecida
+        return version if version >= 0 else None
+
+    @staticmethod
+    def _filter_is_stale(version: Optional[int]) -> bool:
+        if version is not None:
+            return version != RefreshTokenService.revocation_version
+        return time.monotonic() - RefreshTokenService.revocations_loaded_at >= settings.REVOCATION_RELOAD_SECONDS
+
+    @staticmethod
+    async def is_session_revoked(db: AsyncSession, family_id: str) -> bool:
+        """
+        Indica se a sessão foi encerrada, em qualquer worker.
+
+        Um "não" do filtro dispensa o banco; um "talvez" (revogação real ou falso positivo)
+        é confirmado nele. Com um cache compartilhado (`shared` ou `redis`), o filtro é
+        recarregado assim que a versão de REVOCATION_TAG muda. Com o cache `memory`, que é de
+        cada processo (ou com o Redis fora do ar), é recarregado a cada
+        `REVOCATION_RELOAD_SECONDS`: revogações feitas neste worker valem na hora, e as de
+        outros workers, no máximo esse tempo depois.
+
+        Parâmetros:
+        - db (AsyncSession): Sessão do banco de dados.
+        - family_id (str): ID da sessão (claim `sid`).
+
+        Retorno:
+        - bool: True se a sessão foi encerrada.
+        """
+        version = await RefreshTokenService._revocation_tag_version()
+        if RefreshTokenService._filter_is_stale(version):
+            await revocation_flight.run(REVOCATION_TAG, RefreshTokenService.load_revoked_sessions)
+        if family_id not in revoked_sessions:
+            return False
+        return await RefreshTokenService._revoked_in_db(db, family_id)
+
+    @staticmethod
+    async def load_revoked_sessions(db: Optional[AsyncSession] = None) -> int:
+        """
+        Recria o filtro com as sessões encerradas nos últimos `ACCESS_TOKEN_EXPIRE_MINUTES`.
+
+        Sessões encerradas antes disso não têm mais access tokens válidos e ficam de fora, o
+        que mantém o filtro no tamanho das revogações recentes (e a taxa de falsos positivos
+        na dimensionada). A versão de REVOCATION_TAG é lida antes da consulta: uma revogação
+        publicada durante a carga muda a versão de novo e provoca outra carga.
+
+        Parâmetros:
+        - db (Optional[AsyncSession]): Sessão do banco de dados (abre uma nova se omitida).
+
+        Retorno:
+        - int: Quantidade de sessões carregadas.
+        """
+        global revoked_sessions
+        if db is None:
+            async with AsyncSessionLocal() as db:
+                return await RefreshTokenService.load_revoked_sessions(db)
+
+        loaded_at = time.monotonic()
+        RefreshTokenService._loading = loading = set()
+        try:
+            version = await RefreshTokenService._revocation_tag_version()
+            since = _now() - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+            family_ids = (
+                await db.scalars(
+                    select(RefreshToken.family_id)
+                    .where(RefreshToken.revoked_at >= since, RefreshToken.replaced_by_id.is_(None))
+                    .distinct()
+                )
+            ).all()
+        finally:
+            RefreshTokenService._loading = None
+
+        sessions = BloomFilter(settings.REVOCATION_BLOOM_CAPACITY, settings.REVOCATION_BLOOM_ERROR_RATE)
+        for family_id in [*family_ids, *loading]:
+            sessions.add(family_id)
+        revoked_sessions = sessions
+        RefreshTokenService.revocation_version = version
+        RefreshTokenService.revocations_loaded_at = loaded_at
+        return len(family_ids)
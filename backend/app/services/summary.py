@@ -0,0 +1,197 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.jobs import Job, JobQueue
+from app.database.session import AsyncSessionLocal, dialect_insert
+from app.models.book_summary import BookSummary
+from app.models.review import Review
+from app.services.ia import RatingSampler, chunked, summarize_reviews, warm_engine
+
+# Gera os resumos fora do processo da API, um job por livro; cada processo monta o motor uma vez
+summary_jobs = JobQueue(
+    "summaries",
+    max_workers=settings.SUMMARY_WORKERS,
+    max_pending=settings.SUMMARY_MAX_PENDING,
+    retry_after=settings.SUMMARY_RETRY_AFTER,
+    initializer=warm_engine,
+    initargs=(settings.SUMMARY_LANGUAGE, settings.SUMMARY_SENTENCES, settings.SUMMARY_ALGORITHM),
+)
+
+
+def _clip(text: str) -> str:
+    """Limita o tamanho de cada review, para que uma única review gigante não domine o custo."""
+    return text[:settings.SUMMARY_MAX_REVIEW_CHARS]
+
+
+async def _summarize(texts: List[str]) -> Optional[str]:
+    """Resume os textos no pool de processos da fila, fora do processo da API."""
+    return await summary_jobs.run_cpu(summarize_reviews, texts)
+
+
+def needs_refresh(row: Optional[BookSummary]) -> bool:
+    """
+    Indica se o resumo armazenado está desatualizado o bastante para ser regenerado.
+
+    Livros sem resumo são gerados na primeira mudança; nos demais, esperamos acumular
+    `SUMMARY_REFRESH_THRESHOLD` reviews alteradas (ou tantas quanto as que o resumo cobre,
+    se forem menos), para que o custo acompanhe as escritas e não cada review individual.
+    """
+    if row is None or row.pending_changes <= 0:
+        return False
+    if row.summary is None:
+        return True
+    return row.pending_changes >= min(settings.SUMMARY_REFRESH_THRESHOLD, max(row.review_count, 1))
+
+
+class SummaryService:
+    """
+    Resumos das reviews persistidos em `book_summaries`.
+
+    Métodos disponíveis:
+    - get: Lê o resumo armazenado de um livro.
+    - record_change: Conta uma review alterada, na transação corrente.
+    - schedule: Agenda a regeneração do resumo em segundo plano.
+    - job_status: Estado do job de regeneração de um livro.
+    - refresh: Regenera o resumo de um livro a partir das reviews atuais.
+    """
+
+    @staticmethod
+    async def get(db: AsyncSession, book_id: int) -> Optional[BookSummary]:
+        """
+        Lê o resumo armazenado, agendando a regeneração se ele estiver desatualizado.
+
+        Parâmetros:
+        - db (AsyncSession): Sessão do banco de dados.
+        - book_id (int): ID do livro.
+
+        Retorno:
+        - Optional[BookSummary]: Linha do resumo, ou None se o livro nunca teve reviews.
+        """
+        row = await db.get(BookSummary, book_id)
+        if needs_refresh(row):
+            SummaryService.schedule(book_id)
+        return row
+
+    @staticmethod
+    async def record_change(db: AsyncSession, book_id: int) -> bool:
+        """
+        Conta uma review criada, editada ou removida desde o último resumo.
+
+        Executa um único `INSERT ... ON CONFLICT DO UPDATE` e não faz commit: deve ser chamado
+        na mesma transação que grava o review.
+
+        Parâmetros:
+        - db (AsyncSession): Sessão do banco de dados.
+        - book_id (int): ID do livro.
+
+        Retorno:
+        - bool: True se o resumo deve ser regenerado após o commit.
+        """
+        insert = dialect_insert(db)
+        statement = insert(BookSummary).values(book_id=book_id, review_count=0, pending_changes=1)
+        statement = statement.on_conflict_do_update(
+            index_elements=[BookSummary.book_id],
+            set_={"pending_changes": BookSummary.pending_changes + 1},
+        ).returning(BookSummary.summary, BookSummary.review_count, BookSummary.pending_changes)
+        summary, review_count, pending_changes = (await db.execute(statement)).one()
+        return needs_refresh(BookSummary(summary=summary, review_count=review_count, pending_changes=pending_changes))
+
+    @staticmethod
+    def schedule(book_id: int) -> Optional[Job]:
+        """
+        Agenda a regeneração do resumo sem bloquear a requisição atual.
+
+        Pedidos para um livro que já está na fila ou sendo resumido compartilham o mesmo job.
+
+        Parâmetros:
+        - book_id (int): ID do livro.
+
+        Retorno:
+        - Optional[Job]: Job do livro (o que falhou, durante o intervalo de nova tentativa), ou
+          None se a fila estiver cheia. Em ambos os casos as mudanças continuam pendentes.
+        """
+        return summary_jobs.submit(book_id, lambda: SummaryService.refresh(book_id))
+
+    @staticmethod
+    def job_status(book_id: int) -> Optional[Job]:
+        """
+        Retorna o job ativo do livro ou, se não houver, o último que terminou neste processo.
+
+        Parâmetros:
+        - book_id (int): ID do livro.
+
+        Retorno:
+        - Optional[Job]: Estado do job, ou None se nenhum foi executado.
+        """
+        return summary_jobs.status(book_id)
+
+    @staticmethod
+    async def refresh(book_id: int) -> Optional[str]:
+        """
+        Regenera o resumo de um livro e zera as mudanças pendentes que ele já cobre.
+
+        As reviews são lidas em streaming, em blocos de `SUMMARY_CHUNK_SIZE`. Cada bloco é
+        resumido separadamente e os resumos parciais são resumidos de novo (map-reduce).
+        Com `SUMMARY_SAMPLE_SIZE` > 0, apenas uma amostra estratificada por nota desse
+        tamanho é resumida, o que limita memória e CPU por resumo independente do volume.
+
+        Mudanças feitas durante a geração continuam contadas como pendentes, já que o
+        resumo foi gerado com as reviews lidas antes delas. Se a geração falhar, nada é
+        gravado e a exceção é propagada para o job.
+
+        Parâmetros:
+        - book_id (int): ID do livro.
+
+        Retorno:
+        - Optional[str]: Novo resumo, ou None se o livro não tiver reviews.
+        """
+        chunk_size = settings.SUMMARY_CHUNK_SIZE
+        partials: List[str] = []
+        async with AsyncSessionLocal() as db:
+            row = await db.get(BookSummary, book_id)
+            if row is None:
+                return None  # livro removido (ou sem reviews) desde o agendamento
+            covered = row.pending_changes
+            query = (
+                select(Review.review, Review.overall_rating)
+                .where(Review.book_id == book_id)
+                .execution_options(yield_per=chunk_size)
+            )
+            rows = await db.stream(query)
+
+            if settings.SUMMARY_SAMPLE_SIZE:
+                sampler = RatingSampler(settings.SUMMARY_SAMPLE_SIZE)
+                async for text, rating in rows:
+                    sampler.add(_clip(text), rating)
+                review_count, sample = sampler.seen, sampler.sample()
+            else:
+                # Sem amostragem, cada bloco é resumido assim que chega: só os resumos
+                # parciais ficam em memória, mas a conexão fica presa durante a geração.
+                review_count, sample = 0, []
+                async for partition in rows.partitions():
+                    review_count += len(partition)
+                    partials.append(await _summarize([_clip(text) for text, _ in partition]))
+
+        for chunk in chunked(sample, chunk_size):
+            partials.append(await _summarize(chunk))
+        # Reduz em níveis, também em blocos, até sobrar um único resumo.
+        partials = [partial for partial in partials if partial]
+        while len(partials) > 1:
+            partials = [partial for chunk in chunked(partials, chunk_size) if (partial := await _summarize(chunk))]
+        summary = partials[0] if partials else None
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(BookSummary)
+                .where(BookSummary.book_id == book_id)
+                .values(
+                    summary=summary,
+                    review_count=review_count,
+                    pending_changes=BookSummary.pending_changes - covered,
+                    generated_at=datetime.now(timezone.utc),
+                )
+            )
+            await db.commit()
+        return summary
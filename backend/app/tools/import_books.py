@@ -0,0 +1,68 @@
+"""
+Importa livros de um arquivo CSV ou JSONL para o banco.
+
+Uso:
+    python -m app.tools.import_books livros.csv [--format csv|jsonl] [--batch-size 1000]
+
+O CSV precisa de cabeçalho com os campos de `BookCreate` (title, author, google_id, ...).
+Livros cujo google_id já existe são ignorados, então o comando pode ser repetido. O
+progresso e as linhas recusadas vão para o stderr; o relatório final, em JSON, para o stdout.
+
+Com CACHE_BACKEND=memory, o cache e o índice de sugestões dos servidores em execução não
+veem a importação: os livros novos aparecem quando as entradas expiram (ou após reiniciar).
+"""
+import argparse
+import asyncio
+import sys
+from typing import List, Optional
+from app.database.session import AsyncSessionLocal, async_engine
+from app.models.favorite import Favorito  # noqa: F401 (relacionamentos de Book, fora da aplicação)
+from app.models.user import User  # noqa: F401
+from app.schemas.book import BookImportReport
+from app.services.book_import import MAX_BATCH_SIZE, BookImportService, read_csv, read_jsonl
+
+
+def batch_size(value: str) -> int:
+    size = int(value)
+    if not 1 <= size <= MAX_BATCH_SIZE:
+        raise argparse.ArgumentTypeError(f"deve estar entre 1 e {MAX_BATCH_SIZE}")
+    return size
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Importa livros de um arquivo CSV ou JSONL.")
+    parser.add_argument("path", help="Arquivo a importar.")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Formato do arquivo (padrão: pela extensão).")
+    parser.add_argument(
+        "--batch-size", type=batch_size, help=f"Livros por INSERT, até {MAX_BATCH_SIZE} (padrão: BOOK_IMPORT_BATCH_SIZE)."
+    )
+    return parser.parse_args(argv)
+
+
+def print_progress(report: BookImportReport) -> None:
+    print(
+        f"{report.received} linhas lidas: {report.inserted} inseridas, "
+        f"{report.duplicates} duplicadas, {report.invalid} inválidas",
+        file=sys.stderr,
+    )
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    file_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "jsonl")
+    try:
+        with open(args.path, newline="", encoding="utf-8") as file:
+            rows = read_csv(file) if file_format == "csv" else read_jsonl(file)
+            async with AsyncSessionLocal() as db:
+                report = await BookImportService.run(db, rows, args.batch_size, progress=print_progress)
+    finally:
+        await async_engine.dispose()
+
+    for error in report.errors:
+        print(f"linha {error.line}: {error.error}", file=sys.stderr)
+    print(report.model_dump_json(indent=2))
+    return 1 if report.invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,90 @@
+import os
+import tempfile
+
+# Configuração mínima para importar `app` sem um .env: banco SQLite temporário e cache em memória
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='booklib-tests-'), 'test.db')}")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test-client-id")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test-client-secret")
+os.environ.setdefault("CACHE_BACKEND", "memory")
+
+import pytest  # noqa: E402
+from tests.fake_redis import FakeRedisServer  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def redis_url():
+    """URL de um servidor local que fala o protocolo do Redis, descartado ao fim do teste."""
+    server = FakeRedisServer()
+    server.start()
+    yield server.url
+    server.stop()
+
+
+@pytest.fixture
+async def db():
+    """Sessão em um banco SQLite com as tabelas recém-criadas, apagadas ao fim do teste."""
+    from app.database.session import AsyncSessionLocal, Base, async_engine
+    from app.models import book, book_stats, book_summary, catalog_cache, favorite, refresh_token, review, user  # noqa: F401
+
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        yield session
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture
+def queries():
+    """Lista, em ordem, os comandos SQL enviados ao banco durante o teste."""
+    from sqlalchemy import event
+    from app.database.session import async_engine
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+async def api(db):
+    """Cliente HTTP das rotas da API, sem o lifespan de `app.main` (pool de resumos, .env)."""
+    import httpx
+    from fastapi import FastAPI
+    from app.config import settings
+    from app.decorators.cache import response_cache
+    from app.routes import api as api_routes, auth, book, catalog, favorites, ia, review
+
+    app = FastAPI()
+    for module in (auth, api_routes, book, review, ia, favorites, catalog):
+        app.include_router(module.router, prefix=settings.API_V1_PREFIX)
+    response_cache.clear()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/api/v1") as client:
+        yield client
+
+
+@pytest.fixture
+async def user(db):
+    from app.models.user import User
+
+    user = User(email="leitor@example.com", username="leitor", hashed_password="x", is_active=True)
+    db.add(user)
+    await db.commit()
+    return user
+
+
+def auth_headers(user) -> dict:
+    """Cabeçalho com um access token próprio para o usuário."""
+    from app.core.security import create_access_token, user_claims
+
+    return {"Authorization": f"Bearer {create_access_token(user.id, user_claims(user))}"}
@@ -0,0 +1,92 @@
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Atende os comandos do Redis usados pelo cache e pelos contadores (GET, SET PX, DEL, INCR, PEXPIRE, MGET, INFO)."""
+
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    @staticmethod
+    def _bulk(value: Optional[bytes]) -> bytes:
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self) -> None:
+        server: "FakeRedisServer" = self.server.owner
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            name, *args = args
+            with server.lock:
+                self.wfile.write(server.execute(name.upper(), args, self._bulk))
+
+
+class FakeRedisServer:
+    """
+    Servidor Redis mínimo em memória, em uma porta livre de 127.0.0.1.
+
+    Só implementa o que `RedisCache` e `RedisCounter` enviam, o suficiente para testar o
+    cache compartilhado e o limite de logins sem um Redis de verdade.
+    """
+
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, float]] = {}
+        self.lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.owner = self
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> None:
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        value, expires_at = self.data.get(key, (None, 0.0))
+        if expires_at and expires_at < time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, name: bytes, args: List[bytes], bulk) -> bytes:
+        if name == b"GET":
+            return bulk(self._get(args[0]))
+        if name == b"SET":
+            ttl = int(args[3]) / 1000 if len(args) > 3 and args[2].upper() == b"PX" else 0.0
+            self.data[args[0]] = (args[1], time.monotonic() + ttl if ttl else 0.0)
+            return b"+OK\r\n"
+        if name == b"DEL":
+            return b":%d\r\n" % sum(self.data.pop(key, None) is not None for key in args)
+        if name == b"INCR":
+            expires_at = self.data.get(args[0], (None, 0.0))[1]
+            value = int(self._get(args[0]) or 0) + 1
+            self.data[args[0]] = (str(value).encode(), expires_at)
+            return b":%d\r\n" % value
+        if name == b"PEXPIRE":
+            if self._get(args[0]) is None:
+                return b":0\r\n"
+            self.data[args[0]] = (self.data[args[0]][0], time.monotonic() + int(args[1]) / 1000)
+            return b":1\r\n"
+        if name == b"MGET":
+            return b"*%d\r\n" % len(args) + b"".join(bulk(self._get(key)) for key in args)
+        if name == b"INFO":
+            return bulk(b"# Stats\r\nexpired_keys:0\r\nevicted_keys:0\r\n")
+        return b"-ERR unknown command '%s'\r\n" % name
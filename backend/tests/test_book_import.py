@@ -0,0 +1,115 @@
+import json
+import pytest
+from sqlalchemy import func, select
+from app.models.book import Book
+from app.services.book_import import MAX_BATCH_SIZE, BookImportService, read_csv, read_jsonl, read_ndjson
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+
+def line(google_id, title="Livro", **fields):
+    return json.dumps({"title": title, "author": "Autor", "google_id": google_id, **fields})
+
+
+async def titles(db):
+    return {google_id: title for google_id, title in await db.execute(select(Book.google_id, Book.title))}
+
+
+async def test_malformed_lines_are_reported_by_line_number(db):
+    lines = [
+        line("g1"),
+        "{isto não é json",
+        "",
+        json.dumps({"title": "Sem autor", "google_id": "g2"}),
+        line("g3", published_year=-1),
+        line("g4"),
+    ]
+
+    report = await BookImportService.run(db, read_jsonl(lines))
+
+    assert (report.received, report.inserted, report.invalid, report.duplicates) == (5, 2, 3, 0)
+    assert [error.line for error in report.errors] == [2, 4, 5]
+    assert "author" in report.errors[1].error
+    assert set(await titles(db)) == {"g1", "g4"}
+
+
+async def test_duplicate_google_ids_keep_the_first_and_skip_existing_books(db):
+    db.add(Book(title="Já cadastrado", author="Autor", google_id="g1"))
+    await db.commit()
+    lines = [line("g1", "Novo g1"), line("g2", "Primeiro g2"), line("g2", "Segundo g2"), line("g3")]
+
+    report = await BookImportService.run(db, read_jsonl(lines), batch_size=2)
+
+    assert (report.received, report.inserted, report.duplicates) == (4, 2, 2)
+    assert await titles(db) == {"g1": "Já cadastrado", "g2": "Primeiro g2", "g3": "Livro"}
+
+
+async def test_each_batch_is_one_insert_reported_to_progress(db, queries):
+    progress = []
+    lines = [line(f"g{i}") for i in range(5)]
+
+    await BookImportService.run(db, read_jsonl(lines), batch_size=2, progress=lambda r: progress.append(r.inserted))
+
+    assert progress == [2, 4, 5]
+    assert sum(statement.startswith("INSERT") for statement in queries) == 3
+
+
+async def test_batch_size_is_capped_at_the_bind_parameter_limit(db, queries):
+    progress = []
+    rows = ((number, {"title": "Livro", "author": "Autor", "google_id": f"g{number}"}) for number in range(MAX_BATCH_SIZE + 1))
+
+    report = await BookImportService.run(db, rows, batch_size=10 * MAX_BATCH_SIZE, progress=lambda r: progress.append(r.inserted))
+
+    # Um lote cheio usa todas as colunas de BookCreate por livro e ainda cabe no limite do SQLite
+    assert progress == [MAX_BATCH_SIZE, MAX_BATCH_SIZE + 1]
+    assert report.inserted == MAX_BATCH_SIZE + 1
+    assert sum(statement.startswith("INSERT") for statement in queries) == 2
+
+
+async def test_ndjson_lines_split_across_chunks(db):
+    body = f"{line('g1')}\n\n{line('g2')}\n{{ruim}}\n{line('g3')}".encode()
+
+    async def chunks():
+        for start in range(0, len(body), 7):
+            yield body[start:start + 7]
+
+    report = await BookImportService.run(db, read_ndjson(chunks()))
+
+    assert (report.received, report.inserted, report.invalid) == (4, 3, 1)
+    assert [error.line for error in report.errors] == [4]
+
+
+async def test_csv_empty_cells_become_null(db):
+    lines = ["title,author,google_id,published_year", "Dom Casmurro,Machado de Assis,g1,", "Sem id,Autor,,1900"]
+
+    report = await BookImportService.run(db, read_csv(lines))
+
+    assert (report.inserted, report.invalid) == (1, 1)
+    assert report.errors[0].line == 3
+    assert await db.scalar(select(Book.published_year).where(Book.google_id == "g1")) is None
+
+
+async def test_bulk_endpoint_requires_authentication(api):
+    response = await api.post("/books/bulk", content=line("g1"))
+
+    assert response.status_code == 401
+
+
+async def test_bulk_endpoint_rejects_batches_above_the_cap(api, user):
+    response = await api.post(
+        "/books/bulk", params={"batch_size": MAX_BATCH_SIZE + 1}, content=line("g1"), headers=auth_headers(user)
+    )
+
+    assert response.status_code == 422
+
+
+async def test_bulk_endpoint_imports_ndjson(api, db, user):
+    body = "\n".join([line("g1"), line("g2"), line("g1"), "{}"])
+
+    response = await api.post("/books/bulk", params={"batch_size": 1}, content=body, headers=auth_headers(user))
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["received"], report["inserted"], report["duplicates"], report["invalid"]) == (4, 2, 1, 1)
+    assert await db.scalar(select(func.count(Book.id))) == 2
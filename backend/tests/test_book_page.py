@@ -0,0 +1,75 @@
+import pytest
+from app.models.book import Book
+from app.models.favorite import Favorito
+from app.models.review import Review
+from app.models.user import User
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def book(db, user):
+    book = Book(title="Dom Casmurro", author="Machado de Assis", google_id="g1")
+    db.add(book)
+    await db.commit()
+    db.add_all([
+        Favorito(user_id=user.id, livro_id=book.id),
+        Review(
+            book_id=book.id, user_id=user.id, review_title="Capitu", review="Olhos de ressaca.",
+            story_rating=5, style_rating=5, character_rating=5, overall_rating=5.0, recommendation=True,
+        ),
+    ])
+    await db.commit()
+    return book
+
+
+async def test_page_brings_every_part(api, book, user):
+    response = await api.get("/books/google/g1/page", headers=auth_headers(user))
+
+    assert response.status_code == 200
+    page = response.json()
+    assert page["book"]["title"] == "Dom Casmurro"
+    assert [(review["review_title"], review["username"]) for review in page["reviews"]] == [("Capitu", "leitor")]
+    assert page["is_favorite"] is True
+
+
+async def test_favorite_comes_from_the_token_not_the_query(api, book, user, db):
+    other = User(email="outro@example.com", username="outro", hashed_password="x", is_active=True)
+    db.add(other)
+    await db.commit()
+
+    anonymous = await api.get("/books/google/g1/page", params={"user_id": user.id})
+    as_other = await api.get("/books/google/g1/page", params={"user_id": user.id}, headers=auth_headers(other))
+
+    assert anonymous.json()["is_favorite"] is False
+    assert as_other.json()["is_favorite"] is False
+
+
+async def test_invalid_token_is_treated_as_a_visitor(api, book):
+    response = await api.get("/books/google/g1/page", headers={"Authorization": "Bearer invalido"})
+
+    assert response.status_code == 200
+    assert response.json()["is_favorite"] is False
+
+
+async def test_unknown_book_is_404(api, db):
+    assert (await api.get("/books/google/nada/page")).status_code == 404
+
+
+async def test_page_uses_at_most_two_connections(api, book, user):
+    from sqlalchemy import event
+    from app.database.session import async_engine
+
+    checkouts = []
+
+    def listener(*args):
+        checkouts.append(1)
+
+    event.listen(async_engine.sync_engine, "checkout", listener)
+    try:
+        assert (await api.get("/books/google/g1/page", headers=auth_headers(user))).status_code == 200
+    finally:
+        event.remove(async_engine.sync_engine, "checkout", listener)
+
+    assert len(checkouts) == 2
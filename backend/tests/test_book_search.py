@@ -0,0 +1,42 @@
+import pytest
+from app.models.book import Book
+from app.services.book_search import BookSearchService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def books(db):
+    db.add_all([
+        Book(title="Dom Casmurro", author="Machado de Assis", genre="Romance", description="Bentinho e Capitu.", google_id="g1"),
+        Book(title="100% Amor", author="Autora Desconhecida", genre="Romance", google_id="g2"),
+        Book(title="O Cortiço", author="Aluísio Azevedo", genre="Naturalismo", description="Cortiço_de_João Romão.", google_id="g3"),
+    ])
+    await db.commit()
+    return db
+
+
+async def titles(db, q, **kwargs):
+    page = await BookSearchService.search(db, q, **kwargs)
+    return [item.title for item in page.items], page.next_cursor
+
+
+async def test_like_fallback_searches_every_column(books):
+    assert (await titles(books, "capitu"))[0] == ["Dom Casmurro"]
+    assert (await titles(books, "AZEVEDO"))[0] == ["O Cortiço"]
+    assert sorted((await titles(books, "romance"))[0]) == ["100% Amor", "Dom Casmurro"]
+
+
+async def test_like_wildcards_are_matched_literally(books):
+    assert (await titles(books, "%"))[0] == ["100% Amor"]
+    assert (await titles(books, "_"))[0] == ["O Cortiço"]
+    assert (await titles(books, "o%a"))[0] == []
+
+
+async def test_pages_follow_the_cursor(books):
+    first, cursor = await titles(books, "o", limit=2)
+    second, last_cursor = await titles(books, "o", limit=2, cursor=cursor)
+
+    assert len(first) == 2 and len(second) == 1
+    assert set(first + second) == {"Dom Casmurro", "100% Amor", "O Cortiço"}
+    assert last_cursor is None
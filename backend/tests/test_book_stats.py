@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy import case, func, select
+from app.factory.factories import ReviewFactory
+from app.models.book import Book
+from app.models.book_stats import BookStats
+from app.models.review import Review
+from app.schemas.review import ReviewCreate, ReviewUpdate
+from app.services.summary import SummaryService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def no_summary_jobs(monkeypatch):
+    """Os testes olham só os agregados: nenhum resumo é agendado no pool de processos."""
+    monkeypatch.setattr(SummaryService, "schedule", staticmethod(lambda book_id: None))
+
+
+@pytest.fixture
+async def books(db):
+    books = [Book(title=f"Livro {i}", author="Autor", google_id=f"g{i}") for i in range(2)]
+    db.add_all(books)
+    await db.commit()
+    return books
+
+
+async def recompute(db, book_id):
+    """Agregados calculados do zero a partir da tabela de reviews."""
+    row = (await db.execute(
+        select(
+            func.count(Review.id),
+            func.coalesce(func.sum(Review.overall_rating), 0),
+            func.coalesce(func.sum(Review.story_rating), 0),
+            func.coalesce(func.sum(Review.style_rating), 0),
+            func.coalesce(func.sum(Review.character_rating), 0),
+            func.coalesce(func.sum(case((Review.recommendation, 1), else_=0)), 0),
+        ).where(Review.book_id == book_id)
+    )).one()
+    return tuple(row)
+
+
+async def stored(db, book_id):
+    stats = await db.get(BookStats, book_id, populate_existing=True)
+    if stats is None:
+        return (0, 0, 0, 0, 0, 0)
+    return (
+        stats.review_count, stats.overall_sum, stats.story_sum,
+        stats.style_sum, stats.character_sum, stats.recommend_count,
+    )
+
+
+async def assert_consistent(db, books):
+    for book in books:
+        assert await stored(db, book.id) == pytest.approx(await recompute(db, book.id))
+
+
+def review_data(book, user, story, style, character, recommendation):
+    return ReviewCreate(
+        book_id=book.id, user_id=user.id, review_title="Título", review="Texto da review.",
+        story_rating=story, style_rating=style, character_rating=character,
+        overall_rating=1, recommendation=recommendation,
+    )
+
+
+async def test_create_adds_each_review_to_the_stats(db, user, books):
+    await ReviewFactory.create_review(db, review_data(books[0], user, 5, 4, 3, True))
+    await ReviewFactory.create_review(db, review_data(books[0], user, 2, 2, 1, False))
+    await ReviewFactory.create_review(db, review_data(books[1], user, 4, 4, 4, True))
+
+    await assert_consistent(db, books)
+    assert (await stored(db, books[0].id))[0] == 2
+
+
+async def test_update_of_ratings_replaces_the_old_contribution(db, user, books):
+    review = await ReviewFactory.create_review(db, review_data(books[0], user, 5, 4, 3, True))
+    await ReviewFactory.create_review(db, review_data(books[0], user, 3, 3, 3, True))
+
+    await ReviewFactory.update_review(db, review.id, ReviewUpdate(story_rating=1, recommendation=False))
+
+    await assert_consistent(db, books)
+    assert (await stored(db, books[0].id))[1] == pytest.approx((1 + 4 + 3) / 3 + 3)
+
+
+async def test_update_moving_a_review_to_another_book(db, user, books):
+    review = await ReviewFactory.create_review(db, review_data(books[0], user, 5, 4, 3, True))
+
+    await ReviewFactory.update_review(db, review.id, ReviewUpdate(book_id=books[1].id))
+
+    await assert_consistent(db, books)
+    assert (await stored(db, books[0].id))[0] == 0
+    assert (await stored(db, books[1].id))[0] == 1
+
+
+async def test_delete_removes_the_review_from_the_stats(db, user, books):
+    first = await ReviewFactory.create_review(db, review_data(books[0], user, 5, 4, 3, True))
+    second = await ReviewFactory.create_review(db, review_data(books[0], user, 1, 2, 3, False))
+
+    await ReviewFactory.delete_review(db, first.id)
+    await assert_consistent(db, books)
+
+    await ReviewFactory.delete_review(db, second.id)
+    await assert_consistent(db, books)
+    assert await stored(db, books[0].id) == (0, 0, 0, 0, 0, 0)
@@ -0,0 +1,69 @@
+import pytest
+from app.models.book import Book
+from app.services import book_suggest
+from app.services.book_suggest import BookSuggestService
+
+pytestmark = pytest.mark.anyio
+
+BOOKS = [
+    ("Dom Casmurro", "Machado de Assis"),
+    ("Memórias Póstumas de Brás Cubas", "Machado de Assis"),
+    ("O Cortiço", "Aluísio Azevedo"),
+    ("100% Amor", "Autora Desconhecida"),
+]
+
+
+@pytest.fixture
+async def books(db, monkeypatch):
+    db.add_all(Book(title=title, author=author) for title, author in BOOKS)
+    await db.commit()
+    # Cada teste começa com um índice novo e descarregado
+    monkeypatch.setattr(book_suggest, "suggest_index", book_suggest.PrefixIndex())
+    monkeypatch.setattr(BookSuggestService, "ready", False)
+    return db
+
+
+def values(suggestions):
+    return [(suggestion.kind, suggestion.value) for suggestion in suggestions]
+
+
+async def test_without_index_falls_back_to_like(books):
+    found = values(await BookSuggestService.suggest(books, "casmur"))
+
+    assert found == [("title", "Dom Casmurro")]
+
+
+async def test_like_fallback_matches_inside_words_and_authors(books):
+    found = values(await BookSuggestService.suggest(books, "assis"))
+
+    assert found == [("author", "Machado de Assis")]
+
+
+async def test_like_fallback_escapes_wildcards(books):
+    assert values(await BookSuggestService.suggest(books, "100%")) == [("title", "100% Amor")]
+    assert values(await BookSuggestService.suggest(books, "_")) == []
+
+
+async def test_index_results_come_first_and_database_completes_them(books):
+    assert await BookSuggestService.warm() == 7
+
+    found = values(await BookSuggestService.suggest(books, "mac", limit=3))
+
+    assert found[0] == ("author", "Machado de Assis")
+    assert len(found) == len(set(found))
+
+
+async def test_short_prefix_with_index_skips_the_database(books):
+    await BookSuggestService.warm()
+
+    assert values(await BookSuggestService.suggest(books, "co")) == []
+    assert values(await BookSuggestService.suggest(books, "o ")) == [("title", "O Cortiço")]
+
+
+async def test_book_changed_updates_the_index(books):
+    await BookSuggestService.warm()
+
+    BookSuggestService.book_changed(("O Cortiço", "Aluísio Azevedo"), ("O Mulato", "Aluísio Azevedo"))
+
+    assert book_suggest.suggest_index.search("o ", 10) == [("title", "O Mulato")]
+    assert book_suggest.suggest_index.search("aluisio", 10) == [("author", "Aluísio Azevedo")]
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import func, select
+from app.models.book import Book
+from app.services import book_suggest
+from app.services.book_suggest import BookSuggestService
+
+pytestmark = pytest.mark.anyio
+
+BOOK = {"title": "Dom Casmurro", "author": "Machado de Assis", "genre": "Romance", "published_year": 1899}
+
+
+@pytest.fixture(autouse=True)
+def suggestions(monkeypatch):
+    monkeypatch.setattr(book_suggest, "suggest_index", book_suggest.PrefixIndex())
+    monkeypatch.setattr(BookSuggestService, "ready", False)
+
+
+async def count_books(db):
+    return await db.scalar(select(func.count(Book.id)))
+
+
+async def test_upsert_inserts_a_new_book(api, db):
+    response = await api.put("/books/google/g1", json=BOOK)
+
+    assert response.status_code == 200
+    book = response.json()
+    assert (book["google_id"], book["title"], book["updated_at"]) == ("g1", "Dom Casmurro", None)
+    assert await count_books(db) == 1
+
+
+async def test_upsert_with_the_same_data_writes_nothing(api, db, queries):
+    first = (await api.put("/books/google/g1", json=BOOK)).json()
+    queries.clear()
+
+    second = (await api.put("/books/google/g1", json=BOOK)).json()
+
+    assert second == first
+    assert second["updated_at"] is None
+    # O INSERT não grava nada (o WHERE do ON CONFLICT filtra a linha) e o livro é só lido
+    assert [statement.split()[0] for statement in queries] == ["INSERT", "SELECT"]
+    assert await count_books(db) == 1
+
+
+async def test_upsert_with_a_null_field_set_is_not_a_no_op(api):
+    first = (await api.put("/books/google/g1", json=BOOK)).json()
+
+    second = (await api.put("/books/google/g1", json={**BOOK, "genre": None})).json()
+
+    assert second["id"] == first["id"]
+    assert second["genre"] is None
+    assert second["updated_at"] is not None
+
+
+async def test_upsert_updates_the_book_and_its_suggestions(api, db):
+    first = (await api.put("/books/google/g1", json=BOOK)).json()
+    await BookSuggestService.warm()
+
+    response = await api.put("/books/google/g1", json={**BOOK, "title": "Quincas Borba"})
+
+    book = response.json()
+    assert (book["id"], book["title"]) == (first["id"], "Quincas Borba")
+    assert book["updated_at"] is not None
+    assert await count_books(db) == 1
+    assert book_suggest.suggest_index.search("quincas", 10) == [("title", "Quincas Borba")]
+    assert book_suggest.suggest_index.search("dom cas", 10) == []
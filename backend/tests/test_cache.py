@@ -0,0 +1,94 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.decorators import book as book_decorators
+from app.decorators import cache
+from app.decorators.book import cache_response
+from app.decorators.cache import MemoryCache, TaggedCache, invalidate_tags
+from app.decorators.cache.redis import RedisCache
+
+
+@pytest.fixture(params=["memory", "redis"])
+def response_cache(request, monkeypatch):
+    """Troca o cache de respostas da aplicação por um novo, em memória ou no Redis local."""
+    if request.param == "memory":
+        store = MemoryCache(max_entries=100, max_bytes=1024 * 1024)
+    else:
+        store = RedisCache(request.getfixturevalue("redis_url"), prefix="booklib-tests:")
+    tagged = TaggedCache(store)
+    monkeypatch.setattr(cache, "response_cache", tagged)
+    monkeypatch.setattr(book_decorators, "response_cache", tagged)
+    return tagged
+
+
+@pytest.fixture
+def client(response_cache):
+    app = FastAPI()
+    calls = {}
+
+    @app.get("/items/{item_id}")
+    @cache_response(timeout=60, tags=["item:{item_id}"])
+    async def get_item(item_id: int):
+        calls[item_id] = calls.get(item_id, 0) + 1
+        return {"id": item_id, "version": calls[item_id]}
+
+    @app.post("/items/{item_id}")
+    async def touch_item(item_id: int):
+        await invalidate_tags(f"item:{item_id}")
+        return {"ok": True}
+
+    with TestClient(app) as test_client:
+        test_client.calls = calls
+        yield test_client
+
+
+def test_second_request_is_a_hit(client):
+    first = client.get("/items/1")
+    second = client.get("/items/1")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json() == {"id": 1, "version": 1}
+    assert client.calls == {1: 1}
+
+
+def test_query_parameters_are_part_of_the_key(client):
+    assert client.get("/items/1?a=1&b=2").headers["X-Cache"] == "MISS"
+    assert client.get("/items/1?b=2&a=1").headers["X-Cache"] == "HIT"
+    assert client.get("/items/1?a=2").headers["X-Cache"] == "MISS"
+
+
+def test_invalidating_a_tag_drops_only_its_entries(client, response_cache):
+    client.get("/items/1")
+    client.get("/items/2")
+
+    client.post("/items/1")
+
+    refreshed = client.get("/items/1")
+    assert refreshed.headers["X-Cache"] == "MISS"
+    assert refreshed.json()["version"] == 2
+    assert client.get("/items/2").headers["X-Cache"] == "HIT"
+    assert client.get("/items/1").headers["X-Cache"] == "HIT"
+    assert response_cache.stats()["stale"] == 1
+
+
+def test_tag_versions_are_shared_through_redis(redis_url):
+    """Uma tag publicada por um worker invalida as entradas gravadas por outro."""
+    writer = TaggedCache(RedisCache(redis_url))
+    reader = TaggedCache(RedisCache(redis_url))
+    writer.set("key", b"payload", 60, writer.tag_versions(["book:1"]))
+    assert reader.get("key") == b"payload"
+
+    reader.invalidate("book:1")
+
+    assert writer.get("key") is None
+
+
+def test_unreachable_redis_is_a_miss():
+    store = RedisCache("redis://127.0.0.1:1/0", timeout=0.1)
+    tagged = TaggedCache(store)
+    tagged.set("key", b"payload", 60, {})
+
+    assert tagged.get("key") is None
+    assert tagged.tag_versions(["book:1"]) == {"book:1": -1}
+    assert store.stats()["errors"] >= 2
@@ -0,0 +1,144 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import httpx
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+from app.core.coalesce import SingleFlight
+from app.database.session import AsyncSessionLocal
+from app.models.catalog_cache import CatalogCache
+from app.services import catalog
+from app.services.catalog import CatalogService, GoogleBooksClient
+
+pytestmark = pytest.mark.anyio
+
+BOOK = {
+    "id": "abc", "title": "Dom Casmurro", "author": "Machado de Assis", "description": "Sem descrição.",
+    "thumbnail": "", "published_year": 1899, "genre": "",
+}
+
+
+class StubGoogleBooks:
+    """Substitui o Google Books: conta as chamadas e só responde quando `release` é liberado."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+        self.error = None
+
+    async def search(self, query, max_results):
+        self.calls.append((query, max_results))
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return [BOOK]
+
+
+@pytest.fixture
+async def upstream(db, monkeypatch):
+    stub = StubGoogleBooks()
+    monkeypatch.setattr(catalog, "google_books", stub)
+    monkeypatch.setattr(catalog, "catalog_flight", SingleFlight())
+    return stub
+
+
+async def search(query, max_results=10):
+    async with AsyncSessionLocal() as session:
+        return await CatalogService.search(session, query, max_results)
+
+
+async def test_single_flight_runs_concurrent_calls_once():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await release.wait()
+        return "done"
+
+    tasks = [asyncio.ensure_future(flight.run("key", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["done"] * 5
+    assert len(calls) == 1
+    assert (flight.calls, flight.coalesced) == (1, 4)
+    assert await flight.run("key", work) == "done"
+    assert len(calls) == 2
+
+
+async def test_single_flight_shares_the_exception():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("upstream")
+
+    results = await asyncio.gather(flight.run("key", fail), flight.run("key", fail), return_exceptions=True)
+
+    assert [str(result) for result in results] == ["upstream", "upstream"]
+    assert flight.calls == 1
+
+
+async def test_concurrent_searches_reach_upstream_once(upstream):
+    tasks = [asyncio.ensure_future(search(query)) for query in ("Dom Casmurro", "dom  casmurro", " DOM CASMURRO")]
+    # Dá tempo para todas as buscas lerem o cache (miss) antes de o Google Books responder
+    await asyncio.sleep(0.1)
+    upstream.release.set()
+
+    assert await asyncio.gather(*tasks) == [[BOOK]] * 3
+    assert upstream.calls == [("dom casmurro", 10)]
+    # A resposta gravada serve as próximas buscas sem ir ao Google Books
+    assert await search("Dom Casmurro") == [BOOK]
+    assert len(upstream.calls) == 1
+
+
+async def test_different_page_sizes_are_separate_calls(upstream):
+    upstream.release.set()
+
+    await asyncio.gather(search("dom casmurro", 10), search("dom casmurro", 20))
+
+    assert sorted(upstream.calls) == [("dom casmurro", 10), ("dom casmurro", 20)]
+
+
+async def test_upstream_failure_serves_the_expired_response(upstream, db):
+    upstream.release.set()
+    await search("dom casmurro")
+    await db.execute(update(CatalogCache).values(expires_at=datetime.now(timezone.utc) - timedelta(days=1)))
+    await db.commit()
+    upstream.error = httpx.ConnectError("offline")
+
+    assert await search("dom casmurro") == [BOOK]
+    assert len(upstream.calls) == 2
+
+
+async def test_upstream_failure_without_cache_is_502(upstream):
+    upstream.release.set()
+    upstream.error = httpx.ConnectError("offline")
+
+    with pytest.raises(HTTPException) as error:
+        await search("dom casmurro")
+    assert error.value.status_code == 502
+
+
+async def test_blank_query_is_rejected_before_upstream(upstream):
+    with pytest.raises(HTTPException) as error:
+        await search("   ")
+    assert error.value.status_code == 422
+    assert upstream.calls == []
+
+
+async def test_client_skips_malformed_volumes():
+    def handler(request):
+        items = [{"volumeInfo": {"title": "Sem id"}}, "lixo", {"id": "abc", "volumeInfo": {"title": "Dom Casmurro"}}]
+        return httpx.Response(200, json={"items": items})
+
+    client = GoogleBooksClient("http://books.test/volumes")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        books = await client.search("dom casmurro", 10)
+    finally:
+        await client.aclose()
+
+    assert [book["id"] for book in books] == ["abc"]
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth import exceptions
+from jose import jwt
+from app.core.google_keys import GoogleKeySet
+
+
+def make_key():
+    """Par de chaves RSA: a privada (PEM) assina os tokens, a pública (PEM) vai para o JWKS local."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private, public
+
+
+def make_token(private: str, kid: str, issuer: str = "https://accounts.google.com") -> str:
+    now = int(time.time())
+    claims = {"iss": issuer, "sub": "123", "email": "leitor@example.com", "iat": now, "exp": now + 300}
+    return jwt.encode(claims, private, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture(scope="module")
+def keys():
+    return {"old": make_key(), "new": make_key()}
+
+
+@pytest.fixture
+def certs_file(tmp_path):
+    """JWKS local no formato do endpoint do Google ({kid: chave pública}); reescrito para simular a rotação."""
+    path = tmp_path / "certs.json"
+
+    def publish(**certs):
+        path.write_text(json.dumps(certs))
+
+    publish.path = str(path)
+    return publish
+
+
+def test_keys_are_fetched_once(keys, certs_file):
+    certs_file(old=keys["old"][1])
+    key_set = GoogleKeySet("http://unused", path=certs_file.path, min_refresh=0)
+    token = make_token(keys["old"][0], "old")
+
+    assert key_set.verify(token)["sub"] == "123"
+    assert key_set.verify(token)["sub"] == "123"
+    assert key_set.fetches == 1
+
+
+def test_unknown_kid_refetches_after_rotation(keys, certs_file):
+    certs_file(old=keys["old"][1])
+    key_set = GoogleKeySet("http://unused", path=certs_file.path, min_refresh=0)
+    key_set.verify(make_token(keys["old"][0], "old"))
+
+    certs_file(new=keys["new"][1])
+
+    assert key_set.verify(make_token(keys["new"][0], "new"))["email"] == "leitor@example.com"
+    assert key_set.fetches == 2
+    with pytest.raises(ValueError):
+        key_set.verify(make_token(keys["old"][0], "old"))
+
+
+def test_unknown_kid_refetch_is_rate_limited(keys, certs_file):
+    certs_file(old=keys["old"][1])
+    key_set = GoogleKeySet("http://unused", path=certs_file.path, min_refresh=60)
+    key_set.verify(make_token(keys["old"][0], "old"))
+
+    certs_file(new=keys["new"][1])
+
+    with pytest.raises(ValueError):
+        key_set.verify(make_token(keys["new"][0], "new"))
+    assert key_set.fetches == 1
+
+
+def test_failed_refresh_keeps_previous_keys(keys, tmp_path):
+    key_set = GoogleKeySet("http://unused", path=str(tmp_path / "missing.json"), min_refresh=0)
+    key_set.set_keys({"old": keys["old"][1]}, max_age=0)
+
+    assert key_set.verify(make_token(keys["old"][0], "old"))["sub"] == "123"
+
+
+def test_wrong_issuer_is_rejected(keys, certs_file):
+    certs_file(old=keys["old"][1])
+    key_set = GoogleKeySet("http://unused", path=certs_file.path)
+
+    with pytest.raises(exceptions.GoogleAuthError, match="issuer"):
+        key_set.verify(make_token(keys["old"][0], "old", issuer="https://evil.example.com"))
+
+
+class SlowKeySet(GoogleKeySet):
+    """Busca lenta que registra em qual thread rodou."""
+
+    def __init__(self, certs):
+        super().__init__("http://unused", min_refresh=0)
+        self.certs = certs
+        self.threads = []
+
+    def _load(self):
+        self.threads.append(threading.get_ident())
+        time.sleep(0.1)
+        return dict(self.certs), 3600
+
+
+@pytest.mark.anyio
+async def test_async_verify_fetches_off_the_event_loop_once(keys):
+    key_set = SlowKeySet({"old": keys["old"][1]})
+    token = make_token(keys["old"][0], "old")
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    running = asyncio.ensure_future(ticker())
+    try:
+        results = await asyncio.gather(*(key_set.verify_async(token) for _ in range(10)))
+    finally:
+        running.cancel()
+
+    assert [result["sub"] for result in results] == ["123"] * 10
+    assert key_set.fetches == 1
+    assert key_set.threads != [threading.get_ident()]
+    # O event loop seguiu respondendo durante a busca de 100 ms
+    assert ticks >= 5
@@ -0,0 +1,123 @@
+import asyncio
+import os
+import pytest
+from app.core.jobs import JobQueue
+
+pytestmark = pytest.mark.anyio
+
+
+async def settle(queue):
+    """Espera os jobs em andamento terminarem."""
+    while queue._tasks:
+        await asyncio.gather(*queue._tasks)
+
+
+async def test_requests_for_the_same_key_share_one_job():
+    queue = JobQueue("teste")
+    release = asyncio.Event()
+    runs = []
+
+    async def job():
+        runs.append(1)
+        await release.wait()
+
+    first = queue.submit("livro", job)
+    await asyncio.sleep(0)
+    assert first.status == "running"
+    assert all(queue.submit("livro", job) is first for _ in range(5))
+
+    release.set()
+    await settle(queue)
+    assert (first.status, len(runs)) == ("done", 1)
+    assert queue.status("livro") is first
+
+    second = queue.submit("livro", job)
+    assert second is not first
+    await settle(queue)
+    assert len(runs) == 2
+
+
+async def test_concurrency_is_limited_to_max_workers():
+    queue = JobQueue("teste", max_workers=2)
+    release = asyncio.Event()
+
+    async def job():
+        await release.wait()
+
+    for key in range(5):
+        queue.submit(key, job)
+    await asyncio.sleep(0)
+    assert queue.stats()["running"] == 2
+    assert queue.stats()["queued"] == 3
+
+    release.set()
+    await settle(queue)
+    assert queue.stats()["completed"] == 5
+
+
+async def test_full_queue_rejects_new_keys():
+    queue = JobQueue("teste", max_pending=2)
+    release = asyncio.Event()
+
+    async def job():
+        await release.wait()
+
+    assert queue.submit(1, job) is not None
+    assert queue.submit(2, job) is not None
+    assert queue.submit(3, job) is None
+    assert queue.submit(1, job) is queue.status(1)  # chave já na fila continua aceita
+    assert queue.stats()["rejected"] == 1
+
+    release.set()
+    await settle(queue)
+
+
+async def test_failed_job_is_retried_only_after_retry_after():
+    queue = JobQueue("teste", retry_after=60)
+
+    async def job():
+        raise RuntimeError("falhou")
+
+    failed = queue.submit("livro", job)
+    await settle(queue)
+    assert (failed.status, failed.error) == ("failed", "falhou")
+    assert queue.submit("livro", job) is failed
+
+    failed.finished_at -= 61
+    retried = queue.submit("livro", job)
+    assert retried is not failed
+    await settle(queue)
+
+
+def _mark_warm(path):
+    """`initializer` dos testes: registra o PID de cada processo aquecido."""
+    with open(path, "a") as f:
+        f.write(f"{os.getpid()}\n")
+
+
+def _fail_warm():
+    raise RuntimeError("sem modelo")
+
+
+async def test_start_warms_every_process_before_the_first_job(tmp_path):
+    marks = tmp_path / "warm"
+    queue = JobQueue("teste", max_workers=2, initializer=_mark_warm, initargs=(str(marks),))
+    try:
+        await queue.start()
+        warmed = set(marks.read_text().split())
+        assert len(warmed) == 2
+
+        pid = await queue.run_cpu(os.getpid)
+        assert str(pid) in warmed
+        assert len(set(marks.read_text().split())) == 2
+    finally:
+        queue.shutdown()
+
+
+async def test_failed_warm_up_leaves_the_pool_to_be_recreated():
+    queue = JobQueue("teste", max_workers=1, initializer=_fail_warm)
+    try:
+        await queue.start()
+        assert queue._executor is None
+    finally:
+        queue.shutdown()
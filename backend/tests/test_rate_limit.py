@@ -0,0 +1,143 @@
+import pytest
+from fastapi import HTTPException
+from app.core import rate_limit
+from app.core.hashing import password_hasher
+from app.core.rate_limit import LoginThrottle, MemoryCounter, RedisCounter
+from app.decorators.cache.redis import RedisCache
+from app.services import auth
+
+WINDOW = 60.0
+
+
+class Clock:
+    """Relógio controlado pelo teste, no lugar de `time.time` do módulo de rate limit."""
+
+    def __init__(self, now: float = 6000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "redis"])
+def counter(request):
+    if request.param == "memory":
+        return MemoryCounter()
+    return RedisCounter(RedisCache(request.getfixturevalue("redis_url"), prefix="booklib-tests:"))
+
+
+@pytest.fixture
+def throttle(counter):
+    return LoginThrottle(counter, ip_limit=3, account_limit=2, window=WINDOW)
+
+
+def test_sliding_window_weights_the_previous_window(counter, clock):
+    for _ in range(4):
+        counter.hit("key", WINDOW)
+    assert counter.peek("key", WINDOW) == 4
+
+    clock.now += WINDOW * 1.5  # metade da janela seguinte: a anterior pesa 50%
+    assert counter.peek("key", WINDOW) == pytest.approx(2.0)
+    assert counter.hit("key", WINDOW) == pytest.approx(3.0)
+
+    clock.now += WINDOW * 2  # duas janelas depois, nada mais conta
+    assert counter.peek("key", WINDOW) == 0
+
+
+def test_reset_clears_the_key(counter, clock):
+    counter.hit("key", WINDOW)
+    counter.hit("other", WINDOW)
+
+    counter.reset("key", WINDOW)
+
+    assert counter.peek("key", WINDOW) == 0
+    assert counter.peek("other", WINDOW) == 1
+
+
+@pytest.mark.anyio
+async def test_ip_limit_is_per_ip(throttle, clock):
+    for attempt in range(3):
+        await throttle.check("10.0.0.1", f"conta{attempt}@example.com")
+
+    with pytest.raises(HTTPException) as error:
+        await throttle.check("10.0.0.1", "outra@example.com")
+    assert error.value.status_code == 429
+    assert 1 <= int(error.value.headers["Retry-After"]) <= WINDOW
+    await throttle.check("10.0.0.2", "outra@example.com")
+    assert throttle.stats()["rejected_ip"] == 1
+
+
+@pytest.mark.anyio
+async def test_account_limit_counts_failures_only(throttle, clock):
+    await throttle.failed("Leitor@example.com")
+    await throttle.check(None, "leitor@example.com")
+    await throttle.failed("leitor@example.com")
+
+    with pytest.raises(HTTPException) as error:
+        await throttle.check("10.0.0.9", "LEITOR@example.com")
+    assert error.value.status_code == 429
+    await throttle.check("10.0.0.9", "outra@example.com")
+    assert throttle.stats()["rejected_account"] == 1
+
+
+@pytest.mark.anyio
+async def test_account_limit_expires_with_the_window(throttle, clock):
+    await throttle.failed("leitor@example.com")
+    await throttle.failed("leitor@example.com")
+
+    clock.now += WINDOW * 2
+
+    await throttle.check(None, "leitor@example.com")
+
+
+@pytest.mark.anyio
+async def test_success_resets_the_account(throttle, clock):
+    await throttle.failed("leitor@example.com")
+
+    await throttle.succeeded("leitor@example.com")
+    await throttle.failed("leitor@example.com")
+
+    await throttle.check(None, "leitor@example.com")
+
+
+def test_memory_counter_drops_expired_and_oldest_keys(clock):
+    counter = MemoryCounter(max_keys=3)
+    counter.hit("velha", WINDOW)
+    clock.now += WINDOW * 2
+    counter.hit("a", WINDOW)
+    counter.hit("b", WINDOW)
+    assert list(counter._counters) == ["a", "b"]
+
+    counter.hit("c", WINDOW)
+    counter.hit("a", WINDOW)
+    counter.hit("d", WINDOW)
+
+    assert list(counter._counters) == ["c", "a", "d"]
+
+
+def test_unreachable_redis_fails_open(clock):
+    counter = RedisCounter(RedisCache("redis://127.0.0.1:1/0", timeout=0.1))
+
+    assert counter.hit("key", WINDOW) == 0
+    assert counter.peek("key", WINDOW) == 0
+
+
+@pytest.mark.anyio
+async def test_login_route_returns_429_after_repeated_failures(api, db, user, monkeypatch):
+    monkeypatch.setattr(auth, "login_throttle", LoginThrottle(MemoryCounter(), ip_limit=100, account_limit=5, window=WINDOW))
+    user.hashed_password = await password_hasher.hash("senha-certa")
+    await db.commit()
+    credentials = {"email": user.email, "password": "errada"}
+
+    statuses = [(await api.post("/token", json=credentials)).status_code for _ in range(6)]
+
+    assert statuses == [400] * 5 + [429]
+    # Nem a senha certa passa enquanto a conta está bloqueada
+    assert (await api.post("/token", json={**credentials, "password": "senha-certa"})).status_code == 429
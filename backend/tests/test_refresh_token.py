@@ -0,0 +1,140 @@
+import time
+from datetime import timedelta
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from app.core.auth import authenticate
+from app.core.bloom import BloomFilter
+from app.core.coalesce import SingleFlight
+from app.core.security import create_access_token, user_claims
+from app.decorators.cache import TaggedCache
+from app.decorators.cache.redis import RedisCache
+from app.models.refresh_token import RefreshToken
+from app.services import refresh_token
+from app.services.refresh_token import REVOCATION_TAG, RefreshTokenService, _now
+
+pytestmark = pytest.mark.anyio
+
+
+class AlwaysMaybe:
+    """Filtro que responde "talvez" para tudo: só falsos positivos."""
+
+    def __contains__(self, item):
+        return True
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(refresh_token, "revoked_sessions", BloomFilter(1000, 0.001))
+    monkeypatch.setattr(refresh_token, "revocation_flight", SingleFlight())
+    monkeypatch.setattr(RefreshTokenService, "revocation_version", None)
+    monkeypatch.setattr(RefreshTokenService, "revocations_loaded_at", float("-inf"))
+
+
+async def revoke_elsewhere(db, family_id):
+    """Encerra a sessão só no banco, como faria outro worker."""
+    await db.execute(update(RefreshToken).where(RefreshToken.family_id == family_id).values(revoked_at=_now()))
+    await db.commit()
+
+
+async def test_rotation_replaces_the_token_in_the_same_session(db, user):
+    token, family_id = await RefreshTokenService.issue(db, user)
+
+    rotated_user, new_token, rotated_family = await RefreshTokenService.rotate(db, token)
+
+    assert (rotated_user.id, rotated_family) == (user.id, family_id)
+    assert new_token != token
+    old, new = (await db.scalars(select(RefreshToken).order_by(RefreshToken.id))).all()
+    assert old.revoked_at is not None and old.replaced_by_id == new.id
+    assert new.revoked_at is None
+    assert not await RefreshTokenService.is_session_revoked(db, family_id)
+
+
+async def test_reusing_a_rotated_token_ends_the_session(db, user):
+    token, family_id = await RefreshTokenService.issue(db, user)
+    _, new_token, _ = await RefreshTokenService.rotate(db, token)
+
+    assert await RefreshTokenService.rotate(db, token) is None
+
+    assert await RefreshTokenService.rotate(db, new_token) is None
+    assert await RefreshTokenService.is_session_revoked(db, family_id)
+
+
+async def test_unknown_or_expired_tokens_are_refused(db, user):
+    token, _ = await RefreshTokenService.issue(db, user)
+    await db.execute(update(RefreshToken).values(expires_at=_now() - timedelta(seconds=1)))
+    await db.commit()
+
+    assert await RefreshTokenService.rotate(db, "desconhecido") is None
+    assert await RefreshTokenService.rotate(db, token) is None
+
+
+async def test_revoke_ends_the_session_and_its_access_tokens(db, user):
+    token, family_id = await RefreshTokenService.issue(db, user)
+    access_token = create_access_token(user.id, user_claims(user, family_id))
+    assert (await authenticate(access_token, db)).id == user.id
+
+    assert await RefreshTokenService.revoke(db, token)
+
+    assert await RefreshTokenService.rotate(db, token) is None
+    with pytest.raises(HTTPException) as error:
+        await authenticate(access_token, db)
+    assert error.value.status_code == 401
+    assert not await RefreshTokenService.revoke(db, "desconhecido")
+
+
+async def test_live_session_check_skips_the_database(db, user, queries):
+    _, family_id = await RefreshTokenService.issue(db, user)
+    await RefreshTokenService.load_revoked_sessions(db)
+    queries.clear()
+
+    assert not await RefreshTokenService.is_session_revoked(db, family_id)
+    assert queries == []
+
+
+async def test_false_positive_falls_through_to_the_database(db, user, queries, monkeypatch):
+    _, family_id = await RefreshTokenService.issue(db, user)
+    await RefreshTokenService.load_revoked_sessions(db)
+    monkeypatch.setattr(refresh_token, "revoked_sessions", AlwaysMaybe())
+    queries.clear()
+
+    assert not await RefreshTokenService.is_session_revoked(db, family_id)
+    assert len(queries) == 1
+
+
+async def test_memory_backend_sees_other_workers_after_the_reload_interval(db, user):
+    _, family_id = await RefreshTokenService.issue(db, user)
+    await RefreshTokenService.load_revoked_sessions(db)
+    await revoke_elsewhere(db, family_id)
+
+    # Dentro do intervalo o filtro local ainda não conhece a revogação
+    assert not await RefreshTokenService.is_session_revoked(db, family_id)
+
+    RefreshTokenService.revocations_loaded_at = time.monotonic() - refresh_token.settings.REVOCATION_RELOAD_SECONDS
+    assert await RefreshTokenService.is_session_revoked(db, family_id)
+
+
+async def test_shared_backend_sees_other_workers_at_once(db, user, redis_url, monkeypatch):
+    monkeypatch.setattr(refresh_token, "response_cache", TaggedCache(RedisCache(redis_url)))
+    _, family_id = await RefreshTokenService.issue(db, user)
+    assert not await RefreshTokenService.is_session_revoked(db, family_id)
+
+    await revoke_elsewhere(db, family_id)
+    refresh_token.response_cache.invalidate(REVOCATION_TAG)
+
+    assert await RefreshTokenService.is_session_revoked(db, family_id)
+
+
+async def test_reload_rebuilds_the_filter_with_recent_sessions_only(db, user):
+    _, old_family = await RefreshTokenService.issue(db, user)
+    _, recent_family = await RefreshTokenService.issue(db, user)
+    await revoke_elsewhere(db, recent_family)
+    expired = _now() - timedelta(minutes=refresh_token.settings.ACCESS_TOKEN_EXPIRE_MINUTES + 1)
+    await db.execute(update(RefreshToken).where(RefreshToken.family_id == old_family).values(revoked_at=expired))
+    await db.commit()
+    refresh_token.revoked_sessions.add(old_family)
+
+    assert await RefreshTokenService.load_revoked_sessions(db) == 1
+
+    assert recent_family in refresh_token.revoked_sessions
+    assert old_family not in refresh_token.revoked_sessions
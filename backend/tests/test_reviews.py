@@ -0,0 +1,43 @@
+import pytest
+from app.models.book import Book
+from app.models.review import Review
+from app.models.user import User
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def review(db, user):
+    book = Book(title="Dom Casmurro", author="Machado de Assis", google_id="g1")
+    db.add(book)
+    await db.commit()
+    review = Review(
+        book_id=book.id, user_id=user.id, review_title="Capitu", review="Olhos de ressaca.",
+        story_rating=5, style_rating=4, character_rating=3, overall_rating=4.0, recommendation=True,
+    )
+    db.add(review)
+    await db.commit()
+    return review
+
+
+async def test_delete_requires_authentication(api, review):
+    assert (await api.delete(f"/reviews/{review.id}")).status_code == 401
+
+
+async def test_only_the_author_may_delete(api, review, db):
+    other = User(email="outro@example.com", username="outro", hashed_password="x", is_active=True)
+    db.add(other)
+    await db.commit()
+
+    response = await api.delete(f"/reviews/{review.id}", params={"user_id": review.user_id}, headers=auth_headers(other))
+
+    assert response.status_code == 403
+
+
+async def test_author_deletes_the_review(api, review, user):
+    response = await api.delete(f"/reviews/{review.id}", headers=auth_headers(user))
+
+    assert response.status_code == 204
+    assert (await api.get(f"/reviews/{review.id}")).status_code == 404
+    assert (await api.delete(f"/reviews/{review.id}", headers=auth_headers(user))).status_code == 404
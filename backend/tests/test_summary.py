@@ -0,0 +1,182 @@
+import random
+import pytest
+from app.config import settings
+from app.database.session import AsyncSessionLocal
+from app.models.book import Book
+from app.models.book_summary import BookSummary
+from app.models.review import Review
+from app.services import summary
+from app.services.ia import RatingSampler, chunked
+from app.services.summary import SummaryService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def stub_summarizer(monkeypatch):
+    """Troca o sumarizador do pool de processos por um determinístico, que registra cada chamada."""
+    calls = []
+
+    async def summarize(texts):
+        calls.append(list(texts))
+        return f"resumo de {len(texts)}" if texts else None
+
+    monkeypatch.setattr(summary, "_summarize", summarize)
+    monkeypatch.setattr(SummaryService, "schedule", staticmethod(lambda book_id: calls.append(("schedule", book_id))))
+    return calls
+
+
+async def add_book(db, user, reviews=0):
+    book = Book(title="Dom Casmurro", author="Machado de Assis", google_id="g1")
+    db.add(book)
+    await db.commit()
+    db.add_all(
+        Review(
+            book_id=book.id, user_id=user.id, review_title=f"Review {i}", review=f"Texto {i}.",
+            story_rating=3, style_rating=3, character_rating=3, overall_rating=3.0, recommendation=True,
+        )
+        for i in range(reviews)
+    )
+    await db.commit()
+    return book
+
+
+async def record(book_id):
+    """Conta uma mudança numa transação própria, como fazem as escritas de reviews."""
+    async with AsyncSessionLocal() as db:
+        stale = await SummaryService.record_change(db, book_id)
+        await db.commit()
+    return stale
+
+
+async def load(book_id):
+    async with AsyncSessionLocal() as db:
+        return await db.get(BookSummary, book_id)
+
+
+async def test_first_change_of_a_book_without_summary_is_stale(db, user):
+    book = await add_book(db, user)
+
+    assert await record(book.id) is True
+    assert (await load(book.id)).pending_changes == 1
+
+
+async def test_refresh_clears_the_watermark_and_waits_for_the_threshold(db, user, monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_REFRESH_THRESHOLD", 3)
+    book = await add_book(db, user, reviews=10)
+    await record(book.id)
+
+    assert await SummaryService.refresh(book.id) is not None
+    row = await load(book.id)
+    assert (row.review_count, row.pending_changes) == (10, 0)
+
+    assert [await record(book.id) for _ in range(3)] == [False, False, True]
+
+
+async def test_threshold_is_capped_by_the_reviews_covered(db, user, monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_REFRESH_THRESHOLD", 5)
+    book = await add_book(db, user, reviews=2)
+    await record(book.id)
+    await SummaryService.refresh(book.id)
+
+    assert [await record(book.id) for _ in range(2)] == [False, True]
+
+
+async def test_changes_made_during_generation_stay_pending(db, user, stub_summarizer, monkeypatch):
+    book = await add_book(db, user, reviews=3)
+    await record(book.id)
+    await record(book.id)
+
+    async def summarize_while_writing(texts):
+        await record(book.id)  # uma review chega enquanto o resumo é gerado
+        return "resumo"
+
+    monkeypatch.setattr(summary, "_summarize", summarize_while_writing)
+    await SummaryService.refresh(book.id)
+
+    row = await load(book.id)
+    assert (row.summary, row.pending_changes) == ("resumo", 1)
+
+
+async def test_get_schedules_only_stale_summaries(db, user, stub_summarizer, monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_REFRESH_THRESHOLD", 2)
+    book = await add_book(db, user, reviews=4)
+    await record(book.id)
+    await SummaryService.refresh(book.id)
+    await record(book.id)
+
+    async with AsyncSessionLocal() as session:
+        await SummaryService.get(session, book.id)
+    assert ("schedule", book.id) not in stub_summarizer
+
+    await record(book.id)
+    async with AsyncSessionLocal() as session:
+        await SummaryService.get(session, book.id)
+    assert ("schedule", book.id) in stub_summarizer
+
+
+async def test_map_reduce_keeps_every_call_within_the_chunk_size(db, user, stub_summarizer, monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_CHUNK_SIZE", 2)
+    monkeypatch.setattr(settings, "SUMMARY_SAMPLE_SIZE", 0)
+    book = await add_book(db, user, reviews=5)
+    await record(book.id)
+
+    result = await SummaryService.refresh(book.id)
+
+    assert [len(call) for call in stub_summarizer] == [2, 2, 1, 2, 1, 2]
+    assert sorted(text for call in stub_summarizer[:3] for text in call) == [f"Texto {i}." for i in range(5)]
+    assert result == "resumo de 2"
+    assert (await load(book.id)).review_count == 5
+
+
+async def test_sampled_refresh_summarizes_at_most_the_sample(db, user, stub_summarizer, monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_CHUNK_SIZE", 2)
+    monkeypatch.setattr(settings, "SUMMARY_SAMPLE_SIZE", 3)
+    monkeypatch.setattr(settings, "SUMMARY_MAX_REVIEW_CHARS", 5)
+    book = await add_book(db, user, reviews=10)
+    await record(book.id)
+
+    await SummaryService.refresh(book.id)
+
+    mapped = [text for call in stub_summarizer[:2] for text in call]
+    assert len(mapped) == 3
+    assert all(len(text) <= 5 for text in mapped)
+    assert (await load(book.id)).review_count == 10
+
+
+def test_chunked_splits_in_order():
+    assert list(chunked(list(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+
+
+def test_sampler_keeps_everything_below_the_size():
+    sampler = RatingSampler(5, random.Random(0))
+    for i in range(4):
+        sampler.add(f"r{i}", i + 1)
+
+    assert sorted(sampler.sample()) == ["r0", "r1", "r2", "r3"]
+    assert sampler.seen == 4
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sampler_never_exceeds_the_size(seed):
+    rng = random.Random(seed)
+    sampler = RatingSampler(10, rng)
+    # Muitas notas raras: o mínimo de 1 por nota passaria do tamanho sem o corte final
+    for i in range(1000):
+        sampler.add(f"r{i}", 5 if i % 50 else rng.randint(1, 4) + 0.1 * (i % 3))
+
+    sample = sampler.sample()
+    assert len(sample) <= 10
+    assert len(set(sample)) == len(sample)
+    assert sampler.seen == 1000
+
+
+def test_sampler_preserves_the_rating_distribution():
+    sampler = RatingSampler(100, random.Random(0))
+    for i in range(10000):
+        sampler.add(f"{5 if i % 4 else 1}-{i}", 5 if i % 4 else 1)
+
+    sample = sampler.sample()
+    assert len(sample) == 100
+    assert sum(text.startswith("1-") for text in sample) == 25
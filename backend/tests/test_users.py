@@ -0,0 +1,34 @@
+import pytest
+from app.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def users(db):
+    users = [User(email=f"leitor{n}@example.com", username=f"leitor{n}", hashed_password="x") for n in range(3)]
+    db.add_all(users)
+    await db.commit()
+    return users
+
+
+async def test_batch_resolves_usernames_without_emails(api, users):
+    ids = f"{users[0].id},{users[2].id},999"
+
+    response = await api.get("/users/batch", params={"ids": ids})
+
+    assert response.status_code == 200
+    assert response.json() == {str(users[0].id): {"username": "leitor0"}, str(users[2].id): {"username": "leitor2"}}
+
+
+async def test_batch_rejects_malformed_or_too_many_ids(api, users):
+    assert (await api.get("/users/batch", params={"ids": "1,a"})).status_code == 400
+    assert (await api.get("/users/batch", params={"ids": ",".join(map(str, range(101)))})).status_code == 400
+
+
+async def test_listing_is_paginated(api, users):
+    first = (await api.get("/users", params={"limit": 2})).json()
+    second = (await api.get("/users", params={"limit": 2, "cursor": first["next_cursor"]})).json()
+
+    assert [user["username"] for user in first["items"] + second["items"]] == ["leitor0", "leitor1", "leitor2"]
+    assert second["next_cursor"] is None
@@ -1,10 +1,7 @@
 import React, { useState, useEffect } from "react";
 import { useParams } from "react-router-dom";
 import {
-  getBookByGoogleId,
-  getReviewsByBookId,
-  getAiReviewByBookId,
-  checkIfBookIsFavorited,
+  getBookPage,
   favoriteBook,
   unfavoriteBook,
 } from "../service/apiService";
@@ -12,8 +9,8 @@ import { useAuth } from '../context/AuthContext';
 import "./css/BookPage.css";
 import { useUser } from '../context/userContext';
 import { useNavigate } from 'react-router-dom';
+import { useCookies } from 'react-cookie';
 import { FaRegHeart, FaHeart } from 'react-icons/fa';
-import { getUserNamebyUserId } from "../service/apiService";
 
 // Componente para exibir os detalhes do livro
 const BookDetails = ({ book, isFavorited, handleFavoriteToggle }) => (
@@ -125,6 +122,7 @@ const BookPage = () => {
   const [loading, setLoading] = useState(true);
   const [userNames, setUserNames] = useState({});
   const { userData, error } = useUser();
+  const [cookies] = useCookies(['access_token']);
   const navigate = useNavigate();
   console.log("userauth: ", userData);
 
@@ -135,26 +133,19 @@ const BookPage = () => {
     
     const fetchBookAndReviews = async () => {
       try {
-        const bookData = await getBookByGoogleId(bookId);
-        setBook(bookData);
-
-        const reviewsData = await getReviewsByBookId(bookData.id);
-        setReviews(reviewsData);
-
-        const aiReviewData = await getAiReviewByBookId(bookData.id);
-        setAiReview(aiReviewData.ai_review || null);
-
-        // Verifica se o livro já está favoritado
-        const favoriteStatus = await checkIfBookIsFavorited(bookData.id, userData);
-        setIsFavorited(favoriteStatus.isFavorito);
+        // Livro, reviews com autores, resumo da IA e favorito em uma única requisição
+        const pageData = await getBookPage(bookId, cookies.access_token);
+        if (!pageData) {
+          return;
+        }
+        setBook(pageData.book);
+        setReviews(pageData.reviews);
+        setAiReview(pageData.ai_summary || null);
+        setIsFavorited(pageData.is_favorite);
 
-        // Carregar os nomes dos usuários
         const names = {};
-        for (const review of reviewsData) {
-          if (!names[review.user_id]) {
-            const userName = await getUserNamebyUserId(review.user_id);
-            names[review.user_id] = userName || 'Desconhecido';
-          }
+        for (const review of pageData.reviews) {
+          names[review.user_id] = review.username || 'Desconhecido';
         }
         setUserNames(names);
       } catch (error) {
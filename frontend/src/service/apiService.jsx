@@ -11,25 +11,16 @@ const api = axios.create({
   },
 });
 
-// Função para buscar livros da API do Google
+// Busca livros no Google Books pelo backend, que normaliza e guarda as respostas em cache
 export const searchBooks = async (query) => {
     try {
-      const response = await axios.get('https://www.googleapis.com/books/v1/volumes', {
+      const response = await api.get('/catalog/search', {
         params: {
-          q: query, 
-          maxResults: 10, 
+          q: query,
+          max_results: 10,
         },
       });
-      return response.data.items.map((item) => ({
-        id: item.id,
-        title: item.volumeInfo.title || 'Título Desconhecido',
-        author: item.volumeInfo.authors ? item.volumeInfo.authors.join(', ') : 'Autor Desconhecido',
-        description: item.volumeInfo.description || 'Sem descrição.',
-        thumbnail: item.volumeInfo.imageLinks?.thumbnail || '', 
-        
-        published_year: item.volumeInfo.publishedDate ? parseInt(item.volumeInfo.publishedDate.split('-')[0]) : null,
-        genre: item.volumeInfo.categories ? item.volumeInfo.categories[0] : '',
-      }));
+      return response.data;
     } catch (error) {
       console.error('Erro ao buscar livros:', error);
       return [];
@@ -37,60 +28,22 @@ export const searchBooks = async (query) => {
   };
 
 
-  export const getUserNamebyUserId = async (userId) => {
-    try {
-      const response = await api.get(`/users/${userId}`);
-      return response.data.email;
-    } catch (error) {
-      console.error('Erro ao buscar usuario:', error);
-      return [];
-    }
-  }
   
   export const saveBookIfNotExist = async (book) => {
-    console.log("livro: ", book);
     try {
-      console.log("Verificando se o livro já existe...");
-      const response = await api.get(`/books/google/${book.id}`);
-      console.log("Resposta da verificação:", response.data);
-
-      if (!response.data) {
-        
-        const bookData = {
-          title: book.title,
-          author: book.author,
-          description: book.description,
-          genre: book.genre || '',
-          thumbnail: book.thumbnail,
-          published_year: book.published_year || null, 
-        };
-
-        console.log("Chegou na criação do livro");
-  
-        await createBook(bookData);
-      } else {
-        console.log("O livro já existe no backend.");
-      }
+      // Um único PUT cria o livro ou atualiza o existente, sem duplicar em cliques simultâneos
+      const bookData = {
+        title: book.title,
+        author: book.author,
+        description: book.description,
+        genre: book.genre || '',
+        thumbnail: book.thumbnail,
+        published_year: book.published_year || null, 
+      };
+      const response = await api.put(`/books/google/${book.id}`, bookData);
+      return response.data;
     } catch (error) {
-      if (error.response && error.response.status === 404) {
-        console.log("Livro não encontrado. Criando novo livro...");
-        
-        const bookData = {
-          title: book.title,
-          author: book.author,
-          google_id: book.id,
-          description: book.description,
-          genre: book.genre || '',
-          thumbnail: book.thumbnail,
-          published_year: book.published_year || null, 
-        };
-
-        console.log("Criando o livro...");
-        console.log(bookData)
-        await createBook(bookData);
-      } else {
-        console.error('Erro ao salvar o livro:', error);
-      }
+      console.error('Erro ao salvar o livro:', error);
     }
 };
 
@@ -109,10 +62,10 @@ export const saveReview = async (bookId, review) => {
 
 // Funções CRUD de Books
 
-export const getBooks = async () => {
+export const getBooks = async (params = {}) => {
   try {
-    const response = await api.get('/books/');
-    return response.data;
+    const response = await api.get('/books/', { params });
+    return response.data.items;
   } catch (error) {
     console.error('Erro ao buscar livros:', error);
     return [];
@@ -140,6 +93,20 @@ export const getBookByGoogleId = async (id) => {
     }
   };
 
+// Busca em uma única requisição tudo o que a página do livro precisa. O favorito é o do
+// usuário do token; sem token, a página vem como para um visitante.
+export const getBookPage = async (googleId, token) => {
+  try {
+    const response = await api.get(`/books/google/${googleId}/page`, {
+      headers: token ? { Authorization: `Bearer ${token}` } : {},
+    });
+    return response.data;
+  } catch (error) {
+    console.error('Erro ao buscar a página do livro:', error);
+    return null;
+  }
+};
+
 export const createBook = async (bookData) => {
   try {
     const response = await api.post('/books/', bookData);
@@ -220,7 +187,7 @@ export const unfavoriteBook = async (bookId, userId) => {
 export const getReviewsByBookId = async (bookId) => {
   try {
     const response = await api.get(`/reviews/books/${bookId}`);
-    return response.data;
+    return response.data.items;
   } catch (error) {
     console.error('Erro ao buscar reviews:', error);
     return [];